@@ -0,0 +1,167 @@
+from array import array
+
+ATTACK = 0
+STRIKE = 1
+POISON = 2
+DEFEND = 3
+FLEE = 4
+ACTIONS = ("attack", "strike", "poison", "defend", "flee")
+SPECIALS = {"strike": STRIKE, "poison": POISON}
+
+DEFAULT = "default"
+POISON_SPITTER = "poison_spitter"
+
+# Kolumna -> (typ w tablicy array, wartość domyślna). Szanse to ułamki 0-1, a progi zdrowia to dzielniki:
+# przeciwnik broni się, gdy zdrowie * defend_divisor < maksymalne zdrowie (3 - poniżej 1/3 zdrowia).
+FIELDS = {
+    "special": ("b", STRIKE),
+    "special_chance": ("d", 0.4),
+    "strike_percent": ("i", 150),
+    "poison_chance": ("d", 0.6),
+    "poison_turns": ("i", 3),
+    "poison_divisor": ("i", 3),
+    "defend_divisor": ("i", 3),
+    "defend_chance": ("d", 0.3),
+    "flee_divisor": ("i", 4),
+    "flee_chance": ("d", 0.0),
+}
+
+
+class BehaviourTable:
+    """
+    Skompilowane zachowania przeciwników: jeden wiersz na zachowanie, jedna tablica array na kolumnę.
+    Przeciwnik wskazuje swój wiersz nazwą (Enemy.behaviour), a decyzja w turze to odczyt kilku liczb
+    z tego wiersza. Kolumny można przekazać w całości do symulatorów (np. numpy.asarray),
+    które rozstrzygają tysiące decyzji jednym wywołaniem.
+    """
+    def __init__(self):
+        self.names = []
+        self.rows = {}
+        self.columns = {field: array(typecode) for field, (typecode, _) in FIELDS.items()}
+        self._arrays = None
+
+    def register(self, name, special="strike", **values):
+        """
+        Dodaje zachowanie albo nadpisuje istniejące o tej samej nazwie.
+        :param name: Nazwa zachowania (np. "poison_spitter").
+        :param special: Umiejętność specjalna: "strike" (potężny cios) albo "poison" (plucie jadem).
+        :param values: Pozostałe kolumny z FIELDS; brakujące dostają wartości domyślne.
+        :return: Numer wiersza zachowania.
+        :raises ValueError: Przy nieznanej kolumnie, umiejętności albo wartości spoza zakresu.
+        """
+        if special not in SPECIALS:
+            raise ValueError(f"Nieznana umiejętność specjalna '{special}'.")
+        for field, value in values.items():
+            if field not in FIELDS or field == "special":
+                raise ValueError(f"Nieznana cecha zachowania '{field}'.")
+            if FIELDS[field][0] == "d" and not 0 <= value <= 1:
+                raise ValueError(f"Szansa '{field}' musi leżeć w przedziale 0-1.")
+            if FIELDS[field][0] == "i" and (not isinstance(value, int) or value <= 0):
+                raise ValueError(f"Wartość '{field}' musi być dodatnią liczbą całkowitą.")
+        row = dict((field, default) for field, (_, default) in FIELDS.items())
+        row.update(values, special=SPECIALS[special])
+        self._arrays = None
+        index = self.rows.get(name)
+        if index is None:
+            index = self.rows[name] = len(self.names)
+            self.names.append(name)
+            for field, column in self.columns.items():
+                column.append(row[field])
+        else:
+            for field, column in self.columns.items():
+                column[index] = row[field]
+        return index
+
+    def index(self, name):
+        """
+        Numer wiersza zachowania o podanej nazwie.
+        :raises ValueError: Jeśli takiego zachowania nie zarejestrowano.
+        """
+        index = self.rows.get(name)
+        if index is None:
+            raise ValueError(f"Nieznane zachowanie przeciwnika '{name}'.")
+        return index
+
+    def value(self, index, field):
+        """Wartość kolumny dla wiersza zachowania."""
+        return self.columns[field][index]
+
+    def decide(self, index, cooldown, health, max_health, rng):
+        """
+        Wybiera akcję przeciwnika w turze. Losowanie odbywa się tylko wtedy, gdy szansa jest niezerowa
+        i warunek akcji jest spełniony, więc przebieg walki z danego ziarna nie zależy od wyłączonych akcji.
+        :param index: Numer wiersza zachowania.
+        :param cooldown: Pozostały czas odnowienia umiejętności specjalnej.
+        :param health: Aktualne zdrowie przeciwnika.
+        :param max_health: Maksymalne zdrowie przeciwnika.
+        :param rng: Źródło losowości walki.
+        :return: ATTACK, STRIKE, POISON, DEFEND albo FLEE.
+        """
+        columns = self.columns
+        chance = columns["flee_chance"][index]
+        if chance and health * columns["flee_divisor"][index] < max_health and rng.random() < chance:
+            return FLEE
+        if cooldown == 0:
+            chance = columns["special_chance"][index]
+            if chance and rng.random() < chance:
+                return columns["special"][index]
+            return ATTACK
+        chance = columns["defend_chance"][index]
+        if chance and health * columns["defend_divisor"][index] < max_health and rng.random() < chance:
+            return DEFEND
+        return ATTACK
+
+    def arrays(self):
+        """Kolumny tabeli jako tablice NumPy (kopiowane raz i po każdej zmianie zachowań)."""
+        if self._arrays is None:
+            import numpy as np
+
+            self._arrays = {field: np.array(column) for field, column in self.columns.items()}
+        return self._arrays
+
+    def decide_many(self, indices, cooldowns, healths, max_healths, rng):
+        """
+        Decyzje wielu przeciwników naraz na kolumnach NumPy (np. w symulacji bez obiektów postaci),
+        z tymi samymi szansami co decide. Losowanie to jedna tablica liczb: pierwszy wiersz rozstrzyga
+        ucieczkę, drugi - cios specjalny albo obronę (wykluczają się przez czas odnowienia).
+        :param indices: Numery wierszy zachowań.
+        :param cooldowns: Pozostałe czasy odnowienia umiejętności specjalnej.
+        :param healths: Aktualne zdrowie przeciwników.
+        :param max_healths: Maksymalne zdrowie przeciwników.
+        :param rng: Generator NumPy (numpy.random.Generator).
+        :return: Tablica NumPy akcji (ATTACK, STRIKE, POISON, DEFEND albo FLEE) w kolejności wejścia.
+        """
+        import numpy as np
+
+        table = self.arrays()
+        rows = np.asarray(indices)
+        cooldowns = np.asarray(cooldowns)
+        healths = np.asarray(healths)
+        max_healths = np.asarray(max_healths)
+        flee_roll, roll = rng.random((2, len(rows)))
+        actions = np.full(len(rows), ATTACK, dtype=np.int8)
+        ready = cooldowns == 0
+        special = ready & (roll < table["special_chance"][rows])
+        actions[special] = table["special"][rows[special]]
+        defend = (~ready & (healths * table["defend_divisor"][rows] < max_healths)
+                  & (roll < table["defend_chance"][rows]))
+        actions[defend] = DEFEND
+        flee = (healths * table["flee_divisor"][rows] < max_healths) & (flee_roll < table["flee_chance"][rows])
+        actions[flee] = FLEE
+        return actions
+
+
+# Zachowania przeciwników z zawartości gry (atrybut "behaviour" w world.json); brakujące cechy mają wartości z FIELDS.
+BEHAVIOURS = {
+    DEFAULT: {},
+    POISON_SPITTER: {"special": "poison"},
+}
+
+TABLE = BehaviourTable()
+for _name, _record in BEHAVIOURS.items():
+    TABLE.register(_name, **_record)
+
+
+def behaviour_index(enemy):
+    """Numer wiersza zachowania przeciwnika w TABLE."""
+    return TABLE.index(enemy.behaviour)
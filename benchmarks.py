@@ -0,0 +1,649 @@
+import builtins
+import contextlib
+import copy
+import io
+import time
+import tracemalloc
+
+import ai
+import characters
+import combat
+import encounter
+import events
+import items
+import simulation
+import world
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """Rejestruje funkcję jako benchmark uruchamiany z linii poleceń."""
+    BENCHMARKS[func.__name__.replace("bench_", "")] = func
+    return func
+
+
+def _timed(func, *args, **kwargs):
+    """Wywołuje funkcję i zwraca (wynik, czas w sekundach)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _object_fight_time(player, enemy, fights, sink=None):
+    """
+    Mierzy średni czas jednej walki combat.start_combat (obiekty, gracz zawsze atakuje).
+    :param sink: Odbiorca komunikatów; domyślnie events.NullSink.
+    """
+    original_input = builtins.input
+    builtins.input = lambda prompt="": "1"
+    try:
+        with events.use_sink(sink or events.NullSink()), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(fights):
+                combat.start_combat(copy.deepcopy(player), copy.deepcopy(enemy))
+            return (time.perf_counter() - start) / fights
+    finally:
+        builtins.input = original_input
+
+
+@benchmark
+def bench_vectorized(fights=100000):
+    """Silnik wektorowy kontra silnik obiektowy i bezgłowy symulator na tej samej walce."""
+    import vectorized
+
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    enemy = {e.name: e for e in simulation.enemy_templates()}["Szef Goblinów"]
+
+    object_time = _object_fight_time(player, enemy, 2000) * fights
+    headless, headless_time = _timed(simulation.run_fights, player, enemy, fights, seed=1)
+    vector, vector_time = _timed(vectorized.run_fights, player, enemy, fights, seed=1)
+
+    print(f"obiektowy (szacunek): {object_time:.3f} s")
+    print(f"bezgłowy:             {headless_time:.3f} s  wygrane {headless.win_rate():.2%}")
+    print(f"wektorowy:            {vector_time:.3f} s  wygrane {vector.win_rate():.2%}")
+    print(f"przyspieszenie względem obiektowego: {object_time / vector_time:.0f}x")
+
+
+@benchmark
+def bench_output(fights=2000):
+    """Koszt komunikatów w walce: wypisywanie na terminal, bufor i wyciszone wyjście."""
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    enemy = {e.name: e for e in simulation.enemy_templates()}["Szef Goblinów"]
+    for label, sink in (("terminal", events.TerminalSink()), ("bufor", events.BufferedSink()),
+                        ("wyciszone", events.NullSink())):
+        per_fight = _object_fight_time(player, enemy, fights, sink)
+        print(f"{label:10s} {per_fight * 1e6:8.1f} us/walkę")
+
+
+def _allocated(func, count):
+    """Zwraca (wyniki, bajty zaalokowane przez count wywołań func) według tracemalloc."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func() for _ in range(count)]
+        return results, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark
+def bench_world_memory(sessions=1000):
+    """Pamięć świata na sesję: pełna głęboka kopia kontra instancja współdzielonego szablonu."""
+    template = world.world_template()
+
+    def played_instance():
+        game_map = template.instantiate()
+        with events.muted():
+            game_map["Spokojna Polana"].remove_item("Zardzewiały Miecz")
+        return game_map
+
+    locations = {name: template.location(name) for name in template.locations}
+    _, deep_bytes = _allocated(lambda: copy.deepcopy(locations), sessions)
+    _, fresh_bytes = _allocated(template.instantiate, sessions)
+    _, played_bytes = _allocated(played_instance, sessions)
+
+    print(f"głęboka kopia:                  {deep_bytes / sessions:8.0f} B/sesję")
+    print(f"nowa instancja:                 {fresh_bytes / sessions:8.0f} B/sesję")
+    print(f"instancja po zmianie 1 lokacji: {played_bytes / sessions:8.0f} B/sesję")
+
+
+@benchmark
+def bench_inventory(items_count=10000, lookups=2000):
+    """Wyszukiwanie i zdejmowanie przedmiotów w dużym ekwipunku: lista ze skanowaniem kontra indeks po nazwie."""
+    player = characters.Player("Kolekcjoner")
+    names = [f"Kamień {i}" for i in range(items_count)]
+    with events.muted():
+        for name in names:
+            player.add_item_to_inventory(items.Item(name, "Zwykły kamień.", 1))
+    plain = list(player.inventory)
+    wanted = names[-lookups:]
+
+    def scan():
+        for name in wanted:
+            for item in plain:
+                if item.name.lower() == name.lower():
+                    break
+
+    _, scan_time = _timed(scan)
+    _, index_time = _timed(lambda: [player.inventory.find(name) for name in wanted])
+    with events.muted():
+        _, take_time = _timed(lambda: [player.remove_item_from_inventory(name) for name in wanted])
+
+    print(f"skan listy: {scan_time / lookups * 1e6:10.2f} us/wyszukanie")
+    print(f"indeks:     {index_time / lookups * 1e6:10.2f} us/wyszukanie")
+    print(f"zdjęcie:    {take_time / lookups * 1e6:10.2f} us/przedmiot")
+
+
+class _DictItem:
+    """Przedmiot w dawnym układzie: wszystkie cechy w __dict__ każdego egzemplarza (punkt odniesienia)."""
+    def __init__(self, template):
+        for field in template.definition._fields:
+            if getattr(template.definition, field) is not None and field != "kind":
+                setattr(self, field, getattr(template.definition, field))
+        for field, _ in template._state:
+            setattr(self, field, getattr(template, field))
+
+
+@benchmark
+def bench_item_memory(copies=100000):
+    """Bajty na egzemplarz przedmiotu: układ ze słownikiem atrybutów kontra pyłek ze slotami."""
+    for template in (world.rusty_sword, world.leather_armor, world.healing_potion):
+        _, dict_bytes = _allocated(lambda: _DictItem(template), copies)
+        _, slot_bytes = _allocated(template.spawn, copies)
+        print(f"{template.name:28s} __dict__: {dict_bytes / copies:6.1f} B  sloty: {slot_bytes / copies:6.1f} B")
+    print(f"definicje przedmiotów w pamięci: {items.definition_count()}")
+
+
+@benchmark
+def bench_commands(count=200000):
+    """Przepustowość rozpoznawania komend i pełnej obsługi komendy przez main.handle_player_input."""
+    import commands
+    import main
+
+    script = ["l", "ekw", "status", "idz północ", "idz południe", "zaloz  stary sztylet", "pomoc", "xyz"]
+    lines = [script[i % len(script)] for i in range(count)]
+
+    def resolve_all():
+        for line in lines:
+            main.COMMANDS.resolve(commands.parse(line)[0])
+
+    def handle_all():
+        location_name = "Spokojna Polana"
+        for line in lines:
+            steps = main.handle_player_input(player, game_map, location_name)
+            next(steps)
+            try:
+                steps.send(line)
+            except StopIteration as stop:
+                location_name = stop.value[0]
+
+    with events.muted():
+        player, game_map, _ = main.new_game("Benchmark")
+        _, resolve_time = _timed(resolve_all)
+        _, handle_time = _timed(handle_all)
+    print(f"parsowanie i rozpoznanie: {count / resolve_time:12.0f} komend/s")
+    print(f"pełna obsługa (wyciszona): {count / handle_time:11.0f} komend/s")
+
+
+@benchmark
+def bench_savegame(locations=5000, deltas=20):
+    """Czas zapisu (pełna migawka i delta) oraz wczytania dla świata z tysiącami odwiedzonych lokalizacji."""
+    import os
+    import tempfile
+
+    import savegame
+    import worldgen
+
+    template = worldgen.generate(locations, seed=1)
+    names = list(template.locations)
+    game_map = template.instantiate()
+    with events.muted():
+        player = characters.Player("Archiwista")
+        for name in names:
+            location = game_map[name]
+            location.visited = True
+            for item in list(location.items_in_location):
+                location.remove_item(item.name)
+
+        with tempfile.TemporaryDirectory() as directory:
+            save = savegame.SaveFile(os.path.join(directory, "bench.sav"), max_deltas=deltas + 1)
+            full_size, full_time = _timed(save.save, player, game_map, names[0])
+            delta_times = []
+            for i in range(deltas):
+                for name in names[i * 10:i * 10 + 10]:
+                    for enemy in game_map[name].enemies:
+                        game_map[name].claim_enemy(enemy).take_damage(5)
+                    game_map[name].visited = True
+                delta_size, delta_time = _timed(save.save, player, game_map, names[i])
+                delta_times.append(delta_time)
+            _, load_time = _timed(savegame.SaveFile(save.path).load, None, template.instantiate())
+
+    print(f"pełna migawka: {full_time * 1000:8.2f} ms  {full_size / 1024:8.1f} KiB")
+    print(f"delta (10 lokacji): {sum(delta_times) / deltas * 1000:8.3f} ms  {delta_size / 1024:8.1f} KiB")
+    print(f"wczytanie (migawka + {deltas} delt): {load_time * 1000:8.2f} ms")
+
+
+@benchmark
+def bench_content_startup(sizes=(1000, 10000, 50000)):
+    """Start świata z paczki zawartości: otwarcie paczki, nowa sesja i wejście do pierwszej lokalizacji."""
+    import json
+    import os
+    import tempfile
+
+    import content
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            source_path = os.path.join(directory, f"swiat_{size}.json")
+            rooms = [{"name": f"Komnata {i}", "description": "Pusta komnata.",
+                      "exits": {"dalej": f"Komnata {(i + 1) % size}"}, "items": ["rusty_sword"]}
+                     for i in range(size)]
+            with open(source_path, "w", encoding="utf-8") as file:
+                json.dump({"items": {"rusty_sword": world.content().pack.items["rusty_sword"]},
+                           "locations": rooms}, file)
+            _, compile_time = _timed(content.compile_pack, source_path, source_path + ".pack")
+
+            def start():
+                locations = world.ContentLocations(content.ContentPack(source_path + ".pack"))
+                template = world.WorldTemplate(locations, locations.pack.start)
+                game_map = template.instantiate()
+                with events.muted():
+                    game_map[template.start].describe()
+                locations.pack.close()
+                return template
+
+            template, start_time = _timed(start)
+            print(f"{size:6d} lokacji: kompilacja {compile_time * 1000:8.1f} ms, "
+                  f"start sesji {start_time * 1000:6.2f} ms, utworzone lokacje: {template.loaded_count()}")
+
+
+@benchmark
+def bench_worldgen(sizes=(1000, 10000, 100000, 1000000), moves=20000):
+    """Proceduralny świat jako wejście testów: koszt utworzenia i losowego spaceru (ruch, opis, rzut na zasadzkę)."""
+    import random
+
+    import main
+    import worldgen
+
+    for size in sizes:
+        template, build_time = _timed(worldgen.generate, size, 7)
+        game_map = template.instantiate()
+        rng = random.Random(size)
+
+        def walk():
+            location_name = template.start
+            ambushes = 0
+            for _ in range(moves):
+                direction = rng.choice(list(game_map[location_name].exits))
+                location_name, _ = main.handle_go(None, game_map, location_name, direction)
+                game_map[location_name].describe()
+                if game_map[location_name].enemies and rng.random() < 0.1:
+                    ambushes += 1
+            return ambushes
+
+        tracemalloc.start()
+        with events.muted():
+            ambushes, walk_time = _timed(walk)
+        memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{size:8d} lokacji: budowa {build_time * 1000:6.2f} ms, ruch {walk_time / moves * 1e6:6.1f} us, "
+              f"zasadzki {ambushes}, utworzone {template.loaded_count()}, pamięć {memory / 1024:8.1f} KiB")
+
+
+@benchmark
+def bench_routing(size=100000, queries=200):
+    """Trasy w wygenerowanym świecie: budowa grafu, BFS, A* i trafienia w pamięć podręczną tras."""
+    import random
+
+    import routing
+    import worldgen
+
+    template = worldgen.generate(size, seed=3)
+    router, build_time = _timed(routing.Router, template)
+    graph = router.graph
+    rng = random.Random(0)
+    pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+    near = [(a, min(size - 1, a + rng.randrange(1, 40))) for a, _ in pairs]
+
+    _, astar_time = _timed(lambda: [graph.astar(a, b) for a, b in pairs])
+    _, bfs_time = _timed(lambda: [graph.bfs(a, b) for a, b in near])
+    _, astar_near_time = _timed(lambda: [graph.astar(a, b) for a, b in near])
+    names = [(graph.names[a], graph.names[b]) for a, b in pairs]
+    for source, destination in names:
+        router.route(source, destination)
+    _, cached_time = _timed(lambda: [router.route(source, destination) for source, destination in names])
+    hubs = [graph.names[rng.randrange(size)] for _ in range(4)]
+    for hub in hubs:
+        for _ in range(routing.TREE_DEMAND):
+            router.route(graph.names[rng.randrange(size)], hub)
+    to_hubs = [(graph.names[rng.randrange(size)], hubs[i % len(hubs)]) for i in range(queries)]
+    _, tree_time = _timed(lambda: [router.route(source, hub) for source, hub in to_hubs])
+
+    print(f"budowa grafu ({size} lokacji): {build_time * 1000:8.1f} ms")
+    print(f"A* (losowe pary):      {astar_time / queries * 1e6:10.1f} us/trasę")
+    print(f"BFS (bliskie pary):    {bfs_time / queries * 1e6:10.1f} us/trasę")
+    print(f"A* (bliskie pary):     {astar_near_time / queries * 1e6:10.1f} us/trasę")
+    print(f"trasa z pamięci (LRU): {cached_time / queries * 1e6:10.2f} us/trasę")
+    print(f"nowa trasa do częstego celu (drzewo kroków): {tree_time / queries * 1e6:10.1f} us/trasę")
+
+
+@benchmark
+def bench_combat_log(fights=2000, archive_copies=100):
+    """Koszt dziennika walki, powtórka z dziennika oraz hurtowe wczytanie kolumn zdarzeń z archiwum."""
+    import os
+    import tempfile
+
+    import combatlog
+
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    enemy = {e.name: e for e in simulation.enemy_templates()}["Leśny Pająk"]
+
+    def run(with_log):
+        logs = []
+        with events.muted():
+            for seed in range(fights):
+                log = combatlog.CombatLog() if with_log else None
+                combat.drive(combat.combat_steps(copy.deepcopy(player), copy.deepcopy(enemy), seed, log),
+                             lambda prompt: "1")
+                logs.append(log)
+        return logs
+
+    _, plain_time = _timed(run, False)
+    logs, logged_time = _timed(run, True)
+    replays, replay_time = _timed(lambda: [combatlog.replay(log) for log in logs])
+    assert all(log.same_events(copy) for log, copy in zip(logs, replays))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "walki.log")
+        _, write_time = _timed(lambda: [combatlog.write_logs(path, logs) for _ in range(archive_copies)])
+        table, load_time = _timed(combatlog.load_columns, path)
+        size = os.path.getsize(path)
+    total = fights * archive_copies
+
+    print(f"walka bez dziennika:  {plain_time / fights * 1e6:8.1f} us")
+    print(f"walka z dziennikiem:  {logged_time / fights * 1e6:8.1f} us")
+    print(f"powtórka z dziennika: {replay_time / fights * 1e6:8.1f} us")
+    print(f"archiwum {total} walk: {size / total:.0f} B/walkę, zapis {write_time:.2f} s, "
+          f"wczytanie kolumn {load_time:.2f} s ({len(table['kind'])} zdarzeń, {load_time / total * 1e6:.1f} us/walkę)")
+
+
+@benchmark
+def bench_profiling(fights=2000, records=1000000):
+    """Koszt włączonych pomiarów czasu na walkach obiektowych oraz koszt pojedynczego zapisu do histogramu."""
+    import profiling
+
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    enemy = {e.name: e for e in simulation.enemy_templates()}["Szef Goblinów"]
+    profiler = profiling.Profiler()
+
+    disabled = _object_fight_time(player, enemy, fights)
+    profiler.enable()
+    try:
+        enabled = _object_fight_time(player, enemy, fights)
+    finally:
+        profiler.disable()
+    histogram = profiling.Histogram()
+    _, record_time = _timed(lambda: [histogram.record(value) for value in range(0, 50 * records, 50)])
+
+    print(f"walka bez pomiarów:    {disabled * 1e6:8.1f} us")
+    print(f"walka z pomiarami:     {enabled * 1e6:8.1f} us "
+          f"({sum(h.count for h in profiler.histograms.values()) / fights:.0f} pomiarów/walkę)")
+    print(f"zapis do histogramu:   {record_time / records * 1e9:8.0f} ns")
+    print(profiler.report())
+
+
+def _dict_tick(status_effects):
+    """Dawny tick efektów: przejście po całym słowniku i lista do usunięcia (do porównania)."""
+    expired = []
+    for name, data in status_effects.items():
+        data['duration'] -= 1
+        if data['duration'] <= 0:
+            expired.append(name)
+    for name in expired:
+        del status_effects[name]
+
+
+@benchmark
+def bench_status_effects(counts=(10, 100, 1000), turns=1000):
+    """Koszt tury z wieloma trwającymi premiami: oś czasu z kopcem kontra dawny słownik efektów."""
+    import effects
+
+    for count in counts:
+        boss = characters.Enemy("Boss", 10 ** 9, 10, 0, 0, 0)
+        legacy = {}
+        with events.muted():
+            for index in range(count):
+                duration = turns + 1 + index % 50
+                boss.status_effects.add(boss, effects.create("strength_boost", 1), duration)
+                legacy[f"premia {index}"] = {'duration': duration, 'potency': 1}
+            boss.apply_status_effect("poison", turns + 1, potency=5)
+            _, timeline_time = _timed(lambda: [boss.tick_status_effects() for _ in range(turns)])
+        _, dict_time = _timed(lambda: [_dict_tick(legacy) for _ in range(turns)])
+        print(f"{count:5d} efektów: oś czasu {timeline_time / turns * 1e6:8.2f} us/turę, "
+              f"słownik {dict_time / turns * 1e6:8.2f} us/turę")
+
+
+@benchmark
+def bench_derived_stats(reads=1000000, changes=100000):
+    """Odczyt statystyk z pamięci podręcznej i koszt zmian (modyfikator + pierwszy odczyt po zmianie)."""
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    with events.muted():
+        for armor_type in ("head", "torso", "legs", "shield"):
+            player.add_item_to_inventory(items.Armor(f"Zbroja {armor_type}", "Test.", 2, armor_type))
+            player.equip_item(f"Zbroja {armor_type}")
+
+    class Plain:
+        attack_power = 10
+
+    plain = Plain()
+    _, plain_time = _timed(lambda: [plain.attack_power for _ in range(reads)])
+    _, cached_time = _timed(lambda: [player.defense_power for _ in range(reads)])
+
+    def change_and_read():
+        for index in range(changes):
+            player.add_modifier("defense_power", 1 if index % 2 else -1)
+            player.defense_power
+    _, change_time = _timed(change_and_read)
+
+    print(f"odczyt zwykłego atrybutu:    {plain_time / reads * 1e9:6.0f} ns")
+    print(f"odczyt statystyki (cache):   {cached_time / reads * 1e9:6.0f} ns")
+    print(f"zmiana + ponowne wyliczenie: {change_time / changes * 1e9:6.0f} ns")
+
+
+def _skirmish(size, policy):
+    players = [characters.Player(f"Gracz {index}", health=100, attack_power=12, defense_power=3)
+               for index in range(size)]
+    enemies = [characters.Enemy(f"Wróg {index}", health=60, attack_power=10, defense_power=2,
+                                experience_reward=10, gold_reward=1) for index in range(size)]
+    return encounter.run_encounter(players, enemies, seed=size, player_policy=policy)
+
+
+@benchmark
+def bench_encounter(sizes=(10, 100, 1000)):
+    """Starcia N na N bez komunikatów: czas tury przy różnych politykach wyboru celu (powinien rosnąć jak log n)."""
+    policies = {"najsłabszy": encounter.weakest_target, "najsilniejszy": encounter.strongest_target,
+                "losowy": encounter.random_target}
+    with events.muted():
+        for size in sizes:
+            for label, policy in policies.items():
+                fight, elapsed = _timed(_skirmish, size, policy)
+                print(f"{size:>5} vs {size:<5} {label:<14} tur: {fight.turns:>7}  wynik: {fight.result():<8}"
+                      f" {elapsed / fight.turns * 1e6:6.2f} µs/turę")
+
+
+@benchmark
+def bench_enemy_ai(decisions=200000):
+    """Decyzje przeciwników z tabeli zachowań: pojedynczo, partią decide_many i wektorowo (jedna tura N walk)."""
+    import random
+    import numpy as np
+    import vectorized
+
+    rng = random.Random(0)
+    rows = [index % len(ai.TABLE.names) for index in range(decisions)]
+    cooldowns = [index % 3 for index in range(decisions)]
+    healths = [index % 50 + 1 for index in range(decisions)]
+    max_healths = [50] * decisions
+    decide = ai.TABLE.decide
+    _, single_time = _timed(lambda: [decide(row, cooldown, health, max_health, rng) for row, cooldown, health, max_health
+                                     in zip(rows, cooldowns, healths, max_healths)])
+    columns = [np.array(column) for column in (rows, cooldowns, healths, max_healths)]
+    _, batch_time = _timed(ai.TABLE.decide_many, *columns, np.random.default_rng(0))
+
+    player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    enemy = {e.name: e for e in simulation.enemy_templates()}["Leśny Pająk"]
+    engine = vectorized.VectorFights.repeat(player, enemy, decisions, seed=0)
+    _, vector_time = _timed(engine._enemy_step, np.arange(decisions))
+    print(f"decide pojedynczo: {single_time / decisions * 1e9:6.0f} ns/decyzję")
+    print(f"decide_many:       {batch_time / decisions * 1e9:6.0f} ns/decyzję")
+    print(f"wektorowo (NumPy): {vector_time / decisions * 1e9:6.0f} ns/decyzję")
+
+
+@benchmark
+def bench_shards(shard_counts=(1, 2, 4), players=1000, size=10000, ticks=10, rounds=5):
+    """
+    Komendy na sekundę w świecie podzielonym na regiony (procesy). Oprócz czasu zegarowego podajemy
+    przepustowość liczoną z najwolniejszego regionu w takcie - tyle dałoby się osiągnąć przy osobnym
+    rdzeniu na region.
+    """
+    import functools
+    import os
+    import random
+    import shards
+    import worldgen
+
+    factory = functools.partial(worldgen.generate, size)
+    print(f"rdzenie: {os.cpu_count()}, gracze: {players}, lokalizacje: {size}")
+    for shard_count in shard_counts:
+        with shards.ShardedWorld(factory, shard_count) as sharded:
+            locations = sharded.template.locations
+            rng = random.Random(0)
+            for index in range(players):
+                sharded.add_player(f"Bot {index}", locations.name(rng.randrange(size)))
+            sharded.tick(1)
+            sharded.busy_time = 0.0
+            start = time.perf_counter()
+            commands = moved = 0
+            for _ in range(ticks):
+                tick_commands, tick_moved = sharded.tick(rounds)
+                commands += tick_commands
+                moved += tick_moved
+            elapsed = time.perf_counter() - start
+            print(f"shardy: {shard_count}  komendy: {commands}  przekazania: {moved}  "
+                  f"{commands / elapsed:8.0f} komend/s  (najwolniejszy region: {commands / sharded.busy_time:8.0f} komend/s)")
+
+
+@benchmark
+def bench_shared_world(size=50000, describes=20000):
+    """
+    Pamięć procesu po odwiedzeniu wszystkich lokalizacji: paczka zawartości (obiekty Location z własnymi
+    napisami w każdym procesie) kontra blok sharedworld (tylko pozycje rekordów), oraz koszt describe.
+    """
+    import os
+    import tempfile
+
+    import content
+    import sharedworld
+    import worldgen
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "swiat.json")
+        block_path = os.path.join(directory, "swiat.blok")
+        worldgen.write_content(source_path, size)
+        content.compile_pack(source_path, source_path + ".pack")
+        sharedworld.write_block(worldgen.GeneratedLocations(size).records(), block_path)
+        pack = content.ContentPack(source_path + ".pack")
+        templates = {
+            "paczka": world.WorldTemplate(world.ContentLocations(pack), pack.start),
+            "blok współdzielony": sharedworld.shared_template(block_path),
+        }
+        for label, template in templates.items():
+            names = list(template.locations)
+            _, allocated = _allocated(lambda: [template.location(name) for name in names], 1)
+            game_map = template.instantiate()
+            with events.muted():
+                _, describe_time = _timed(lambda: [game_map[names[index % size]].describe()
+                                                   for index in range(describes)])
+            print(f"{label:<20} pamięć procesu: {allocated / size:6.0f} B/lokację, "
+                  f"describe: {describe_time / describes * 1e6:6.2f} µs")
+        pack.close()
+
+
+@benchmark
+def bench_loot(draws=1000000, kills=100000):
+    """
+    Losowanie łupów: metoda aliasów (jedno random() na losowanie) kontra random.choices z wagami,
+    pełne drop_loot z nowymi egzemplarzami oraz hurtowe zliczenie łupów bez tworzenia przedmiotów.
+    """
+    import random
+
+    import loot
+
+    chief = world.content().enemy("goblin_chief")
+    table = loot.LootTable.of(chief)
+    rng = random.Random(0)
+    outcomes = list(range(len(table.items) + 1))
+    weights = table.weights + (table.empty_weight,)
+    _, alias_time = _timed(lambda: [table.table.draw(rng) for _ in range(draws)])
+    _, choices_time = _timed(lambda: [random.choices(outcomes, weights)[0] for _ in range(draws)])
+    with events.muted():
+        _, drop_time = _timed(lambda: [chief.drop_loot(rng) for _ in range(kills)])
+    _, counts_time = _timed(table.counts, kills, rng)
+    print(f"alias draw:         {alias_time / draws * 1e9:6.0f} ns/losowanie")
+    print(f"random.choices:     {choices_time / draws * 1e9:6.0f} ns/losowanie")
+    print(f"drop_loot:          {drop_time / kills * 1e6:6.2f} µs/przeciwnika ({table.rolls} losowania)")
+    print(f"LootTable.counts:   {counts_time / kills * 1e6:6.2f} µs/przeciwnika")
+
+
+@benchmark
+def bench_economy(sizes=((1000, 1000), (10000, 100), (100000, 20))):
+    """Symulacja gospodarki partiami: agento-dni na sekundę przy różnych proporcjach agentów i dni."""
+    import economy
+
+    market = economy.Market.from_content()
+    for agents, days in sizes:
+        report, elapsed = _timed(economy.EconomySimulation(agents, market, seed=0).run, days)
+        print(f"{agents:>7} agentów x {days:>5} dni: {agents * days / elapsed:>10,.0f} agento-dni/s, "
+              f"złoto w obiegu na koniec: {report.gold_supply[-1]:,}")
+
+
+@benchmark
+def bench_progression(levels=(10, 100, 1000), players=2000):
+    """
+    Gracz na wysokim poziomie: kolejne level_up (każdy awans osobno, z komunikatami) kontra jedna
+    nagroda XP rozstrzygana wyszukiwaniem binarnym w progression.TABLE oraz Player.at_level.
+    """
+    import progression
+
+    for level in levels:
+        experience = progression.TABLE.experience_for(level)
+
+        def one_by_one():
+            for _ in range(players):
+                player = characters.Player("Symulant")
+                for _ in range(level - 1):
+                    player.level_up()
+
+        def bulk_award():
+            for _ in range(players):
+                characters.Player("Symulant").gain_experience(experience)
+
+        def at_level():
+            for _ in range(players):
+                characters.Player.at_level("Symulant", level)
+
+        with events.muted():
+            _, loop_time = _timed(one_by_one)
+            _, bulk_time = _timed(bulk_award)
+            _, direct_time = _timed(at_level)
+        print(f"poziom {level:>5}: level_up po kolei {loop_time / players * 1e6:9.1f} µs, "
+              f"jedna nagroda XP {bulk_time / players * 1e6:6.1f} µs, at_level {direct_time / players * 1e6:6.1f} µs")
+
+
+if __name__ == "__main__":
+    import sys
+
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"=== {name} ===")
+        BENCHMARKS[name]()
@@ -1,3 +1,48 @@
+import copy
+import random
+
+import ai
+import effects
+import events
+import loot
+import progression
+from inventory import Inventory
+
+STATS = ("attack_power", "defense_power")
+EQUIPMENT_SLOTS = ("weapon", "head", "torso", "legs", "shield")
+ARMOR_SLOTS = {"head": "head", "torso": "torso", "legs": "legs", "shield": "shield", "full": "torso"}
+SLOT_NAMES = {"weapon": "Broń", "head": "Hełm", "torso": "Pancerz", "legs": "Nogi", "shield": "Tarcza"}
+
+
+class _DerivedStat:
+    """
+    Statystyka pochodna: wyliczona przy pierwszym odczycie trafia do słownika obiektu pod tą samą nazwą,
+    więc kolejne odczyty to jedno wyszukanie w słowniku. Usunięcie wpisu (Character.invalidate_stats)
+    to flaga "do przeliczenia". Przypisanie jest błędem - ukryłoby wartość wyliczoną tylko do następnego
+    przeliczenia; zmienia się statystykę bazową (np. base_attack_power) albo modyfikatory.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        values = instance.__dict__
+        try:
+            return values[self.name]
+        except KeyError:
+            value = values[self.name] = self.func(instance)
+            return value
+
+    def __set__(self, instance, value):
+        raise AttributeError(f"Statystyka '{self.name}' jest wyliczana - ustaw base_{self.name} "
+                             f"albo użyj add_modifier.")
+
+
 class Character:
     """
     Klasa bazowa dla wszystkich postaci w grze.
@@ -22,12 +67,65 @@ class Character:
         self.name = name
         self.max_health = health
         self.current_health = health
+        self.modifiers = {}
         self.base_attack_power = attack_power 
         self.base_defense_power = defense_power 
-        self.attack_power = attack_power 
-        self.defense_power = defense_power 
         self.is_blocking = False 
-        self.status_effects = {} 
+        self.status_effects = effects.StatusEffects()
+
+    @property
+    def base_attack_power(self):
+        """Bazowa siła ataku (bez ekwipunku i modyfikatorów)."""
+        return self._base_attack_power
+
+    @base_attack_power.setter
+    def base_attack_power(self, value):
+        self._base_attack_power = value
+        self.invalidate_stats()
+
+    @property
+    def base_defense_power(self):
+        """Bazowa siła obrony (bez ekwipunku i modyfikatorów)."""
+        return self._base_defense_power
+
+    @base_defense_power.setter
+    def base_defense_power(self, value):
+        self._base_defense_power = value
+        self.invalidate_stats()
+
+    @_DerivedStat
+    def attack_power(self):
+        """Końcowa siła ataku: baza + ekwipunek + modyfikatory."""
+        return self._base_attack_power + self._equipment_bonus()[0] + self.modifiers.get("attack_power", 0)
+
+    @_DerivedStat
+    def defense_power(self):
+        """Końcowa siła obrony: baza + ekwipunek + modyfikatory."""
+        return self._base_defense_power + self._equipment_bonus()[1] + self.modifiers.get("defense_power", 0)
+
+    def invalidate_stats(self):
+        """Oznacza statystyki pochodne do ponownego wyliczenia przy następnym odczycie."""
+        self.__dict__.pop("attack_power", None)
+        self.__dict__.pop("defense_power", None)
+
+    def _equipment_bonus(self):
+        """Premia (atak, obrona) z ekwipunku - postać bez ekwipunku nie ma premii."""
+        return 0, 0
+
+    def add_modifier(self, stat, amount):
+        """
+        Dodaje modyfikator statystyki (np. premię z efektu); ujemna wartość zdejmuje wcześniejszą premię.
+        :param stat: "attack_power" lub "defense_power".
+        :param amount: Zmiana statystyki.
+        """
+        if stat not in STATS:
+            raise ValueError(f"Nieznana statystyka '{stat}'.")
+        total = self.modifiers.get(stat, 0) + amount
+        if total:
+            self.modifiers[stat] = total
+        else:
+            self.modifiers.pop(stat, None)
+        self.invalidate_stats()
 
     def __str__(self):
         """
@@ -49,20 +147,21 @@ class Character:
         :param damage: Ilość obrażeń przed redukcją.
         """
         if not isinstance(damage, int) or damage < 0:
-            print("Otrzymane obrażenia muszą być nieujemną liczbą całkowitą.")
+            events.emit("invalid_value", "Otrzymane obrażenia muszą być nieujemną liczbą całkowitą.")
             return
 
         actual_defense = self.defense_power
         if self.is_blocking:
             actual_defense *= 2 
-            print(f"{self.name} blokuje, zwiększając swoją obronę!")
+            events.emit("block", "{name} blokuje, zwiększając swoją obronę!", name=self.name)
 
         reduced_damage = max(0, damage - actual_defense)
         self.current_health -= reduced_damage
-        print(f"{self.name} otrzymuje {reduced_damage} obrażeń.")
+        events.emit("damage_taken", "{name} otrzymuje {amount} obrażeń.",
+                    name=self.name, amount=reduced_damage)
         if self.current_health <= 0:
             self.current_health = 0
-            print(f"{self.name} został pokonany!")
+            events.emit("defeated", "{name} został pokonany!", name=self.name)
         self.is_blocking = False
 
     def heal(self, amount):
@@ -71,13 +170,14 @@ class Character:
         :param amount: Ilość przywracanego zdrowia.
         """
         if not isinstance(amount, int) or amount <= 0:
-            print("Ilość leczenia musi być dodatnią liczbą całkowitą.")
+            events.emit("invalid_value", "Ilość leczenia musi być dodatnią liczbą całkowitą.")
             return
 
         self.current_health += amount
         if self.current_health > self.max_health:
             self.current_health = self.max_health
-        print(f"{self.name} odzyskuje {amount} HP. Aktualne zdrowie: {self.current_health}/{self.max_health}.")
+        events.emit("healed", "{name} odzyskuje {amount} HP. Aktualne zdrowie: {current_health}/{max_health}.",
+                    name=self.name, amount=amount, current_health=self.current_health, max_health=self.max_health)
 
     def attack(self, target):
         """
@@ -85,13 +185,13 @@ class Character:
         :param target: Obiekt postaci (inny Character), który jest atakowany.
         """
         if not self.is_alive():
-            print(f"{self.name} nie może atakować, jest pokonany/a.")
+            events.emit("attack_failed", "{name} nie może atakować, jest pokonany/a.", name=self.name)
             return
         if not target.is_alive():
-            print(f"{target.name} jest już pokonany/a.")
+            events.emit("attack_failed", "{target} jest już pokonany/a.", target=target.name)
             return
 
-        print(f"{self.name} atakuje {target.name}!")
+        events.emit("attack", "{name} atakuje {target}!", name=self.name, target=target.name)
 
         target.take_damage(self.attack_power)
 
@@ -100,40 +200,29 @@ class Character:
         Postać przygotowuje się do obrony.
         """
         if not self.is_alive():
-            print(f"{self.name} nie może się bronić, jest pokonany/a.")
+            events.emit("defend_failed", "{name} nie może się bronić, jest pokonany/a.", name=self.name)
             return
         self.is_blocking = True
-        print(f"{self.name} przygotowuje się do obrony, wzmacniając swoją gardę!")
+        events.emit("defend", "{name} przygotowuje się do obrony, wzmacniając swoją gardę!", name=self.name)
 
     def apply_status_effect(self, effect_name, duration, potency=0):
         """
         Nakłada efekt statusu na postać.
-        :param effect_name: Nazwa efektu (np. "poison", "stun").
+        :param effect_name: Nazwa efektu (np. "poison", "stun"); typ efektu wybiera effects.create.
         :param duration: Czas trwania efektu w turach.
         :param potency: Siła efektu (np. obrażenia od trucizny na turę).
+        :return: Aktywny obiekt efektu.
         """
-        self.status_effects[effect_name] = {'duration': duration, 'potency': potency}
-        print(f"{self.name} zostaje objęty efektem: {effect_name} na {duration} tur.")
+        effect = self.status_effects.add(self, effects.create(effect_name, potency), duration)
+        events.emit("status_applied", "{name} zostaje objęty efektem: {effect_name} na {duration} tur.",
+                    name=self.name, effect_name=effect_name, duration=duration)
+        return effect
 
     def tick_status_effects(self):
         """
-        Przetwarza efekty statusu na koniec tury.
-        """
-        effects_to_remove = []
-        for effect, data in self.status_effects.items():
-            print(f"Efekt '{effect}' działa na {self.name}.")
-            if effect == "poison":
-                damage = data.get('potency', 1) 
-                self.take_damage(damage)
-                print(f"{self.name} traci {damage} HP od trucizny.")
-         
-            data['duration'] -= 1
-            if data['duration'] <= 0:
-                effects_to_remove.append(effect)
-        
-        for effect in effects_to_remove:
-            del self.status_effects[effect]
-            print(f"Efekt '{effect}' na {self.name} skończył się.")
+        Przetwarza efekty statusu na koniec tury (działające efekty i te, które właśnie wygasają).
+        """
+        self.status_effects.tick(self)
 
 
 class Player(Character):
@@ -142,9 +231,8 @@ class Player(Character):
     """
     def __init__(self, name, health=100, attack_power=10, defense_power=5):
         super().__init__(name, health, attack_power, defense_power)
-        self.inventory = [] 
-        self.equipped_weapon = None 
-        self.equipped_armor = None  
+        self.inventory = Inventory()
+        self.equipment = dict.fromkeys(EQUIPMENT_SLOTS)
         self.gold = 50
         self.experience = 0
         self.level = 1
@@ -152,13 +240,26 @@ class Player(Character):
         self.mana = 50
         self.max_mana = 50
 
+    @classmethod
+    def at_level(cls, name, level, health=100, attack_power=10, defense_power=5):
+        """
+        Tworzy gracza od razu na podanym poziomie (np. do symulacji), bez komunikatów o awansach.
+        Statystyki są takie, jak po kolejnych awansach od poziomu 1, a XP na nowym poziomie wynosi 0.
+        :param level: Docelowy poziom (co najmniej 1).
+        """
+        if not isinstance(level, int) or level < 1:
+            raise ValueError("Poziom musi być dodatnią liczbą całkowitą.")
+        player = cls(name, health, attack_power, defense_power)
+        player._advance(level, announce=False)
+        return player
+
     def add_item_to_inventory(self, item):
         """
         Dodaje przedmiot do ekwipunku gracza.
         :param item: Obiekt klasy Item lub jej pochodnych.
         """
-        self.inventory.append(item)
-        print(f"Zdobywasz: {item.name}.")
+        self.inventory.add(item)
+        events.emit("item_gained", "Zdobywasz: {item}.", item=item.name)
 
     def remove_item_from_inventory(self, item_name):
         """
@@ -166,98 +267,114 @@ class Player(Character):
         :param item_name: Nazwa przedmiotu do usunięcia.
         :return: Usunięty przedmiot lub None, jeśli nie znaleziono.
         """
-        for item in self.inventory:
-            if item.name.lower() == item_name.lower():
-                self.inventory.remove(item)
-                print(f"Tracisz: {item.name}.")
-                return item
-        print(f"Nie masz przedmiotu o nazwie '{item_name}'.")
+        item = self.inventory.take(item_name)
+        if item is not None:
+            events.emit("item_lost", "Tracisz: {item}.", item=item.name)
+            return item
+        events.emit("item_missing", "Nie masz przedmiotu o nazwie '{item_name}'.", item_name=item_name)
         return None
 
     def show_inventory(self):
         """
         Wyświetla zawartość ekwipunku gracza.
         """
-        print("\n--- Twój Ekwipunek ---")
+        events.emit("show_inventory", "\n--- Twój Ekwipunek ---")
         if not self.inventory:
-            print("Ekwipunek jest pusty.")
+            events.emit("show_inventory", "Ekwipunek jest pusty.")
         else:
-            for i, item in enumerate(self.inventory):
-                print(f"{i + 1}. {str(item)}") 
-        print(f"Złoto: {self.gold}")
-        print("----------------------")
+            for i, (item, count) in enumerate(self.inventory.stacks()):
+                if count > 1:
+                    events.emit("show_inventory", "{number}. {item} (x{count})",
+                                number=i + 1, item=item, count=count)
+                else:
+                    events.emit("show_inventory", "{number}. {item}", number=i + 1, item=item) 
+        events.emit("show_inventory", "Złoto: {gold}", gold=self.gold)
+        events.emit("show_inventory", "----------------------")
+
+    @property
+    def equipped_weapon(self):
+        """Broń w slocie 'weapon' albo None."""
+        return self.equipment["weapon"]
+
+    @property
+    def equipped_armor(self):
+        """Pancerz w slocie 'torso' albo None."""
+        return self.equipment["torso"]
+
+    def _equipment_bonus(self):
+        weapon = self.equipment["weapon"]
+        defense = 0
+        for slot, item in self.equipment.items():
+            if slot != "weapon" and item is not None:
+                defense += item.defense
+        return (weapon.damage if weapon is not None else 0), defense
 
     def equip_item(self, item_name):
         """
-        Ekwipuje przedmiot z ekwipunku.
+        Ekwipuje przedmiot z ekwipunku: broń do slotu 'weapon', pancerz do slotu wynikającego z armor_type.
         :param item_name: Nazwa przedmiotu do założenia.
         """
-        item_to_equip = None
-        for item in self.inventory:
-            if item.name.lower() == item_name.lower():
-                item_to_equip = item
-                break
+        item_to_equip = self.inventory.find(item_name)
         
         if not item_to_equip:
-            print(f"Nie masz '{item_name}' w ekwipunku.")
+            events.emit("item_missing", "Nie masz '{item_name}' w ekwipunku.", item_name=item_name)
             return
 
         if hasattr(item_to_equip, 'damage'): 
-            if self.equipped_weapon:
-                self.unequip_item_slot('weapon') 
-            self.equipped_weapon = item_to_equip
-            self.attack_power = self.base_attack_power + self.equipped_weapon.damage
-            print(f"Zakładasz {self.equipped_weapon.name} (+{self.equipped_weapon.damage} ATK).")
-            self.inventory.remove(item_to_equip) 
-
+            slot = "weapon"
         elif hasattr(item_to_equip, 'defense'):
-            if self.equipped_armor:
-                self.unequip_item_slot('armor')
-            self.equipped_armor = item_to_equip
-            self.defense_power = self.base_defense_power + self.equipped_armor.defense
-            print(f"Zakładasz {self.equipped_armor.name} (+{self.equipped_armor.defense} DEF).")
-            self.inventory.remove(item_to_equip)
+            slot = ARMOR_SLOTS[item_to_equip.armor_type]
         else:
-            print(f"{item_to_equip.name} nie jest bronią ani pancerzem.")
+            events.emit("item_not_equippable", "{item_to_equip} nie jest bronią ani pancerzem.",
+                        item_to_equip=item_to_equip.name)
+            return
 
+        if self.equipment[slot]:
+            self.unequip_item_slot(slot)
+        self.equipment[slot] = item_to_equip
+        self.invalidate_stats()
+        if slot == "weapon":
+            events.emit("item_equipped", "Zakładasz {equipped_weapon} (+{damage} ATK).",
+                        equipped_weapon=item_to_equip.name, damage=item_to_equip.damage)
+        else:
+            events.emit("item_equipped", "Zakładasz {equipped_armor} (+{defense} DEF).",
+                        equipped_armor=item_to_equip.name, defense=item_to_equip.defense)
+        self.inventory.remove(item_to_equip)
 
     def unequip_item_slot(self, slot_type):
         """
-        Zdejmuje przedmiot z danego slotu (broń lub pancerz) i przywraca bazowe statystyki.
-        :param slot_type: 'weapon' lub 'armor'.
-        """
-        if slot_type == 'weapon' and self.equipped_weapon:
-            print(f"Zdejmujesz {self.equipped_weapon.name}.")
-            self.add_item_to_inventory(self.equipped_weapon) 
-            self.attack_power = self.base_attack_power
-            self.equipped_weapon = None
-        elif slot_type == 'armor' and self.equipped_armor:
-            print(f"Zdejmujesz {self.equipped_armor.name}.")
-            self.add_item_to_inventory(self.equipped_armor)
-            self.defense_power = self.base_defense_power
-            self.equipped_armor = None
-        else:
-            print(f"Nie masz niczego założonego w slocie '{slot_type}'.")
+        Zdejmuje przedmiot z danego slotu i odkłada go do ekwipunku.
+        :param slot_type: Jeden z EQUIPMENT_SLOTS; 'armor' oznacza slot 'torso'.
+        """
+        slot = "torso" if slot_type == "armor" else slot_type
+        item = self.equipment.get(slot)
+        if item is None:
+            events.emit("slot_empty", "Nie masz niczego założonego w slocie '{slot_type}'.",
+                        slot_type=slot_type)
+            return
+        events.emit("item_unequipped", "Zdejmujesz {item}.", item=item.name)
+        self.add_item_to_inventory(item)
+        self.equipment[slot] = None
+        self.invalidate_stats()
 
     def use_potion_from_inventory(self, potion_name):
         """
         Używa mikstury z ekwipunku.
         :param potion_name: Nazwa mikstury do użycia.
         """
-        potion_to_use = None
-        for item in self.inventory:
-            if item.name.lower() == potion_name.lower() and hasattr(item, 'effect_type'): 
-                potion_to_use = item
-                break
+        potion_to_use = self.inventory.find(potion_name)
+        if potion_to_use is not None and not hasattr(potion_to_use, 'effect_type'):
+            potion_to_use = None
         
         if potion_to_use:
             if potion_to_use.use(self): 
                 if potion_to_use.sips_left <= 0:
                     self.inventory.remove(potion_to_use) 
             else:
-                print(f"Nie udało się użyć {potion_name}.")
+                events.emit("potion_failed", "Nie udało się użyć {potion_name}.", potion_name=potion_name)
         else:
-            print(f"Nie masz mikstury '{potion_name}' lub to nie jest mikstura.")
+            events.emit("item_missing", "Nie masz mikstury '{potion_name}' lub to nie jest mikstura.",
+                        potion_name=potion_name)
 
     def gain_experience(self, amount):
         """
@@ -265,44 +382,56 @@ class Player(Character):
         :param amount: Ilość zdobytego XP.
         """
         if not isinstance(amount, int) or amount < 0:
-            print("Ilość doświadczenia musi być nieujemną liczbą całkowitą.")
+            events.emit("invalid_value", "Ilość doświadczenia musi być nieujemną liczbą całkowitą.")
             return
 
         self.experience += amount
-        print(f"{self.name} zdobywa {amount} punktów doświadczenia.")
-        while self.experience >= self.xp_to_next_level:
-            self.level_up()
+        events.emit("experience_gained", "{name} zdobywa {amount} punktów doświadczenia.",
+                    name=self.name, amount=amount)
+        if self.experience >= self.xp_to_next_level:
+            table = progression.TABLE
+            level = table.level_for(table.experience_for(self.level) + self.experience)
+            self.experience -= table.experience_for(level) - table.experience_for(self.level)
+            self._advance(level)
 
     def level_up(self):
         """
-        Gracz awansuje na kolejny poziom.
+        Gracz awansuje na kolejny poziom (zużywając XP potrzebne na awans).
         """
-        self.level += 1
-        self.experience -= self.xp_to_next_level 
-        self.xp_to_next_level = int(self.xp_to_next_level * 1.5) 
+        self.experience -= self.xp_to_next_level
+        self._advance(self.level + 1)
 
-       
-        health_gain = 10 + self.level * 2
-        attack_gain = 2 + self.level // 2
-        defense_gain = 1 + self.level // 3
-        mana_gain = 5 + self.level
+    def _advance(self, level, announce=True):
+        """
+        Przenosi gracza na podany poziom, dodając naraz łączne przyrosty statystyk z tabeli progression.TABLE.
+        Awans o kilka poziomów kończy się jednym podsumowaniem zamiast komunikatów z każdego poziomu.
+        """
+        health_gain, attack_gain, defense_gain, mana_gain = progression.TABLE.gains_between(self.level, level)
+        self.level = level
+        self.xp_to_next_level = progression.TABLE.threshold(level)
 
         self.max_health += health_gain
         self.current_health = self.max_health 
         self.base_attack_power += attack_gain
-        self.attack_power += attack_gain 
         self.base_defense_power += defense_gain
-        self.defense_power += defense_gain 
         self.max_mana += mana_gain
         self.mana = self.max_mana
 
-        print(f"*** {self.name} awansuje na POZIOM {self.level}! ***")
-        print(f"Zdrowie: +{health_gain} (teraz {self.max_health})")
-        print(f"Atak: +{attack_gain} (bazowy teraz {self.base_attack_power})")
-        print(f"Obrona: +{defense_gain} (bazowa teraz {self.base_defense_power})")
-        print(f"Mana: +{mana_gain} (teraz {self.max_mana})")
-        print(f"Do następnego poziomu: {self.xp_to_next_level - self.experience} XP.")
-        print("Gratulacje! Jesteś silniejszy/a!")
+        if not announce:
+            return
+        events.emit("level_up", "*** {name} awansuje na POZIOM {level}! ***",
+                    name=self.name, level=self.level)
+        events.emit("level_up", "Zdrowie: +{health_gain} (teraz {max_health})",
+                    health_gain=health_gain, max_health=self.max_health)
+        events.emit("level_up", "Atak: +{attack_gain} (bazowy teraz {base_attack_power})",
+                    attack_gain=attack_gain, base_attack_power=self.base_attack_power)
+        events.emit("level_up", "Obrona: +{defense_gain} (bazowa teraz {base_defense_power})",
+                    defense_gain=defense_gain, base_defense_power=self.base_defense_power)
+        events.emit("level_up", "Mana: +{mana_gain} (teraz {max_mana})",
+                    mana_gain=mana_gain, max_mana=self.max_mana)
+        events.emit("level_up", "Do następnego poziomu: {remaining} XP.",
+                    remaining=self.xp_to_next_level - self.experience)
+        events.emit("level_up", "Gratulacje! Jesteś silniejszy/a!")
 
     def restore_mana(self, amount):
         """
@@ -310,45 +439,66 @@ class Player(Character):
         :param amount: Ilość przywracanej many.
         """
         if not isinstance(amount, int) or amount <= 0:
-            print("Ilość many musi być dodatnią liczbą całkowitą.")
+            events.emit("invalid_value", "Ilość many musi być dodatnią liczbą całkowitą.")
             return
 
         self.mana += amount
         if self.mana > self.max_mana:
             self.mana = self.max_mana
-        print(f"{self.name} odzyskuje {amount} MP. Aktualna mana: {self.mana}/{self.max_mana}.")
+        events.emit("mana_restored", "{name} odzyskuje {amount} MP. Aktualna mana: {mana}/{max_mana}.",
+                    name=self.name, amount=amount, mana=self.mana, max_mana=self.max_mana)
 
     def display_status(self):
         """
         Wyświetla aktualny status gracza.
         """
-        print("\n--- Status Gracza ---")
-        print(f"Imię: {self.name}")
-        print(f"Poziom: {self.level} (XP: {self.experience}/{self.xp_to_next_level})")
-        print(f"Zdrowie: {self.current_health}/{self.max_health}")
-        print(f"Mana: {self.mana}/{self.max_mana}")
-        print(f"Atak: {self.attack_power} (Bazowy: {self.base_attack_power})")
-        print(f"Obrona: {self.defense_power} (Bazowy: {self.base_defense_power})")
-        print(f"Złoto: {self.gold}")
+        events.emit("display_status", "\n--- Status Gracza ---")
+        events.emit("display_status", "Imię: {name}", name=self.name)
+        events.emit("display_status", "Poziom: {level} (XP: {experience}/{xp_to_next_level})",
+                    level=self.level, experience=self.experience, xp_to_next_level=self.xp_to_next_level)
+        events.emit("display_status", "Zdrowie: {current_health}/{max_health}",
+                    current_health=self.current_health, max_health=self.max_health)
+        events.emit("display_status", "Mana: {mana}/{max_mana}", mana=self.mana, max_mana=self.max_mana)
+        events.emit("display_status", "Atak: {attack_power} (Bazowy: {base_attack_power})",
+                    attack_power=self.attack_power, base_attack_power=self.base_attack_power)
+        events.emit("display_status", "Obrona: {defense_power} (Bazowy: {base_defense_power})",
+                    defense_power=self.defense_power, base_defense_power=self.base_defense_power)
+        events.emit("display_status", "Złoto: {gold}", gold=self.gold)
         if self.equipped_weapon:
-            print(f"Broń: {self.equipped_weapon.name} (+{self.equipped_weapon.damage} ATK)")
+            events.emit("display_status", "Broń: {equipped_weapon} (+{damage} ATK)",
+                        equipped_weapon=self.equipped_weapon.name, damage=self.equipped_weapon.damage)
         else:
-            print("Broń: Brak")
-        if self.equipped_armor:
-            print(f"Pancerz: {self.equipped_armor.name} (+{self.equipped_armor.defense} DEF)")
-        else:
-            print("Pancerz: Brak")
+            events.emit("display_status", "Broń: Brak")
+        for slot in EQUIPMENT_SLOTS[1:]:
+            item = self.equipment[slot]
+            if item is not None:
+                events.emit("display_status", "{slot}: {item} (+{defense} DEF)",
+                            slot=SLOT_NAMES[slot], item=item.name, defense=item.defense)
+            elif slot == "torso":
+                events.emit("display_status", "Pancerz: Brak")
+        if self.modifiers:
+            events.emit("display_status", "Modyfikatory: ATK {attack:+d}, DEF {defense:+d}",
+                        attack=self.modifiers.get("attack_power", 0), defense=self.modifiers.get("defense_power", 0))
         if self.status_effects:
-            print("Aktywne efekty:")
-            for effect, data in self.status_effects.items():
-                print(f"  - {effect.capitalize()}: {data['duration']} tur (Siła: {data.get('potency', 'N/A')})")
-        print("--------------------")
+            events.emit("display_status", "Aktywne efekty:")
+            for name, effect in self.status_effects.items():
+                events.emit("display_status", "  - {effect}: {duration} tur (Siła: {potency})",
+                            effect=name.capitalize(), duration=effect.duration,
+                            potency=self.status_effects.potency(name))
+        events.emit("display_status", "--------------------")
 
 
 class Enemy(Character):
     """
     Klasa reprezentująca przeciwnika. Dziedziczy po Character.
+    Decyzje w walce podejmuje według wiersza ai.TABLE o nazwie behaviour.
+    Łupy losuje z wag loot_weights (loot.LootTable); bez wag upuszcza cały loot_table.
     """
+    behaviour = ai.DEFAULT
+    loot_weights = None
+    loot_rolls = 1
+    loot_empty_weight = 0
+
     def __init__(self, name, health, attack_power, defense_power, experience_reward, gold_reward, loot_table=None):
         """
         Inicjalizuje przeciwnika.
@@ -373,28 +523,44 @@ class Enemy(Character):
         self.special_ability_cooldown = 0
         self.max_cooldown = 3 
 
-    def drop_loot(self):
+    def drop_loot(self, rng=random):
+        """
+        Zwraca listę przedmiotów upuszczonych przez przeciwnika - zawsze nowe egzemplarze.
+        :param rng: Źródło losowości łupów (random.Random); domyślnie moduł random.
+        """
+        table = loot.LootTable.of(self)
+        if table is None:
+            dropped = [item.spawn() for item in self.loot_table]
+        else:
+            dropped = table.roll(rng)
+        if dropped:
+            events.emit("loot_dropped", "{name} upuszcza:", name=self.name)
+            for item in dropped:
+                events.emit("loot_dropped", "- {item}", item=item.name)
+        return dropped
+
+    def spawn(self):
         """
-        Zwraca listę przedmiotów upuszczonych przez przeciwnika.
-        Na razie proste - zwraca całą tabelę. Można dodać losowość.
+        Zwraca nowy egzemplarz przeciwnika z własnym stanem. Szablon, z którego powstał, pozostaje
+        niezmieniony; tabela łupów jest współdzielona, bo drop_loot zawsze tworzy nowe egzemplarze.
         """
-        if self.loot_table:
-            print(f"{self.name} upuszcza:")
-            for item in self.loot_table:
-                print(f"- {item.name}")
-            return self.loot_table 
-        return []
+        enemy = copy.copy(self)
+        enemy.modifiers = dict(self.modifiers)
+        enemy.status_effects = self.status_effects.copy()
+        return enemy
 
-    def use_special_ability(self, target):
+    def use_special_ability(self, target, damage_percent=150):
         """
         Przykładowa specjalna umiejętność. Każdy wróg może mieć inną.
         Ta jest ogólna - silniejszy atak.
+        :param damage_percent: Obrażenia ciosu w procentach siły ataku.
         """
         if self.special_ability_cooldown == 0:
-            print(f"{self.name} używa specjalnej umiejętności!")
+            events.emit("special_ability", "{name} używa specjalnej umiejętności!", name=self.name)
           
-            special_damage = int(self.attack_power * 1.5)
-            print(f"{self.name} wykonuje POTĘŻNY CIOS zadając {special_damage} obrażeń!")
+            special_damage = self.attack_power * damage_percent // 100
+            events.emit("special_ability", "{name} wykonuje POTĘŻNY CIOS zadając {special_damage} obrażeń!",
+                        name=self.name, special_damage=special_damage)
             target.take_damage(special_damage)
             self.special_ability_cooldown = self.max_cooldown 
             return True
@@ -1,13 +1,46 @@
 
 import random 
 
+import ai
+import events
+
+
+def effects_text(status_effects):
+    """
+    Zwraca opis aktywnych efektów, np. "Poison (3 tur)" albo "Strength_boost x2 (5 tur)".
+    :param status_effects: Efekty postaci (effects.StatusEffects).
+    """
+    parts = []
+    for name, effect in status_effects.items():
+        stacks = status_effects.count(name)
+        label = f"{name.capitalize()} x{stacks}" if stacks > 1 else name.capitalize()
+        parts.append(f"{label} ({effect.duration} tur)")
+    return ', '.join(parts)
+
+
+def drive(steps, read_input=None):
+    """
+    Prowadzi generator gry, odpowiadając na jego pytania (prompty) funkcją read_input.
+    :param steps: Generator zwracający prompty i przyjmujący odpowiedzi gracza.
+    :param read_input: Funkcja prompt -> odpowiedź; domyślnie wbudowane input().
+    :return: Wartość zwrócona przez generator.
+    """
+    read_input = read_input or input
+    try:
+        prompt = next(steps)
+        while True:
+            prompt = steps.send(read_input(prompt))
+    except StopIteration as stop:
+        return stop.value
+
+
 def display_combat_status(player, enemy):
     """
     Wyświetla status gracza i przeciwnika podczas walki.
     :param player: Obiekt gracza.
     :param enemy: Obiekt przeciwnika.
     """
-    print("--- STAN WALKI ---")
+    events.emit("combat_status", "--- STAN WALKI ---")
    # print(f"TY: {player.name} | HP: {player.current_health}/{player.max_health} | Mana: {player.mana}/{player.max_mana}")
     #if player.status_effects:
     #    print(f"  Twoje efekty: {', '.join([f'{k} ({v['czas trwania']} tur)' for k,v in player.status_effects.items()])}")
@@ -18,46 +51,44 @@ def display_combat_status(player, enemy):
     #    print(f"  Efekty wroga: {', '.join([f'{k.capitalize()} ({v['duration']} tur)' for k,v in enemy.status_effects.items()])}")
     #print("--------------------")
     #print()
-    print(f"TY: {player.name} | HP: {player.current_health}/{player.max_health} | Mana: {player.mana}/{player.max_mana}")
+    events.emit("combat_status", "TY: {player} | HP: {current_health}/{max_health} | Mana: {mana}/{max_mana}",
+                player=player.name, current_health=player.current_health, max_health=player.max_health, mana=player.mana, max_mana=player.max_mana)
     if player.status_effects:
-        
-        effects_str_list = []
-        for k, v in player.status_effects.items():
-            effects_str_list.append(f"{k.capitalize()} ({v['duration']} tur)")
-        print(f"  Twoje efekty: {', '.join(effects_str_list)}")
-    print(f"WRÓG: {enemy.name} | HP: {enemy.current_health}/{enemy.max_health}")
+        events.emit("combat_status", "  Twoje efekty: {effects}",
+                    effects=events.Lazy(effects_text, player.status_effects))
+    events.emit("combat_status", "WRÓG: {enemy} | HP: {current_health}/{max_health}",
+                enemy=enemy.name, current_health=enemy.current_health, max_health=enemy.max_health)
     if enemy.status_effects:
-        effects_str_list_enemy = []
-        for k, v in enemy.status_effects.items():
-            effects_str_list_enemy.append(f"{k.capitalize()} ({v['duration']} tur)")
-        print(f"  Efekty wroga: {', '.join(effects_str_list_enemy)}")
-    print("--------------------")
-    print()
+        events.emit("combat_status", "  Efekty wroga: {effects}",
+                    effects=events.Lazy(effects_text, enemy.status_effects))
+    events.emit("combat_status", "--------------------")
+    events.emit("combat_status", "")
 
 
 
 
 
 
-def player_turn(player, enemy):
+def player_turn(player, enemy, rng=random):
     """
-    Obsługuje turę gracza w walce.
+    Obsługuje turę gracza w walce. Generator - o wybory gracza pyta przez yield promptu.
     :param player: Obiekt gracza.
     :param enemy: Obiekt przeciwnika.
+    :param rng: Źródło losowości walki (random.Random); domyślnie moduł random.
     :return: True jeśli walka trwa, False jeśli gracz uciekł lub coś zakończyło walkę.
     """
-    print("--- TWOJA TURA ---")
+    events.emit("combat_menu", "--- TWOJA TURA ---")
     while True:
-        print("Wybierz akcję:")
-        print("1. Atakuj")
-        print("2. Broń się")
-        print("3. Użyj przedmiotu (mikstury)")
-        print("4. Sprawdź status")
-        print("5. Uciekaj (ryzykowne!)")
+        events.emit("combat_menu", "Wybierz akcję:")
+        events.emit("combat_menu", "1. Atakuj")
+        events.emit("combat_menu", "2. Broń się")
+        events.emit("combat_menu", "3. Użyj przedmiotu (mikstury)")
+        events.emit("combat_menu", "4. Sprawdź status")
+        events.emit("combat_menu", "5. Uciekaj (ryzykowne!)")
         if player.mana >= 10: 
-             print("6. Magiczny Pocisk (koszt: 10 Many)")
+             events.emit("combat_menu", "6. Magiczny Pocisk (koszt: 10 Many)")
 
-        choice = input("Twój wybór: > ")
+        choice = yield "Twój wybór: > "
 
         if choice == '1':
             player.attack(enemy)
@@ -67,21 +98,21 @@ def player_turn(player, enemy):
             break
         elif choice == '3':
             if not player.inventory:
-                print("Nie masz żadnych przedmiotów w ekwipunku.")
+                events.emit("invalid_choice", "Nie masz żadnych przedmiotów w ekwipunku.")
                 continue 
 
-            print("Której mikstury chcesz użyć? (Wpisz nazwę lub numer, lub 'anuluj')")
+            events.emit("potion_menu", "Której mikstury chcesz użyć? (Wpisz nazwę lub numer, lub 'anuluj')")
             potion_options = []
             for i, item_obj in enumerate(player.inventory):
                 if hasattr(item_obj, 'effect_type'): 
-                    print(f"{i+1}. {item_obj.name}")
+                    events.emit("potion_menu", "{number}. {item_obj}", number=i + 1, item_obj=item_obj.name)
                     potion_options.append(item_obj)
             
             if not potion_options:
-                print("Nie masz żadnych mikstur.")
+                events.emit("invalid_choice", "Nie masz żadnych mikstur.")
                 continue
 
-            potion_choice = input("Wybór mikstury: > ")
+            potion_choice = yield "Wybór mikstury: > "
             if potion_choice.lower() == 'anuluj':
                 continue
             
@@ -100,13 +131,14 @@ def player_turn(player, enemy):
                 player.use_potion_from_inventory(selected_potion.name)
                 break 
             else:
-                print("Nieprawidłowy wybór mikstury.")
+                events.emit("invalid_choice", "Nieprawidłowy wybór mikstury.")
                 continue 
 
         elif choice == '4':
             player.display_status()
-            enemy_status_line = f"{enemy.name}: HP: {enemy.current_health}/{enemy.max_health}, ATK: {enemy.attack_power}, DEF: {enemy.defense_power}"
-            print(f"Status przeciwnika: {enemy_status_line}")
+            events.emit("combat_status", "Status przeciwnika: {enemy}: HP: {current_health}/{max_health}, ATK: {attack_power}, DEF: {defense_power}",
+                        enemy=enemy.name, current_health=enemy.current_health, max_health=enemy.max_health,
+                        attack_power=enemy.attack_power, defense_power=enemy.defense_power)
             if enemy.status_effects:
      #            print(f"  Efekty wroga: {', '.join([f'{k} ({v['duration']} tur)' for k,v in enemy.status_effects.items()])}")
                 """
@@ -115,95 +147,128 @@ def player_turn(player, enemy):
             :param enemy: Obiekt przeciwnika.
             """
             # type: (characters.Player, characters.Enemy) -> None
-            print("\n--- STAN WALKI ---")
-            print(f"TY: {player.name} | HP: {player.current_health}/{player.max_health} | Mana: {player.mana}/{player.max_mana}")
+            events.emit("combat_status", "\n--- STAN WALKI ---")
+            events.emit("combat_status", "TY: {player} | HP: {current_health}/{max_health} | Mana: {mana}/{max_mana}",
+                        player=player.name, current_health=player.current_health, max_health=player.max_health, mana=player.mana, max_mana=player.max_mana)
             if player.status_effects:
-                # Tworzymy listę stringów opisujących efekty
-                effects_str_list = []
-                for k, v in player.status_effects.items():
-                    effects_str_list.append(f"{k.capitalize()} ({v['duration']} tur)")
-                # Łączymy stringi i wyświetlamy
-                print(f"  Twoje efekty: {', '.join(effects_str_list)}")
-
-            print(f"WRÓG: {enemy.name} | HP: {enemy.current_health}/{enemy.max_health}")
+                events.emit("combat_status", "  Twoje efekty: {effects}",
+                            effects=events.Lazy(effects_text, player.status_effects))
+
+            events.emit("combat_status", "WRÓG: {enemy} | HP: {current_health}/{max_health}",
+                        enemy=enemy.name, current_health=enemy.current_health, max_health=enemy.max_health)
             if enemy.status_effects:
-                # To samo dla wroga
-                effects_str_list_enemy = []
-                for k, v in enemy.status_effects.items():
-                    effects_str_list_enemy.append(f"{k.capitalize()} ({v['duration']} tur)")
-                print(f"  Efekty wroga: {', '.join(effects_str_list_enemy)}")
-            print("--------------------")
-            print()
+                events.emit("combat_status", "  Efekty wroga: {effects}",
+                            effects=events.Lazy(effects_text, enemy.status_effects))
+            events.emit("combat_status", "--------------------")
+            events.emit("combat_status", "")
             continue
         elif choice == '5':
             escape_chance = 0.5 
             if player.current_health < player.max_health / 4:
                 escape_chance = 0.25 
             
-            print("Próbujesz uciec...")
-            if random.random() < escape_chance:
-                print("Udało ci się uciec!")
+            events.emit("flee", "Próbujesz uciec...")
+            if rng.random() < escape_chance:
+                events.emit("flee", "Udało ci się uciec!")
                 return False
             else:
-                print("Nie udało się uciec! Tracisz turę.")
+                events.emit("flee", "Nie udało się uciec! Tracisz turę.")
                 break 
         elif choice == '6' and player.mana >= 10:
             player.mana -= 10
             magic_damage = player.base_attack_power + player.level * 2 
-            print(f"Ciskasz Magiczny Pocisk w {enemy.name}, zadając {magic_damage} obrażeń magicznych (ignoruje część obrony)!")
+            events.emit("magic_missile", "Ciskasz Magiczny Pocisk w {enemy}, zadając {magic_damage} obrażeń magicznych (ignoruje część obrony)!",
+                        enemy=enemy.name, magic_damage=magic_damage)
             
             enemy.take_damage(magic_damage) 
             break
         elif choice == '6' and player.mana < 10:
-            print("Nie masz wystarczająco Many na Magiczny Pocisk!")
+            events.emit("invalid_choice", "Nie masz wystarczająco Many na Magiczny Pocisk!")
             continue
         else:
-            print("Nieprawidłowa komenda. Spróbuj ponownie.")
+            events.emit("invalid_choice", "Nieprawidłowa komenda. Spróbuj ponownie.")
     
     player.tick_status_effects() 
     return True 
 
-def enemy_turn(enemy, player):
-    print(f"--- TURA {enemy.name.upper()} ---")
-    
-    if hasattr(enemy, 'use_special_ability') and enemy.special_ability_cooldown == 0:
-       
-        if random.random() < 0.4: 
-            if enemy.name == "Leśny Pająk": 
-                print(f"{enemy.name} pluje jadem!")
-                if random.random() < 0.6: 
-                    player.apply_status_effect("poison", 3, potency=enemy.attack_power // 3) 
-                else:
-                    print(f"{player.name} unika jadu!")
-                enemy.special_ability_cooldown = enemy.max_cooldown 
-            elif enemy.use_special_ability(player): 
-                pass 
-            else: 
-                enemy.attack(player)
-        else: 
-            enemy.attack(player)
-    elif enemy.current_health < enemy.max_health / 3 and random.random() < 0.3: 
+def enemy_turn(enemy, player, rng=random):
+    """
+    Obsługuje turę przeciwnika. Akcję wybiera tabela zachowań (ai.TABLE) według enemy.behaviour.
+    :param enemy: Obiekt przeciwnika.
+    :param player: Cel przeciwnika.
+    :param rng: Źródło losowości walki (random.Random); domyślnie moduł random.
+    :return: True jeśli walka trwa, False jeśli przeciwnik uciekł.
+    """
+    events.emit("enemy_turn", "--- TURA {enemy} ---", enemy=events.Lazy(enemy.name.upper))
+    behaviour = ai.behaviour_index(enemy)
+    action = ai.TABLE.decide(behaviour, enemy.special_ability_cooldown, enemy.current_health, enemy.max_health, rng)
+
+    if action == ai.FLEE:
+        events.emit("enemy_fled", "{enemy} ucieka z walki!", enemy=enemy.name)
+        return False
+    if action == ai.POISON:
+        events.emit("poison_spit", "{enemy} pluje jadem!", enemy=enemy.name)
+        if rng.random() < ai.TABLE.value(behaviour, "poison_chance"):
+            player.apply_status_effect("poison", ai.TABLE.value(behaviour, "poison_turns"),
+                                       potency=enemy.attack_power // ai.TABLE.value(behaviour, "poison_divisor"))
+        else:
+            events.emit("poison_spit", "{player} unika jadu!", player=player.name)
+        enemy.special_ability_cooldown = enemy.max_cooldown
+    elif action == ai.STRIKE:
+        enemy.use_special_ability(player, ai.TABLE.value(behaviour, "strike_percent"))
+    elif action == ai.DEFEND:
         enemy.defend_action()
-    else: 
+    else:
         enemy.attack(player)
 
     enemy.tick_status_effects() 
     enemy.tick_cooldowns() 
+    return True
+
+
+def start_combat(player, enemy_instance, seed=None, log=None):
+    """
+    Przeprowadza walkę w terminalu, pytając gracza o decyzje przez input().
+    :return: "victory", "defeat", "escaped" lub "fled" (przeciwnik uciekł).
+    """
+    return drive(combat_steps(player, enemy_instance, seed, log))
+
+
+def combat_steps(player, enemy_instance, seed=None, log=None):
+    """
+    Przebieg walki jako generator promptów (do użycia z drive lub z serwerem gry).
+    Cała losowość walki pochodzi z random.Random(seed), więc ziarno i odpowiedzi gracza
+    wystarczają do odtworzenia walki (zob. combatlog.replay).
+    :param player: Obiekt gracza.
+    :param enemy_instance: Obiekt przeciwnika.
+    :param seed: Ziarno walki; None - losowane.
+    :param log: Dziennik walki (combatlog.CombatLog), do którego trafią ziarno, odpowiedzi i zdarzenia.
+    :return: "victory", "defeat", "escaped" lub "fled" (przeciwnik uciekł).
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+    steps = _combat(player, enemy_instance, random.Random(seed), log)
+    if log is None:
+        return (yield from steps)
+    log.begin(seed, player, enemy_instance)
+    return (yield from log.record(steps))
 
 
-def start_combat(player, enemy_instance):
-    print(f"!!! Rozpoczyna się walka: {player.name} vs {enemy_instance.name} !!!")
+def _combat(player, enemy_instance, rng, log):
+    events.emit("combat_start", "!!! Rozpoczyna się walka: {player} vs {enemy_instance} !!!",
+                player=player.name, enemy_instance=enemy_instance.name)
     
    
     player.is_blocking = False
     enemy_instance.is_blocking = False
     
     turn_order = [player, enemy_instance]
-    if random.random() < 0.5:
-        print(f"{enemy_instance.name} jest szybszy i atakuje pierwszy!")
+    if rng.random() < 0.5:
+        events.emit("initiative", "{enemy_instance} jest szybszy i atakuje pierwszy!",
+                    enemy_instance=enemy_instance.name)
         current_turn_idx = 1 
     else:
-        print(f"{player.name} jest szybszy i atakuje pierwszy!")
+        events.emit("initiative", "{player} jest szybszy i atakuje pierwszy!", player=player.name)
         current_turn_idx = 0
 
     while player.is_alive() and enemy_instance.is_alive():
@@ -213,28 +278,32 @@ def start_combat(player, enemy_instance):
         passive_character = turn_order[(current_turn_idx + 1) % 2]
 
         if active_character == player:
-            if not player_turn(player, enemy_instance): 
+            if not (yield from player_turn(player, enemy_instance, rng)): 
                 return "escaped"
         else: 
-            enemy_turn(enemy_instance, player)
-            input("Naciśnij Enter, aby kontynuować...") 
+            if not enemy_turn(enemy_instance, player, rng):
+                return "fled"
+            yield "Naciśnij Enter, aby kontynuować..." 
             
         current_turn_idx += 1
+        if log is not None:
+            log.turn += 1
     
     display_combat_status(player, enemy_instance) 
     if player.is_alive():
-        print(f"*** {player.name} zwycięża walkę! ***")
+        events.emit("victory", "*** {player} zwycięża walkę! ***", player=player.name)
         xp_reward = enemy_instance.experience_reward
         gold_reward = enemy_instance.gold_reward
-        print(f"Zdobywasz {xp_reward} XP i {gold_reward} złota.")
+        events.emit("victory", "Zdobywasz {xp_reward} XP i {gold_reward} złota.",
+                    xp_reward=xp_reward, gold_reward=gold_reward)
         player.gain_experience(xp_reward)
         player.gold += gold_reward
         
-        dropped_items = enemy_instance.drop_loot()
+        dropped_items = enemy_instance.drop_loot(rng)
         if dropped_items:
             for item_obj in dropped_items:
                 player.add_item_to_inventory(item_obj) 
         return "victory"
     else:
-        print(f"--- {player.name} został pokonany... KONIEC GRY? ---")
+        events.emit("defeat", "--- {player} został pokonany... KONIEC GRY? ---", player=player.name)
         return "defeat"
\ No newline at end of file
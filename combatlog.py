@@ -0,0 +1,334 @@
+import marshal
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import combat
+import encounter
+import events
+import savegame
+
+MAGIC = b"RPGFIGHT"
+DEFAULT_PATH = "walki.log"
+_RECORD_HEADER = struct.Struct("<II")
+
+PLAYER = 0
+ENEMY = 1
+NOBODY = -1
+
+# Rodzaj zdarzenia -> (pola z nazwą postaci, pole z wartością, postać domyślna).
+# Postać domyślna jest stała dla zdarzeń, których komunikat nie nazywa wykonawcy (Magiczny Pocisk rzuca
+# zawsze gracz, a nagrodę XP dostaje gracz), a pole "enemy" w nich to cel, nie wykonawca.
+# Zdarzenia, które nie mają pola z wartością (np. zapowiedź "upuszcza:"), nie trafiają do dziennika,
+# chyba że pole wartości jest None.
+SCHEMA = {
+    "initiative": (("player", "enemy_instance"), None, NOBODY),
+    "attack": (("name",), None, NOBODY),
+    "defend": (("name",), None, NOBODY),
+    "block": (("name",), None, NOBODY),
+    "damage_taken": (("name",), "amount", NOBODY),
+    "healed": (("name",), "amount", NOBODY),
+    "status_applied": (("name",), "duration", NOBODY),
+    "poison_tick": (("name",), "damage", NOBODY),
+    "poison_spit": (("enemy", "player"), None, NOBODY),
+    "special_ability": (("name",), "special_damage", NOBODY),
+    "magic_missile": ((), "magic_damage", PLAYER),
+    "defeated": (("name",), None, NOBODY),
+    "loot_dropped": ((), "item", ENEMY),
+    "victory": ((), "xp_reward", PLAYER),
+    "defeat": (("player",), None, NOBODY),
+    "enemy_fled": (("enemy",), None, NOBODY),
+}
+KINDS = tuple(SCHEMA)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_LOOT = KIND_CODES["loot_dropped"]
+COLUMNS = (("turn", "I"), ("kind", "B"), ("actor", "b"), ("value", "i"))
+
+
+def _column_bytes(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _column(typecode, data):
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class CombatLog:
+    """
+    Dziennik jednej walki: ziarno, stan postaci przed walką, odpowiedzi gracza i strumień zdarzeń.
+    Zdarzenia są trzymane kolumnami (tura, rodzaj, postać, wartość) w tablicach array,
+    a napisy (nazwy łupów) w osobnej tablicy, do której odwołuje się kolumna wartości.
+    """
+    def __init__(self):
+        self.seed = None
+        self.result = None
+        self.snapshot = None
+        self.answers = []
+        self.strings = []
+        self.turn = 0
+        self.turns = array("I")
+        self.kinds = array("B")
+        self.actors = array("b")
+        self.values = array("i")
+        self._names = {}
+
+    def begin(self, seed, player, enemy):
+        """
+        Zapamiętuje ziarno i stan obu postaci przed pierwszym ruchem (wywoływane przez combat.combat_steps).
+        """
+        self.seed = seed
+        self.snapshot = marshal.dumps((savegame.player_record(player), savegame.enemy_record(enemy)))
+        self._names = {enemy.name: ENEMY, player.name: PLAYER}
+
+    def begin_group(self, seed, players, enemies):
+        """
+        Jak begin, ale dla starcia grupowego (wywoływane przez encounter.encounter_steps):
+        zapamiętuje stan wszystkich graczy i przeciwników.
+        """
+        self.seed = seed
+        self.snapshot = marshal.dumps(([savegame.player_record(player) for player in players],
+                                       [savegame.enemy_record(enemy) for enemy in enemies]))
+        self._names = {enemy.name: ENEMY for enemy in enemies}
+        self._names.update((player.name, PLAYER) for player in players)
+
+    def record(self, steps):
+        """
+        Prowadzi generator walki, dopisując do dziennika jej zdarzenia i odpowiedzi gracza.
+        Na czas każdego kroku walki komunikaty trafiają i do dziennika, i do dotychczasowego odbiorcy.
+        :param steps: Generator walki.
+        :return: Wynik walki.
+        """
+        answer = None
+        started = False
+        while True:
+            token = events.set_sink(_Recorder(events.current_sink(), self))
+            try:
+                prompt = steps.send(answer) if started else next(steps)
+            except StopIteration as stop:
+                self.result = stop.value
+                return stop.value
+            finally:
+                events.reset_sink(token)
+            started = True
+            answer = yield prompt
+            self.answers.append(answer)
+
+    def add(self, kind, fields):
+        """Dopisuje zdarzenie gry, jeśli jego rodzaj należy do dziennika walki."""
+        schema = SCHEMA.get(kind)
+        if schema is None:
+            return
+        actor_fields, value_field, actor = schema
+        value = 0
+        if value_field is not None:
+            if value_field not in fields:
+                return
+            value = fields[value_field]
+            if isinstance(value, str):
+                if value not in self.strings:
+                    self.strings.append(value)
+                value = self.strings.index(value)
+        for field in actor_fields:
+            if field in fields:
+                if field == "player":
+                    actor = PLAYER
+                elif field in ("enemy", "enemy_instance"):
+                    actor = ENEMY
+                else:
+                    actor = self._names.get(fields[field], NOBODY)
+                break
+        self.turns.append(self.turn)
+        self.kinds.append(KIND_CODES[kind])
+        self.actors.append(actor)
+        self.values.append(value)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def events(self):
+        """
+        Zwraca listę zdarzeń jako krotki (tura, rodzaj, postać, wartość); nazwy łupów są rozwinięte.
+        """
+        return [(turn, KINDS[kind], actor, self.strings[value] if kind == _LOOT else value)
+                for turn, kind, actor, value in zip(self.turns, self.kinds, self.actors, self.values)]
+
+    def same_events(self, other):
+        """Czy dwa dzienniki mają identyczny wynik i strumień zdarzeń."""
+        return (self.result == other.result and self.strings == other.strings and self.turns == other.turns
+                and self.kinds == other.kinds and self.actors == other.actors and self.values == other.values)
+
+    def is_group(self):
+        """Czy dziennik opisuje starcie grupowe (stan uczestników zapisany listami)."""
+        return isinstance(marshal.loads(self.snapshot)[0], list)
+
+    def characters(self):
+        """
+        Odtwarza uczestników w stanie sprzed walki.
+        :return: Krotka (gracz, przeciwnik), a dla starcia grupowego (lista graczy, lista przeciwników).
+        """
+        players, enemies = marshal.loads(self.snapshot)
+        if isinstance(players, list):
+            return ([savegame.restore_player(player) for player in players],
+                    [savegame.load_enemy(enemy) for enemy in enemies])
+        return savegame.restore_player(players), savegame.load_enemy(enemies)
+
+
+class _Recorder:
+    """Odbiorca komunikatów przekazujący je dalej i dopisujący zdarzenia walki do dziennika."""
+    __slots__ = ("sink", "log")
+
+    def __init__(self, sink, log):
+        self.sink = sink
+        self.log = log
+
+    def emit(self, kind, template, fields):
+        self.log.add(kind, fields)
+        self.sink.emit(kind, template, fields)
+
+
+def replay(log):
+    """
+    Rozgrywa walkę ponownie z ziarna, stanu postaci i odpowiedzi zapisanych w dzienniku.
+    Komunikaty są wyciszone, a gracz nie jest o nic pytany.
+    :param log: Dziennik zakończonej walki.
+    :return: Nowy CombatLog z przebiegiem powtórki.
+    :raises ValueError: Jeśli powtórka pyta o więcej odpowiedzi, niż zapisano (dziennik nie pasuje do gry).
+    """
+    answers = iter(log.answers)
+
+    def read_input(prompt):
+        answer = next(answers, None)
+        if answer is None:
+            raise ValueError("Powtórka walki rozeszła się z dziennikiem - zabrakło zapisanych odpowiedzi.")
+        return answer
+
+    copy = CombatLog()
+    with events.muted():
+        if log.is_group():
+            players, enemies = log.characters()
+            steps = encounter.encounter_steps(players, enemies, log.seed, log=copy)
+        else:
+            player, enemy = log.characters()
+            steps = combat.combat_steps(player, enemy, log.seed, copy)
+        combat.drive(steps, read_input)
+    return copy
+
+
+def verify(log):
+    """Sprawdza, czy powtórka walki daje dokładnie ten sam strumień zdarzeń co dziennik."""
+    return replay(log).same_events(log)
+
+
+def _record_data(log):
+    columns = marshal.dumps((log.seed, log.result, log.strings,
+                             *(_column_bytes(column) for column in (log.turns, log.kinds, log.actors, log.values))))
+    details = marshal.dumps((log.snapshot, log.answers))
+    return _RECORD_HEADER.pack(len(columns), len(details)) + columns + details
+
+
+def append_log(path, log):
+    """
+    Dopisuje dziennik walki na koniec archiwum (plik jest tworzony przy pierwszym zapisie).
+    Rekord to [długość kolumn][długość szczegółów][kolumny][szczegóły], więc analiza
+    samych zdarzeń może pominąć stan postaci i odpowiedzi.
+    """
+    write_logs(path, [log])
+
+
+def write_logs(path, logs):
+    """Dopisuje wiele dzienników walk do archiwum jednym otwarciem pliku."""
+    with open(path, "ab") as file:
+        if file.tell() == 0:
+            file.write(MAGIC)
+        for log in logs:
+            file.write(_record_data(log))
+
+
+def _records(path):
+    """Generator krotek (kolumny, szczegóły) jako widoków na zmapowany plik archiwum."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Plik '{path}' nie jest archiwum walk.")
+            position = len(MAGIC)
+            while position + _RECORD_HEADER.size <= len(data):
+                columns_length, details_length = _RECORD_HEADER.unpack_from(data, position)
+                position += _RECORD_HEADER.size
+                end = position + columns_length + details_length
+                if end > len(data):
+                    break
+                columns = view[position:position + columns_length]
+                details = view[position + columns_length:end]
+                try:
+                    yield columns, details
+                finally:
+                    columns.release()
+                    details.release()
+                position = end
+
+
+def read_logs(path):
+    """Generator pełnych dzienników walk z archiwum (np. do powtórki zgłoszonej walki)."""
+    for columns, details in _records(path):
+        log = CombatLog()
+        log.seed, log.result, log.strings, *data = marshal.loads(columns)
+        log.turns, log.kinds, log.actors, log.values = (_column(typecode, column)
+                                                        for (_, typecode), column in zip(COLUMNS, data))
+        log.snapshot, log.answers = marshal.loads(details)
+        yield log
+
+
+def load_columns(path):
+    """
+    Wczytuje zdarzenia wszystkich walk z archiwum do wspólnych kolumn (bez stanu postaci i odpowiedzi).
+    Zdarzenia walki i leżą w kolumnach na pozycjach offsets[i]:offsets[i + 1]; kolumny to tablice array,
+    więc np. numpy.frombuffer może je przejąć bez kopiowania.
+    :return: Słownik z kluczami seed, result (listy na walkę), offsets, turn, kind, actor, value
+             (tablice array) oraz strings (wspólna tablica napisów dla wartości zdarzeń loot_dropped).
+    """
+    table = {"seed": [], "result": [], "offsets": array("Q", [0]), "strings": []}
+    for name, typecode in COLUMNS:
+        table[name] = array(typecode)
+    string_ids = {}
+    for columns, _ in _records(path):
+        seed, result, strings, *data = marshal.loads(columns)
+        table["seed"].append(seed)
+        table["result"].append(result)
+        start = len(table["kind"])
+        for (name, typecode), column in zip(COLUMNS, data):
+            table[name].extend(_column(typecode, column))
+        remap = []
+        for text in strings:
+            if text not in string_ids:
+                string_ids[text] = len(table["strings"])
+                table["strings"].append(text)
+            remap.append(string_ids[text])
+        if any(index != position for position, index in enumerate(remap)):
+            kinds, values = table["kind"], table["value"]
+            for position in range(start, len(kinds)):
+                if kinds[position] == _LOOT:
+                    values[position] = remap[values[position]]
+        table["offsets"].append(len(table["kind"]))
+    return table
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    fights = mismatched = 0
+    for fight in read_logs(source):
+        fights += 1
+        if not verify(fight):
+            mismatched += 1
+            print(f"Walka {fights} (ziarno {fight.seed}) nie daje się odtworzyć.")
+    print(f"Sprawdzono {fights} walk, rozbieżnych: {mismatched}")
@@ -0,0 +1,112 @@
+import inspect
+
+
+class Command:
+    """
+    Opis jednej komendy gry: nazwa, aliasy i funkcja obsługująca.
+    """
+    __slots__ = ("name", "aliases", "handler", "missing_argument", "local_only", "is_generator")
+
+    def __init__(self, name, handler, aliases=(), missing_argument=None, local_only=False):
+        """
+        :param name: Główna nazwa komendy.
+        :param handler: Funkcja (player, game_map, current_location_name, argument) -> (lokalizacja, czy_kontynuować).
+                        Może być generatorem, jeśli zadaje graczowi pytania (np. walka).
+        :param aliases: Dodatkowe nazwy komendy.
+        :param missing_argument: Komunikat, gdy komenda wymaga argumentu, a go nie podano; None - argument opcjonalny.
+        :param local_only: Komenda dotyka plików lub stanu całego procesu, więc jest dostępna tylko w grze lokalnej.
+        """
+        self.name = name
+        self.aliases = (name,) + tuple(aliases)
+        self.handler = handler
+        self.missing_argument = missing_argument
+        self.local_only = local_only
+        self.is_generator = inspect.isgeneratorfunction(handler)
+
+
+class _TrieNode:
+    __slots__ = ("children", "commands")
+
+    def __init__(self):
+        self.children = {}
+        self.commands = {}
+
+
+def parse(action):
+    """
+    Dzieli wpisaną linię na słowo komendy i argument (jednokrotny podział, białe znaki w argumencie znormalizowane).
+    :param action: Linia wpisana przez gracza (już po lower/strip).
+    :return: Krotka (słowo komendy, argument).
+    """
+    parts = action.split(None, 1)
+    if not parts:
+        return "", ""
+    if len(parts) == 1:
+        return parts[0], ""
+    argument = parts[1]
+    if "  " in argument or "\t" in argument:
+        argument = " ".join(argument.split())
+    return parts[0], argument
+
+
+class CommandRegistry:
+    """
+    Rejestr komend: słownik alias -> komenda budowany przy rejestracji oraz drzewo prefiksów,
+    dzięki któremu działają jednoznaczne skróty (np. 'ekw' -> 'ekwipunek').
+    Wtyczki mogą dopisywać własne komendy przez register lub dekorator command.
+    """
+    def __init__(self):
+        self.commands = {}
+        self._aliases = {}
+        self._trie = _TrieNode()
+
+    def register(self, name, handler, aliases=(), missing_argument=None, local_only=False):
+        """
+        Rejestruje komendę.
+        :return: Utworzony obiekt Command.
+        """
+        command = Command(name, handler, aliases, missing_argument, local_only)
+        for alias in command.aliases:
+            if alias in self._aliases:
+                raise ValueError(f"Alias '{alias}' jest już zajęty przez komendę '{self._aliases[alias].name}'.")
+        self.commands[name] = command
+        for alias in command.aliases:
+            self._aliases[alias] = command
+            node = self._trie
+            for char in alias:
+                node = node.children.setdefault(char, _TrieNode())
+                node.commands[name] = command
+        return command
+
+    def command(self, name, *aliases, missing_argument=None, local_only=False):
+        """
+        Dekorator rejestrujący funkcję jako komendę.
+        """
+        def decorator(handler):
+            self.register(name, handler, aliases, missing_argument, local_only)
+            return handler
+        return decorator
+
+    def matches(self, word):
+        """
+        Zwraca listę komend, których alias zaczyna się od podanego słowa.
+        """
+        if not word:
+            return []
+        node = self._trie
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(node.commands.values())
+
+    def resolve(self, word):
+        """
+        Znajduje komendę po aliasie, a gdy go nie ma - po jednoznacznym prefiksie.
+        :return: Obiekt Command lub None (brak komendy albo skrót niejednoznaczny).
+        """
+        command = self._aliases.get(word)
+        if command is not None:
+            return command
+        candidates = self.matches(word)
+        return candidates[0] if len(candidates) == 1 else None
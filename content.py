@@ -0,0 +1,185 @@
+import json
+import marshal
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"RPGPACK1"
+_HEADER_LENGTH = struct.Struct("<I")
+_SLOT = struct.Struct("<III")
+SECTIONS = ("items", "enemies", "npcs")
+
+
+def compile_pack(source_path, pack_path):
+    """
+    Kompiluje paczkę zawartości z pliku JSON do pliku binarnego z indeksem lokalizacji.
+    Nagłówek zawiera szablony przedmiotów, przeciwników i NPC. Za nim leży tablica haszująca
+    (crc32 nazwy, przesunięcie, długość) z adresowaniem otwartym, a dalej rekordy lokalizacji,
+    więc wyszukanie lokalizacji nie wymaga wczytywania całego indeksu.
+    :param source_path: Ścieżka pliku JSON z definicją świata.
+    :param pack_path: Ścieżka wynikowego pliku paczki.
+    """
+    with open(source_path, encoding="utf-8") as file:
+        source = json.load(file)
+    for section in SECTIONS + ("locations",):
+        source.setdefault(section, {} if section != "locations" else [])
+
+    count = len(source["locations"])
+    slots = 2 * count + 1
+    table = [None] * slots
+    blobs = []
+    offset = 0
+    for location in source["locations"]:
+        name = location["name"]
+        name_hash = _name_hash(name)
+        blob = marshal.dumps(location)
+        slot = name_hash % slots
+        while table[slot] is not None:
+            if table[slot][0] == name_hash and marshal.loads(blobs[table[slot][3]])["name"] == name:
+                raise ValueError(f"Lokalizacja '{name}' występuje w paczce więcej niż raz.")
+            slot = (slot + 1) % slots
+        table[slot] = (name_hash, offset, len(blob), len(blobs))
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = {section: source[section] for section in SECTIONS}
+    header["start"] = source.get("start") or (source["locations"][0]["name"] if count else None)
+    header["count"] = count
+    header["slots"] = slots
+    header_data = marshal.dumps(header)
+
+    # Plik tymczasowy ma numer procesu w nazwie, więc procesy kompilujące paczkę naraz (np. pierwsze
+    # uruchomienie sweep z wieloma procesami) nie nadpisują sobie plików; os.replace podmienia całość.
+    temporary = f"{pack_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(MAGIC)
+            file.write(_HEADER_LENGTH.pack(len(header_data)))
+            file.write(header_data)
+            for entry in table:
+                file.write(_SLOT.pack(*entry[:3]) if entry is not None else _SLOT.pack(0, 0, 0))
+            for blob in blobs:
+                file.write(blob)
+        os.replace(temporary, pack_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _name_hash(name):
+    """Stały między procesami skrót nazwy lokalizacji (wbudowany hash napisów jest losowany)."""
+    return zlib.crc32(name.encode("utf-8"))
+
+
+class ContentPack:
+    """
+    Skompilowana paczka zawartości otwarta przez mmap. Przy otwarciu czytany jest tylko nagłówek
+    z szablonami; lokalizacje są wyszukiwane w tablicy haszującej w pliku i dekodowane przy odwołaniu.
+    """
+    def __init__(self, pack_path):
+        """
+        :param pack_path: Ścieżka pliku utworzonego przez compile_pack.
+        """
+        self.path = pack_path
+        with open(pack_path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            self._data.close()
+            raise ValueError(f"Plik '{pack_path}' nie jest paczką zawartości.")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._data, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        header = marshal.loads(self._data[start:start + header_length])
+        self.items = header["items"]
+        self.enemies = header["enemies"]
+        self.npcs = header["npcs"]
+        self.start = header["start"]
+        self._count = header["count"]
+        self._slots = header["slots"]
+        self._table_start = start + header_length
+        self._records_start = self._table_start + self._slots * _SLOT.size
+
+    def _record(self, offset, length):
+        start = self._records_start + offset
+        return marshal.loads(self._data[start:start + length])
+
+    def _find(self, name):
+        name_hash = _name_hash(name)
+        slot = name_hash % self._slots
+        while True:
+            entry_hash, offset, length = _SLOT.unpack_from(self._data, self._table_start + slot * _SLOT.size)
+            if length == 0:
+                return None
+            if entry_hash == name_hash:
+                record = self._record(offset, length)
+                if record["name"] == name:
+                    return record
+            slot = (slot + 1) % self._slots
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __iter__(self):
+        """Iteruje po nazwach lokalizacji w kolejności z pliku źródłowego (dekoduje wszystkie rekordy)."""
+        entries = []
+        for slot in range(self._slots):
+            _, offset, length = _SLOT.unpack_from(self._data, self._table_start + slot * _SLOT.size)
+            if length:
+                entries.append((offset, length))
+        for offset, length in sorted(entries):
+            yield self._record(offset, length)["name"]
+
+    def __len__(self):
+        return self._count
+
+    def location_record(self, name):
+        """
+        Zwraca rekord lokalizacji (słownik z polami name, description, exits, enemies, items, npcs).
+        :raises KeyError: Jeśli paczka nie zawiera lokalizacji o tej nazwie.
+        """
+        record = self._find(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def close(self):
+        """Zamyka mapowanie pliku paczki."""
+        self._data.close()
+
+
+def load_pack(source_path, pack_path=None):
+    """
+    Otwiera paczkę zawartości, kompilując ją ponownie, jeśli plik JSON jest nowszy od paczki.
+    :param source_path: Ścieżka pliku JSON.
+    :param pack_path: Ścieżka skompilowanej paczki; domyślnie obok pliku JSON z rozszerzeniem .pack.
+    :return: Obiekt ContentPack.
+    """
+    if pack_path is None:
+        pack_path = os.path.splitext(source_path)[0] + ".pack"
+    if _stale(source_path, pack_path):
+        compile_pack(source_path, pack_path)
+    try:
+        return ContentPack(pack_path)
+    except FileNotFoundError:
+        # Inny proces mógł usunąć paczkę między kompilacją a otwarciem - sprawdzamy i próbujemy jeszcze raz.
+        if _stale(source_path, pack_path):
+            compile_pack(source_path, pack_path)
+        return ContentPack(pack_path)
+
+
+def _stale(source_path, pack_path):
+    """Czy paczki brakuje albo jest starsza od pliku JSON."""
+    try:
+        return os.path.getmtime(pack_path) < os.path.getmtime(source_path)
+    except FileNotFoundError:
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "world.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".pack"
+    compile_pack(source, target)
+    print(f"Skompilowano {source} -> {target}")
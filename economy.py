@@ -0,0 +1,209 @@
+import numpy as np
+
+import loot
+import trade
+import world
+
+
+class Market:
+    """
+    Towary i przeciwnicy świata jako tablice: nagroda w złocie i rozkład łupów każdego przeciwnika,
+    wartość każdego przedmiotu oraz lista przedmiotów, które sprzedają handlarze.
+    """
+    def __init__(self, enemies, wares):
+        """
+        :param enemies: Szablony przeciwników (characters.Enemy).
+        :param wares: Szablony przedmiotów sprzedawanych przez handlarzy.
+        """
+        templates = {}
+        for item in [item for enemy in enemies for item in enemy.loot_table] + list(wares):
+            templates.setdefault(item.name, item)
+        self.names = list(templates)
+        index = {name: position for position, name in enumerate(self.names)}
+        self.values = np.array([item.value for item in templates.values()], dtype=np.float64)
+        self.enemy_names = [enemy.name for enemy in enemies]
+        self.gold_rewards = np.array([enemy.gold_reward for enemy in enemies], dtype=np.int64)
+        self.wares = np.array(sorted({index[item.name] for item in wares}), dtype=np.int64)
+        # Na przeciwnika: (kolumny przedmiotów, prawdopodobieństwa z wynikiem pustym na końcu, liczba losowań)
+        # albo (kolumny, None, 1) dla przeciwników bez wag, którzy upuszczają wszystko.
+        self.drops = []
+        for enemy in enemies:
+            columns = np.array([index[item.name] for item in enemy.loot_table], dtype=np.int64)
+            table = loot.LootTable.of(enemy)
+            if table is None:
+                self.drops.append((columns, None, 1))
+            else:
+                weights = np.array(table.weights + (table.empty_weight,), dtype=np.float64)
+                self.drops.append((columns, weights / weights.sum(), table.rolls))
+
+    @classmethod
+    def from_content(cls, content=None):
+        """Rynek ze wszystkich przeciwników i handlarzy paczki zawartości (domyślnie world.content())."""
+        content = content if content is not None else world.content()
+        enemies = [content.enemy(enemy_id) for enemy_id in content.pack.enemies]
+        wares = [item for npc_id in content.pack.npcs for item in content.npc(npc_id).trade_items]
+        return cls(enemies, wares)
+
+
+class EconomyReport:
+    """
+    Krzywe gospodarki dzień po dniu: ilość złota w obiegu, jego źródła i ujścia oraz ceny przedmiotów.
+    """
+    def __init__(self, market, days):
+        self.market = market
+        self.gold_supply = np.zeros(days, dtype=np.int64)
+        self.gold_median = np.zeros(days, dtype=np.float64)
+        self.kill_income = np.zeros(days, dtype=np.int64)
+        self.sale_income = np.zeros(days, dtype=np.int64)
+        self.spending = np.zeros(days, dtype=np.int64)
+        self.prices = np.zeros((days, len(market.names)), dtype=np.int64)
+        self.days = 0
+
+    def record(self, gold, kill_income, sale_income, spending, prices):
+        """Dopisuje wskaźniki kolejnego dnia."""
+        day = self.days
+        self.gold_supply[day] = gold.sum()
+        self.gold_median[day] = np.median(gold)
+        self.kill_income[day] = kill_income
+        self.sale_income[day] = sale_income
+        self.spending[day] = spending
+        self.prices[day] = prices
+        self.days += 1
+
+    def price_curve(self, item_name):
+        """Cena zakupu przedmiotu u handlarza na koniec każdego dnia."""
+        return self.prices[:, self.market.names.index(item_name)]
+
+    def price_index(self):
+        """Średnia cen towarów handlarzy względem ich wartości bazowej (1.0 - ceny bazowe), dzień po dniu."""
+        wares = self.market.wares
+        return (self.prices[:, wares] / self.market.values[wares]).mean(axis=1)
+
+
+class EconomySimulation:
+    """
+    Gospodarka wielu graczy (agentów) liczona partiami: jeden krok to jeden dzień wszystkich agentów
+    naraz - zabójstwa, łupy, sprzedaż łupów handlarzom i zakupy towarów - na tablicach NumPy.
+    Ceny liczone są jak w trade.py z podaży przypadającej na jednego handlarza; w obrębie dnia są stałe.
+    """
+    def __init__(self, agents, market=None, seed=None, kills_per_day=3.0, sell_share=0.8, purchases_per_day=0.5,
+                 agents_per_trader=5, restock=0.5, enemy_weights=None, starting_gold=50):
+        """
+        :param agents: Liczba agentów.
+        :param market: Obiekt Market; domyślnie Market.from_content().
+        :param seed: Ziarno generatora NumPy.
+        :param kills_per_day: Średnia liczba zabójstw agenta na dzień (rozkład Poissona).
+        :param sell_share: Szansa, że agent sprzeda daną sztukę łupu (resztę zużywa sam).
+        :param purchases_per_day: Średnia liczba sztuk każdego towaru, którą agent chce kupić dziennie.
+        :param agents_per_trader: Ilu agentów obsługuje jeden handlarz (głębokość rynku).
+        :param restock: Ułamek nadwyżki lub niedoboru, który handlarze wyrównują każdego dnia.
+        :param enemy_weights: Częstość spotkań z przeciwnikami; domyślnie równa.
+        :param starting_gold: Złoto agenta na początku.
+        """
+        if agents <= 0:
+            raise ValueError("Liczba agentów musi być dodatnia.")
+        if not 0 <= sell_share <= 1 or not 0 <= restock <= 1:
+            raise ValueError("Udział sprzedaży i tempo uzupełniania zapasów muszą leżeć w przedziale 0-1.")
+        self.market = market if market is not None else Market.from_content()
+        self.rng = np.random.default_rng(seed)
+        self.agents = agents
+        self.kills_per_day = kills_per_day
+        self.sell_share = sell_share
+        self.purchases_per_day = purchases_per_day
+        self.traders = max(1, agents // agents_per_trader)
+        self.restock = restock
+        if enemy_weights is None:
+            enemy_weights = np.ones(len(self.market.enemy_names))
+        enemy_weights = np.asarray(enemy_weights, dtype=np.float64)
+        self.enemy_mix = enemy_weights / enemy_weights.sum()
+        self.gold = np.full(agents, starting_gold, dtype=np.int64)
+        self.supply = np.zeros(len(self.market.names), dtype=np.float64)
+        self.day = 0
+
+    def factors(self):
+        """Mnożniki cen wszystkich przedmiotów (trade.price_factor dla podaży na handlarza)."""
+        return np.clip((1 + trade.ELASTICITY) ** -(self.supply / self.traders), trade.MIN_FACTOR, trade.MAX_FACTOR)
+
+    def buy_prices(self):
+        """Ceny zakupu u handlarza (jak trade.buy_price)."""
+        return np.maximum(1, np.ceil(self.market.values * self.factors())).astype(np.int64)
+
+    def sell_prices(self):
+        """Ceny odkupu przez handlarza (jak trade.sell_price)."""
+        return (self.market.values * self.factors() * trade.SELL_RATIO).astype(np.int64)
+
+    def _loot(self, kills):
+        """Łupy agentów z macierzy zabójstw (agent x przeciwnik) jako macierz agent x przedmiot."""
+        found = np.zeros((self.agents, len(self.market.names)), dtype=np.int64)
+        for enemy, (columns, probabilities, rolls) in enumerate(self.market.drops):
+            if not len(columns):
+                continue
+            if probabilities is None:
+                found[:, columns] += kills[:, enemy, None]
+            else:
+                found[:, columns] += self.rng.multinomial(kills[:, enemy] * rolls, probabilities)[:, :-1]
+        return found
+
+    def step(self, report=None):
+        """Jeden dzień wszystkich agentów; jeśli podano report, zapisuje w nim wskaźniki dnia."""
+        rng = self.rng
+        kills = rng.multinomial(rng.poisson(self.kills_per_day, self.agents), self.enemy_mix)
+        kill_income = kills @ self.market.gold_rewards
+        self.gold += kill_income
+
+        sold = rng.binomial(self._loot(kills), self.sell_share)
+        sale_income = sold @ self.sell_prices()
+        self.gold += sale_income
+        self.supply += sold.sum(axis=0)
+
+        prices = self.buy_prices()
+        spending = np.zeros(self.agents, dtype=np.int64)
+        for ware in self.market.wares:
+            wanted = rng.poisson(self.purchases_per_day, self.agents)
+            bought = np.minimum(wanted, self.gold // prices[ware])
+            self.gold -= bought * prices[ware]
+            spending += bought * prices[ware]
+            self.supply[ware] -= bought.sum()
+
+        self.supply *= 1 - self.restock
+        if report is not None:
+            report.record(self.gold, kill_income.sum(), sale_income.sum(), spending.sum(), self.buy_prices())
+        self.day += 1
+
+    def run(self, days):
+        """
+        Symuluje kolejne days dni.
+        :return: EconomyReport z krzywymi z tych dni.
+        """
+        report = EconomyReport(self.market, days)
+        for _ in range(days):
+            self.step(report)
+        return report
+
+
+def simulate(agents=10000, days=100, seed=0, **options):
+    """
+    Symuluje agents * days agento-dni gospodarki świata z paczki zawartości.
+    :param options: Parametry EconomySimulation (np. kills_per_day, sell_share, restock).
+    :return: EconomyReport.
+    """
+    return EconomySimulation(agents, seed=seed, **options).run(days)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    start = time.perf_counter()
+    result = simulate(agents, days)
+    elapsed = time.perf_counter() - start
+    print(f"{agents * days} agento-dni w {elapsed:.2f} s ({agents * days / elapsed:,.0f}/s)")
+    index = result.price_index()
+    for day in range(0, days, max(1, days // 10)):
+        print(f"dzień {day + 1:4d}: złoto w obiegu {result.gold_supply[day]:>12,} "
+              f"(mediana {result.gold_median[day]:>8.0f}), indeks cen towarów {index[day]:.2f}")
+    for name in result.market.names:
+        curve = result.price_curve(name)
+        print(f"{name:<28} cena: {curve[0]:>4} -> {curve[-1]:>4}")
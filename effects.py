@@ -0,0 +1,211 @@
+import heapq
+from collections.abc import Mapping
+
+import events
+
+REFRESH = "refresh"
+STACK = "stack"
+EXTEND = "extend"
+
+
+class StatusEffect:
+    """
+    Efekt statusu nałożony na postać. Podklasy określają, co efekt robi przy nałożeniu,
+    w każdej turze (tylko jeśli ticks = True) i przy wygaśnięciu, oraz jak łączy się
+    z efektem o tej samej nazwie (stacking):
+    REFRESH - nowy efekt zastępuje stary, STACK - efekty działają niezależnie,
+    EXTEND - czas trwania się sumuje, a siła jest większą z dwóch.
+    """
+    __slots__ = ("name", "potency", "expires_at", "timeline")
+    ticks = False
+    stacking = REFRESH
+
+    def __init__(self, name, potency=0):
+        """
+        :param name: Nazwa efektu (np. "poison").
+        :param potency: Siła efektu (np. obrażenia na turę albo premia do statystyki).
+        """
+        self.name = name
+        self.potency = potency
+        self.expires_at = None
+        self.timeline = None
+
+    @property
+    def duration(self):
+        """Liczba tur, przez które efekt jeszcze działa."""
+        return self.expires_at - self.timeline.now if self.timeline is not None else 0
+
+    def on_apply(self, character):
+        """Wywoływane przy nałożeniu efektu."""
+
+    def on_tick(self, character):
+        """Wywoływane w każdej turze dla efektów z ticks = True."""
+
+    def on_expire(self, character):
+        """Wywoływane, gdy efekt wygasa albo zostaje zastąpiony."""
+
+
+class Poison(StatusEffect):
+    """Trucizna: co turę zadaje obrażenia równe swojej sile."""
+    __slots__ = ()
+    ticks = True
+
+    def on_tick(self, character):
+        character.take_damage(self.potency)
+        events.emit("poison_tick", "{name} traci {damage} HP od trucizny.",
+                    name=character.name, damage=self.potency)
+
+
+class StatBoost(StatusEffect):
+    """
+    Czasowa premia do statystyki postaci (modyfikator w Character.add_modifier);
+    kolejne mikstury tego samego rodzaju się sumują.
+    """
+    __slots__ = ()
+    stat = None
+    stacking = STACK
+
+    def on_apply(self, character):
+        character.add_modifier(self.stat, self.potency)
+
+    def on_expire(self, character):
+        character.add_modifier(self.stat, -self.potency)
+
+
+class StrengthBoost(StatBoost):
+    __slots__ = ()
+    stat = "attack_power"
+
+
+class DefenseBoost(StatBoost):
+    __slots__ = ()
+    stat = "defense_power"
+
+
+EFFECT_TYPES = {
+    "poison": Poison,
+    "strength_boost": StrengthBoost,
+    "defense_boost": DefenseBoost,
+}
+
+
+def create(name, potency=0):
+    """
+    Tworzy efekt o podanej nazwie; nazwy spoza EFFECT_TYPES dają efekt bez działania (np. "stun").
+    """
+    return EFFECT_TYPES.get(name, StatusEffect)(name, potency)
+
+
+class StatusEffects(Mapping):
+    """
+    Efekty statusu jednej postaci na osi czasu mierzonej w turach. Momenty wygaśnięcia leżą
+    w kopcu, więc tura kosztuje tylko efekty, które w niej działają (ticks = True) lub wygasają,
+    niezależnie od liczby trwających premii. Jako słownik: nazwa efektu -> najdłużej trwający
+    efekt o tej nazwie.
+    """
+    def __init__(self):
+        self.now = 0
+        self._heap = []
+        self._sequence = 0
+        self._ticking = {}
+        self._by_name = {}
+
+    def add(self, character, effect, duration):
+        """
+        Nakłada efekt na postać zgodnie z jego zasadą łączenia (bez komunikatu).
+        :param character: Postać, na którą działa efekt.
+        :param effect: Obiekt StatusEffect (jeszcze nienałożony).
+        :param duration: Czas trwania w turach.
+        :return: Efekt, który jest aktywny po nałożeniu (przy EXTEND - dotychczasowy).
+        """
+        same = self._by_name.get(effect.name)
+        if same and effect.stacking != STACK:
+            current = next(iter(same))
+            if effect.stacking == EXTEND:
+                current.potency = max(current.potency, effect.potency)
+                self._schedule(current, current.expires_at + duration)
+                return current
+            self._discard(current)
+            current.on_expire(character)
+        effect.timeline = self
+        self._by_name.setdefault(effect.name, {})[effect] = None
+        if effect.ticks:
+            self._ticking[effect] = None
+        self._schedule(effect, self.now + duration)
+        effect.on_apply(character)
+        return effect
+
+    def _schedule(self, effect, expires_at):
+        effect.expires_at = expires_at
+        self._sequence += 1
+        heapq.heappush(self._heap, (expires_at, self._sequence, effect))
+
+    def _discard(self, effect):
+        same = self._by_name[effect.name]
+        del same[effect]
+        if not same:
+            del self._by_name[effect.name]
+        self._ticking.pop(effect, None)
+        effect.timeline = None
+
+    def tick(self, character):
+        """
+        Kończy turę postaci: uruchamia działające efekty, przesuwa czas i zdejmuje efekty, które wygasły.
+        Wpisy kopca po efektach zastąpionych lub przedłużonych są pomijane przy zdejmowaniu.
+        """
+        for effect in list(self._ticking):
+            if effect.timeline is self:
+                events.emit("status_tick", "Efekt '{effect}' działa na {name}.", effect=effect.name, name=character.name)
+                effect.on_tick(character)
+        self.now += 1
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            expires_at, _, effect = heapq.heappop(heap)
+            if effect.timeline is not self or effect.expires_at != expires_at:
+                continue
+            self._discard(effect)
+            effect.on_expire(character)
+            events.emit("status_expired", "Efekt '{effect}' na {name} skończył się.",
+                        effect=effect.name, name=character.name)
+
+    def __getitem__(self, name):
+        return max(self._by_name[name], key=lambda effect: effect.expires_at)
+
+    def __iter__(self):
+        return iter(self._by_name)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def count(self, name):
+        """Liczba aktywnych efektów o podanej nazwie (kumulujące się premie liczone osobno)."""
+        return len(self._by_name.get(name, ()))
+
+    def potency(self, name):
+        """Łączna siła aktywnych efektów o podanej nazwie."""
+        return sum(effect.potency for effect in self._by_name.get(name, ()))
+
+    def records(self):
+        """Aktywne efekty jako lista krotek (nazwa, pozostałe tury, siła) - do zapisu gry."""
+        return [(effect.name, effect.duration, effect.potency)
+                for same in self._by_name.values() for effect in same]
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Odtwarza efekty z listy records(). Działanie przy nałożeniu nie jest powtarzane,
+        bo zapisane statystyki postaci już je uwzględniają.
+        """
+        timeline = cls()
+        for name, duration, potency in records:
+            effect = create(name, potency)
+            effect.timeline = timeline
+            timeline._by_name.setdefault(name, {})[effect] = None
+            if effect.ticks:
+                timeline._ticking[effect] = None
+            timeline._schedule(effect, duration)
+        return timeline
+
+    def copy(self):
+        """Zwraca niezależną kopię efektów (z nowymi obiektami efektów)."""
+        return StatusEffects.from_records(self.records())
@@ -0,0 +1,327 @@
+import heapq
+import random
+
+import combat
+import events
+
+PLAYERS = 0
+ENEMIES = 1
+MAX_TURNS = 100000
+# Odpowiedzi automatycznego gracza (boty shards.py i loadgen.py) na pytania walki pojedynczej i grupowej.
+BOT_ANSWERS = {
+    "Twój wybór: > ": "1",
+    "Wybór mikstury: > ": "anuluj",
+    "Naciśnij Enter, aby kontynuować...": "",
+    "Cel: > ": "",
+}
+
+
+class TargetPool:
+    """
+    Żywi uczestnicy jednej strony starcia. Losowy wybór i usuwanie kosztują O(1) (lista z zamianą
+    z ostatnim elementem), a najsłabszy i najgroźniejszy cel leżą w kopcach, których nieaktualne
+    wpisy (po zmianie zdrowia lub śmierci) są pomijane przy odczycie - każda operacja to O(log n).
+    """
+    def __init__(self, members):
+        """
+        :param members: Lista postaci po tej stronie starcia.
+        """
+        self.members = list(members)
+        self.alive = [index for index, member in enumerate(self.members) if member.is_alive()]
+        self._position = {index: position for position, index in enumerate(self.alive)}
+        self._weakest = [(self.members[index].current_health, index) for index in self.alive]
+        self._strongest = [(-self.members[index].attack_power, index) for index in self.alive]
+        heapq.heapify(self._weakest)
+        heapq.heapify(self._strongest)
+
+    def __len__(self):
+        return len(self.alive)
+
+    def __contains__(self, index):
+        return index in self._position
+
+    def remove(self, index):
+        """Usuwa uczestnika ze starcia (śmierć lub ucieczka)."""
+        position = self._position.pop(index, None)
+        if position is None:
+            return
+        last = self.alive.pop()
+        if last != index:
+            self.alive[position] = last
+            self._position[last] = position
+
+    def update(self, index):
+        """Uwzględnia zmianę zdrowia lub ataku uczestnika (albo usuwa go, jeśli zginął)."""
+        if index not in self._position:
+            return
+        member = self.members[index]
+        if not member.is_alive():
+            self.remove(index)
+            return
+        heapq.heappush(self._weakest, (member.current_health, index))
+        heapq.heappush(self._strongest, (-member.attack_power, index))
+
+    def weakest(self):
+        """Numer żywego uczestnika z najmniejszym zdrowiem."""
+        heap = self._weakest
+        while heap:
+            health, index = heap[0]
+            if index in self._position and self.members[index].current_health == health:
+                return index
+            heapq.heappop(heap)
+        return None
+
+    def strongest(self):
+        """Numer żywego uczestnika z największą siłą ataku."""
+        heap = self._strongest
+        while heap:
+            attack, index = heap[0]
+            if index in self._position and -self.members[index].attack_power == attack:
+                return index
+            heapq.heappop(heap)
+        return None
+
+    def random(self, rng):
+        """Numer losowego żywego uczestnika."""
+        return self.alive[rng.randrange(len(self.alive))] if self.alive else None
+
+
+def weakest_target(pool, rng):
+    """Polityka celu: dobija najsłabszego (najmniej zdrowia)."""
+    return pool.weakest()
+
+
+def strongest_target(pool, rng):
+    """Polityka celu: najpierw ten, kto najmocniej bije."""
+    return pool.strongest()
+
+
+def random_target(pool, rng):
+    """Polityka celu: losowy żywy przeciwnik (dotychczasowe zachowanie wrogów)."""
+    return pool.random(rng)
+
+
+class Encounter:
+    """
+    Starcie N graczy z M przeciwnikami. Kolejka inicjatywy to kopiec (czas akcji, kolejność, strona, numer):
+    każdy uczestnik działa raz na rundę, a kolejność w rundzie wyznacza rzut na inicjatywę.
+    Tura to zdjęcie z kopca, wybór celu przez politykę i powrót do kopca - O(log n).
+    """
+    def __init__(self, players, enemies, seed=None, player_policy=weakest_target, enemy_policy=random_target):
+        """
+        :param players: Lista graczy.
+        :param enemies: Lista przeciwników.
+        :param seed: Ziarno losowości starcia; None - losowane.
+        :param player_policy: Wybór celu dla graczy sterowanych automatycznie (pool, rng) -> numer.
+        :param enemy_policy: Wybór celu dla przeciwników.
+        """
+        if not players or not enemies:
+            raise ValueError("Starcie wymaga co najmniej jednego gracza i jednego przeciwnika.")
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.sides = (TargetPool(players), TargetPool(enemies))
+        self.policies = (player_policy, enemy_policy)
+        self.escaped = []
+        self.turns = 0
+        self._draw = False
+        self._queue = []
+        self._sequence = 0
+        for side, pool in enumerate(self.sides):
+            for index in pool.alive:
+                pool.members[index].is_blocking = False
+                self._schedule(1.0 - self.rng.random(), side, index)
+
+    @property
+    def players(self):
+        return self.sides[PLAYERS].members
+
+    @property
+    def enemies(self):
+        return self.sides[ENEMIES].members
+
+    def _schedule(self, time, side, index):
+        self._sequence += 1
+        heapq.heappush(self._queue, (time, self._sequence, side, index))
+
+    def _next_actor(self):
+        """Zdejmuje z kolejki następnego żywego uczestnika; zwraca (czas, strona, numer)."""
+        queue = self._queue
+        while queue:
+            time, _, side, index = heapq.heappop(queue)
+            if index in self.sides[side]:
+                return time, side, index
+        return None
+
+    def fled_enemies(self):
+        """Przeciwnicy, którzy uciekli z pola walki."""
+        return [self.enemies[index] for index in range(len(self.enemies))
+                if index not in self.sides[ENEMIES] and self.enemies[index].is_alive()]
+
+    def defeated_enemies(self):
+        """Przeciwnicy pokonani w tym starciu."""
+        return [enemy for enemy in self.enemies if not enemy.is_alive()]
+
+    def result(self):
+        """
+        Wynik starcia: "victory", "defeat", "escaped", "draw" (przerwane limitem tur) albo None, jeśli starcie trwa.
+        Pole walki opuszczone przez wszystkich przeciwników (pokonanych lub zbiegłych) to zwycięstwo.
+        """
+        if self._draw:
+            return "draw"
+        if not self.sides[ENEMIES]:
+            return "victory"
+        if not self.sides[PLAYERS]:
+            return "escaped" if any(player.is_alive() for player in self.players) else "defeat"
+        return None
+
+    def steps(self, interactive=(), max_turns=MAX_TURNS, log=None):
+        """
+        Przebieg starcia jako generator promptów (jak combat.combat_steps).
+        Gracze z interactive wybierają akcje przez combat.player_turn, a cel - gdy przeciwników jest kilku.
+        Pozostali gracze atakują cel wskazany przez politykę.
+        :param interactive: Gracze sterowani przez odpowiedzi na prompty.
+        :param max_turns: Limit tur, po którym starcie kończy się remisem ("draw").
+        :param log: Dziennik walki (combatlog.CombatLog), któremu podajemy numer bieżącej tury.
+        :return: "victory", "defeat", "escaped" lub "draw".
+        """
+        interactive = {id(player) for player in interactive}
+        players, enemies = self.sides
+        rng = self.rng
+        while self.result() is None:
+            if self.turns >= max_turns:
+                self._draw = True
+                break
+            time, side, index = self._next_actor()
+            actor = self.sides[side].members[index]
+            opponents = self.sides[1 - side]
+            if log is not None:
+                log.turn = self.turns
+            self.turns += 1
+            if side == PLAYERS and id(actor) in interactive:
+                display_encounter_status(self)
+                target_index = yield from self._choose_target(opponents)
+                if not (yield from combat.player_turn(actor, opponents.members[target_index], rng)):
+                    players.remove(index)
+                    self.escaped.append(actor)
+                    continue
+            elif side == PLAYERS:
+                target_index = self.policies[PLAYERS](opponents, rng)
+                actor.attack(opponents.members[target_index])
+                actor.tick_status_effects()
+            else:
+                target_index = self.policies[ENEMIES](opponents, rng)
+                if not combat.enemy_turn(actor, opponents.members[target_index], rng):
+                    enemies.remove(index)
+                    continue
+                if interactive and id(opponents.members[target_index]) in interactive:
+                    yield "Naciśnij Enter, aby kontynuować..."
+            opponents.update(target_index)
+            self.sides[side].update(index)
+            if index in self.sides[side]:
+                self._schedule(time + 1.0, side, index)
+        return self.result()
+
+    def _choose_target(self, opponents):
+        """Pyta gracza o cel, jeśli jest z czego wybierać; pusta odpowiedź to cel z polityki."""
+        if len(opponents) == 1:
+            return opponents.alive[0]
+        choices = sorted(opponents.alive)
+        while True:
+            events.emit("target_menu", "Wybierz cel (Enter - najsłabszy):")
+            for number, index in enumerate(choices, 1):
+                enemy = opponents.members[index]
+                events.emit("target_menu", "{number}. {enemy} (HP: {current_health}/{max_health})", number=number,
+                            enemy=enemy.name, current_health=enemy.current_health, max_health=enemy.max_health)
+            answer = (yield "Cel: > ").strip()
+            if not answer:
+                return opponents.weakest()
+            if answer.isdigit() and 1 <= int(answer) <= len(choices):
+                return choices[int(answer) - 1]
+            for index in choices:
+                if opponents.members[index].name.lower() == answer.lower():
+                    return index
+            events.emit("invalid_choice", "Nie ma takiego celu.")
+
+    def award(self):
+        """
+        Rozdziela nagrody za pokonanych przeciwników między graczy, którzy zostali na polu walki:
+        XP i złoto po równo, łupy po kolei.
+        """
+        survivors = [self.players[index] for index in sorted(self.sides[PLAYERS].alive)]
+        if not survivors:
+            return
+        defeated = self.defeated_enemies()
+        xp_reward = sum(enemy.experience_reward for enemy in defeated) // len(survivors)
+        gold_reward = sum(enemy.gold_reward for enemy in defeated) // len(survivors)
+        events.emit("victory", "Zdobywasz {xp_reward} XP i {gold_reward} złota.",
+                    xp_reward=xp_reward, gold_reward=gold_reward)
+        for player in survivors:
+            player.gain_experience(xp_reward)
+            player.gold += gold_reward
+        loot = [item for enemy in defeated for item in enemy.drop_loot(self.rng)]
+        for number, item in enumerate(loot):
+            survivors[number % len(survivors)].add_item_to_inventory(item)
+
+
+def display_encounter_status(encounter):
+    """Wyświetla stan wszystkich uczestników starcia (tylko dla graczy sterowanych promptami)."""
+    events.emit("combat_status", "--- STAN WALKI ---")
+    for player in encounter.players:
+        if player.is_alive() and player not in encounter.escaped:
+            events.emit("combat_status", "TY: {player} | HP: {current_health}/{max_health} | Mana: {mana}/{max_mana}",
+                        player=player.name, current_health=player.current_health, max_health=player.max_health,
+                        mana=player.mana, max_mana=player.max_mana)
+    for enemy in encounter.enemies:
+        if enemy.is_alive():
+            events.emit("combat_status", "WRÓG: {enemy} | HP: {current_health}/{max_health}",
+                        enemy=enemy.name, current_health=enemy.current_health, max_health=enemy.max_health)
+    events.emit("combat_status", "--------------------")
+    events.emit("combat_status", "")
+
+
+def encounter_steps(players, enemies, seed=None, interactive=None, player_policy=weakest_target,
+                    enemy_policy=random_target, log=None):
+    """
+    Starcie graczy z grupą przeciwników jako generator promptów, razem z nagrodami po zwycięstwie.
+    :param interactive: Gracze sterowani promptami; domyślnie wszyscy gracze.
+    :param log: Dziennik walki (combatlog.CombatLog), do którego trafią ziarno, stan uczestników,
+                odpowiedzi i zdarzenia - jak w combat.combat_steps.
+    :return: Krotka (wynik, pokonani przeciwnicy).
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+    if log is not None:
+        log.begin_group(seed, players, enemies)
+    encounter = Encounter(players, enemies, seed, player_policy, enemy_policy)
+    steps = _encounter_steps(encounter, players if interactive is None else interactive, log)
+    result = yield from (steps if log is None else log.record(steps))
+    return result, encounter.defeated_enemies()
+
+
+def _encounter_steps(encounter, interactive, log):
+    players = encounter.players
+    events.emit("combat_start", "!!! Rozpoczyna się walka: {players} vs {enemies} !!!",
+                players=", ".join(player.name for player in players),
+                enemies=", ".join(enemy.name for enemy in encounter.enemies))
+    result = yield from encounter.steps(interactive, log=log)
+    if result == "victory":
+        events.emit("victory", "*** {players} zwycięża walkę! ***",
+                    players=", ".join(player.name for player in players if player.is_alive()))
+        encounter.award()
+    elif result == "defeat":
+        events.emit("defeat", "--- {players} został pokonany... KONIEC GRY? ---",
+                    players=", ".join(player.name for player in players))
+    return result
+
+
+def run_encounter(players, enemies, seed=None, player_policy=weakest_target, enemy_policy=random_target,
+                  max_turns=MAX_TURNS):
+    """
+    Rozgrywa starcie bez pytań do graczy (wszyscy sterowani politykami), np. do symulacji i benchmarków.
+    :return: Obiekt Encounter po zakończeniu (wynik w encounter.result(), liczba tur w encounter.turns).
+    """
+    encounter = Encounter(players, enemies, seed, player_policy, enemy_policy)
+    combat.drive(encounter.steps(max_turns=max_turns))
+    return encounter
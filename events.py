@@ -0,0 +1,143 @@
+import contextlib
+import contextvars
+
+
+class Event:
+    """
+    Pojedynczy komunikat gry: rodzaj zdarzenia, szablon tekstu i pola do wstawienia.
+    Tekst jest formatowany dopiero wtedy, gdy ktoś go potrzebuje.
+    """
+    __slots__ = ("kind", "template", "fields")
+
+    def __init__(self, kind, template, fields):
+        self.kind = kind
+        self.template = template
+        self.fields = fields
+
+    def text(self):
+        """Zwraca sformatowany tekst komunikatu."""
+        return self.template.format(**self.fields) if self.fields else self.template
+
+    def __str__(self):
+        return self.text()
+
+
+class Lazy:
+    """
+    Wartość pola liczona dopiero przy formatowaniu komunikatu, np. events.Lazy(effects_text, effects).
+    Przy wyciszonym wyjściu funkcja nie jest wywoływana wcale.
+    """
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __format__(self, spec):
+        return format(self.func(*self.args), spec)
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+
+class TerminalSink:
+    """Wypisuje komunikaty na standardowe wyjście (domyślny sposób działania gry)."""
+    def emit(self, kind, template, fields):
+        print(template.format(**fields) if fields else template)
+
+
+class NullSink:
+    """Ignoruje wszystkie komunikaty - nic nie jest formatowane ani wypisywane (symulacje, benchmarki)."""
+    def emit(self, kind, template, fields):
+        pass
+
+
+class BufferedSink:
+    """
+    Zbiera sformatowane linie w pamięci i oddaje je hurtem, np. do gniazda sieciowego.
+    """
+    def __init__(self, write=None, encoding="utf-8"):
+        """
+        :param write: Funkcja przyjmująca bajty (np. StreamWriter.write); None - tylko bufor.
+        :param encoding: Kodowanie tekstu przy zapisie.
+        """
+        self.write = write
+        self.encoding = encoding
+        self.lines = []
+
+    def emit(self, kind, template, fields):
+        self.lines.append(template.format(**fields) if fields else template)
+
+    def drain(self):
+        """Zwraca zebrany tekst i czyści bufor."""
+        text = "\n".join(self.lines) + "\n" if self.lines else ""
+        self.lines.clear()
+        return text
+
+    def flush(self):
+        """Przekazuje zebrany tekst do funkcji write."""
+        text = self.drain()
+        if text and self.write is not None:
+            self.write(text.encode(self.encoding))
+
+
+class RecordingSink:
+    """Zapamiętuje zdarzenia jako obiekty Event, bez formatowania tekstu."""
+    def __init__(self):
+        self.events = []
+
+    def emit(self, kind, template, fields):
+        self.events.append(Event(kind, template, fields))
+
+    def kinds(self):
+        """Zwraca listę rodzajów zapamiętanych zdarzeń."""
+        return [event.kind for event in self.events]
+
+
+_current_sink = contextvars.ContextVar("events_sink", default=TerminalSink())
+
+
+def emit(kind, template, **fields):
+    """
+    Wysyła komunikat do aktywnego odbiorcy.
+    :param kind: Rodzaj zdarzenia (np. "damage_taken").
+    :param template: Szablon tekstu w formacie str.format.
+    :param fields: Wartości do wstawienia w szablon.
+    """
+    _current_sink.get().emit(kind, template, fields)
+
+
+def current_sink():
+    """Zwraca odbiorcę aktywnego w bieżącym kontekście."""
+    return _current_sink.get()
+
+
+def set_sink(sink):
+    """
+    Ustawia odbiorcę komunikatów dla bieżącego kontekstu (wątku lub zadania asyncio).
+    :return: Token pozwalający przywrócić poprzedniego odbiorcę przez reset_sink.
+    """
+    return _current_sink.set(sink)
+
+
+def reset_sink(token):
+    """Przywraca odbiorcę sprzed wywołania set_sink."""
+    _current_sink.reset(token)
+
+
+@contextlib.contextmanager
+def use_sink(sink):
+    """
+    Menedżer kontekstu ustawiający odbiorcę na czas bloku with.
+    :param sink: Obiekt z metodą emit(kind, template, fields).
+    """
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _current_sink.reset(token)
+
+
+def muted():
+    """Skrót dla use_sink(NullSink())."""
+    return use_sink(NullSink())
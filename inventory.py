@@ -0,0 +1,135 @@
+from collections import deque
+
+
+def name_key(name):
+    """
+    Zwraca klucz indeksu dla nazwy przedmiotu (wielkość liter nie ma znaczenia).
+    :param name: Nazwa przedmiotu.
+    """
+    return name.casefold()
+
+
+def instance_key(item):
+    """
+    Zwraca klucz egzemplarza: definicję i stan (np. wytrzymałość, liczbę łyków). Egzemplarze o tym samym
+    kluczu są nie do odróżnienia i mogą być pokazywane jako jedna pozycja.
+    """
+    return item.definition, tuple(getattr(item, field) for field, _ in item._state)
+
+
+class Inventory:
+    """
+    Ekwipunek z indeksem po nazwie. Przedmioty o tej samej nazwie tworzą stos,
+    a stosy zachowują kolejność dodania pierwszego egzemplarza. Stos jest indeksem wyszukiwania po nazwie;
+    do wyświetlania dzieli go stacks() według definicji i stanu egzemplarzy.
+    Wyszukiwanie, dodawanie i zdejmowanie pierwszego egzemplarza ze stosu działają w czasie O(1).
+    """
+    def __init__(self, items=None):
+        """
+        :param items: Opcjonalna lista przedmiotów, którymi ekwipunek zostanie wypełniony.
+        """
+        self._stacks = {}
+        self._size = 0
+        for item in items or ():
+            self.add(item)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        """Iteruje po wszystkich egzemplarzach, stos po stosie."""
+        for stack in self._stacks.values():
+            yield from stack
+
+    def __contains__(self, item_name):
+        return name_key(item_name) in self._stacks
+
+    def add(self, item):
+        """
+        Dodaje przedmiot na koniec jego stosu (nowy stos trafia na koniec ekwipunku).
+        :param item: Obiekt klasy Item lub jej pochodnych.
+        """
+        key = name_key(item.name)
+        stack = self._stacks.get(key)
+        if stack is None:
+            stack = self._stacks[key] = deque()
+        stack.append(item)
+        self._size += 1
+
+    def find(self, item_name):
+        """
+        Zwraca pierwszy egzemplarz przedmiotu o podanej nazwie.
+        :param item_name: Nazwa przedmiotu (wielkość liter nie ma znaczenia).
+        :return: Przedmiot lub None, jeśli nie znaleziono.
+        """
+        stack = self._stacks.get(name_key(item_name))
+        return stack[0] if stack else None
+
+    def count(self, item_name):
+        """
+        Zwraca liczbę egzemplarzy przedmiotu o podanej nazwie.
+        """
+        stack = self._stacks.get(name_key(item_name))
+        return len(stack) if stack else 0
+
+    def take(self, item_name):
+        """
+        Zdejmuje z ekwipunku pierwszy egzemplarz przedmiotu o podanej nazwie.
+        :param item_name: Nazwa przedmiotu.
+        :return: Usunięty przedmiot lub None, jeśli nie znaleziono.
+        """
+        key = name_key(item_name)
+        stack = self._stacks.get(key)
+        if not stack:
+            return None
+        item = stack.popleft()
+        self._size -= 1
+        if not stack:
+            del self._stacks[key]
+        return item
+
+    def remove(self, item):
+        """
+        Usuwa konkretny egzemplarz przedmiotu.
+        Pierwszy egzemplarz stosu usuwany jest w O(1), pozostałe w czasie zależnym od wysokości stosu.
+        :param item: Obiekt przedmiotu znajdujący się w ekwipunku.
+        """
+        key = name_key(item.name)
+        stack = self._stacks.get(key)
+        if not stack:
+            raise ValueError(f"Przedmiotu '{item.name}' nie ma w ekwipunku.")
+        if stack[0] is item:
+            stack.popleft()
+        else:
+            try:
+                stack.remove(item)
+            except ValueError:
+                raise ValueError(f"Przedmiotu '{item.name}' nie ma w ekwipunku.") from None
+        self._size -= 1
+        if not stack:
+            del self._stacks[key]
+
+    def stacks(self):
+        """
+        Zwraca listę par (egzemplarz, liczba identycznych egzemplarzy) w kolejności ekwipunku.
+        Egzemplarze o tej samej nazwie, ale innej definicji lub stanie (np. zużyta broń, napoczęta
+        mikstura) są osobnymi pozycjami.
+        """
+        result = []
+        for stack in self._stacks.values():
+            if len(stack) == 1:
+                result.append((stack[0], 1))
+                continue
+            groups = {}
+            for item in stack:
+                key = instance_key(item)
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [item, 1]
+                else:
+                    group[1] += 1
+            result.extend((item, count) for item, count in groups.values())
+        return result
@@ -1,13 +1,112 @@
+import weakref
+
+import effects
+import events
+
+BOOST_TURNS = 5
+
+DEFINITION_FIELDS = (
+    "kind", "name", "description", "value", "is_magical", "rarity",
+    "damage", "weapon_type", "defense", "armor_type", "effect_type", "effect_value",
+)
+
+
+class ItemDefinition:
+    """
+    Niezmienna definicja przedmiotu współdzielona przez wszystkie jego egzemplarze (wzorzec pyłku).
+    Pola czyta się jak w krotce nazwanej (atrybuty, iteracja, _fields), ale w odróżnieniu od krotki
+    definicja może być wartością słabego słownika _definitions - znika razem z ostatnim egzemplarzem.
+    Tworzy się ją przez define, który zwraca jedną wspólną definicję dla tych samych cech.
+    """
+    __slots__ = DEFINITION_FIELDS + ("__weakref__",)
+    _fields = DEFINITION_FIELDS
+
+    def __init__(self, *values):
+        for field, value in zip(DEFINITION_FIELDS, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Definicja przedmiotu jest niezmienna - użyj define z innymi cechami.")
+
+    def __iter__(self):
+        return (getattr(self, field) for field in DEFINITION_FIELDS)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in DEFINITION_FIELDS)
+        return f"ItemDefinition({fields})"
+
+    def __reduce__(self):
+        return define, tuple(self)
+
+
+# Cechy definicji -> definicja; wpis znika, gdy żaden egzemplarz nie używa już definicji.
+_definitions = weakref.WeakValueDictionary()
+
+
+def define(kind, name, description, value=0, is_magical=False, rarity="common", damage=None,
+           weapon_type=None, defense=None, armor_type=None, effect_type=None, effect_value=None):
+    """
+    Zwraca definicję przedmiotu o podanych cechach. Identyczne definicje są zwracane jako ten sam obiekt.
+    :param kind: Rodzaj przedmiotu ('item', 'weapon', 'armor', 'potion').
+    :return: Obiekt ItemDefinition.
+    """
+    key = (kind, name, description, value, is_magical, rarity, damage,
+           weapon_type, defense, armor_type, effect_type, effect_value)
+    definition = _definitions.get(key)
+    if definition is None:
+        definition = _definitions[key] = ItemDefinition(*key)
+    return definition
+
+
+def definition_count():
+    """Zwraca liczbę różnych definicji przedmiotów w pamięci."""
+    return len(_definitions)
+
+
+def _restore(cls, definition, state):
+    """Odtwarza egzemplarz po deserializacji (definicja wraca przez define, więc jest współdzielona)."""
+    return cls.from_definition(definition, **state)
+
+
+def _shared(field):
+    """
+    Tworzy właściwość czytaną z definicji przedmiotu. Zapis podmienia definicję egzemplarza
+    na współdzieloną definicję ze zmienionym polem - inne egzemplarze nie są dotknięte.
+    """
+    def getter(self):
+        return getattr(self.definition, field)
+
+    def setter(self, value):
+        values = dict(zip(DEFINITION_FIELDS, self.definition))
+        values[field] = value
+        self.definition = define(**values)
+
+    return property(getter, setter)
+
+
 class Item:
     """
     Klasa bazowa dla wszystkich przedmiotów w grze.
+    Cechy wspólne (nazwa, opis, wartość, rzadkość) trzymane są we współdzielonej definicji,
+    a egzemplarz przechowuje tylko swój stan.
     """
-    def __init__(self, name, description, value=0):
+    __slots__ = ("definition",)
+    kind = "item"
+    _state = ()
+
+    name = _shared("name")
+    description = _shared("description")
+    value = _shared("value")
+    is_magical = _shared("is_magical")
+    rarity = _shared("rarity")
+
+    def __init__(self, name, description, value=0, **features):
         """
         Inicjalizuje przedmiot.
         :param name: Nazwa przedmiotu.
         :param description: Opis przedmiotu.
         :param value: Wartość przedmiotu w złocie (dla potencjalnego sklepu).
+        :param features: Cechy definicji właściwe dla klasy pochodnej (np. damage, defense).
         """
         if not isinstance(name, str) or not name.strip():
             raise ValueError("Nazwa przedmiotu musi być niepustym ciągiem znaków.")
@@ -16,11 +115,7 @@ class Item:
         if not isinstance(value, int) or value < 0:
             raise ValueError("Wartość przedmiotu musi być nieujemną liczbą całkowitą.")
 
-        self.name = name
-        self.description = description
-        self.value = value
-        self.is_magical = False
-        self.rarity = "common" 
+        self.definition = define(self.kind, name, description, value, **features)
 
     def __str__(self):
         """
@@ -28,24 +123,60 @@ class Item:
         """
         return f"{self.name}: {self.description} (Wartość: {self.value} Złota, Rzadkość: {self.rarity})"
 
+    @classmethod
+    def from_definition(cls, definition, **state):
+        """
+        Tworzy egzemplarz przedmiotu z gotowej definicji, bez ponownej walidacji.
+        :param definition: Obiekt ItemDefinition.
+        :param state: Stan egzemplarza (np. durability, condition, sips_left); brakujące pola mają wartości domyślne.
+        """
+        item = cls.__new__(cls)
+        item.definition = definition
+        for field, default in cls._state:
+            setattr(item, field, state.get(field, default))
+        return item
+
+    def spawn(self):
+        """
+        Zwraca nowy egzemplarz przedmiotu na podstawie tego obiektu (np. z szablonu świata).
+        Definicja jest współdzielona, kopiowany jest tylko stan egzemplarza.
+        """
+        return self.from_definition(self.definition, **{field: getattr(self, field) for field, _ in self._state})
+
+    def __copy__(self):
+        return self.spawn()
+
+    def __reduce__(self):
+        return _restore, (type(self), self.definition, {field: getattr(self, field) for field, _ in self._state})
+
+    def __deepcopy__(self, memo):
+        return self.spawn()
+
     def examine(self):
         """
         Wyświetla szczegółowy opis przedmiotu.
         """
-        print(f"--- {self.name} ---")
-        print(f"Opis: {self.description}")
-        print(f"Wartość: {self.value} Złota")
-        print(f"Rzadkość: {self.rarity}")
+        events.emit("examine", "--- {name} ---", name=self.name)
+        events.emit("examine", "Opis: {description}", description=self.description)
+        events.emit("examine", "Wartość: {value} Złota", value=self.value)
+        events.emit("examine", "Rzadkość: {rarity}", rarity=self.rarity)
         if self.is_magical:
-            print("Przedmiot jest magiczny!")
+            events.emit("examine", "Przedmiot jest magiczny!")
        
-        print("Możesz go użyć, sprzedać lub wyrzucić.")
-        print("Zastanów się dobrze, co z nim zrobisz.")
+        events.emit("examine", "Możesz go użyć, sprzedać lub wyrzucić.")
+        events.emit("examine", "Zastanów się dobrze, co z nim zrobisz.")
 
 class Weapon(Item):
     """
     Klasa reprezentująca broń. Dziedziczy po Item.
     """
+    __slots__ = ("durability",)
+    kind = "weapon"
+    _state = (("durability", 100),)
+
+    damage = _shared("damage")
+    weapon_type = _shared("weapon_type")
+
     def __init__(self, name, description, damage, weapon_type="melee", value=10):
         """
         Inicjalizuje broń.
@@ -55,14 +186,12 @@ class Weapon(Item):
         :param weapon_type: Typ broni (np. 'melee', 'ranged').
         :param value: Wartość broni.
         """
-        super().__init__(name, description, value)
         if not isinstance(damage, int) or damage <= 0:
             raise ValueError("Obrażenia broni muszą być dodatnią liczbą całkowitą.")
         if weapon_type not in ["melee", "ranged", "magic"]:
             raise ValueError("Nieznany typ broni.")
+        super().__init__(name, description, value, damage=damage, weapon_type=weapon_type)
 
-        self.damage = damage
-        self.weapon_type = weapon_type
         self.durability = 100 
 
     def __str__(self):
@@ -78,14 +207,22 @@ class Weapon(Item):
         Prosta metoda symulująca ostrzenie broni.
         """
         if self.weapon_type == "melee":
-            print(f"Ostrzysz {self.name}. Wydaje się być nieco groźniejsza.")
+            events.emit("sharpen", "Ostrzysz {name}. Wydaje się być nieco groźniejsza.", name=self.name)
         else:
-            print(f"{self.name} nie jest bronią białą, nie możesz jej naostrzyć w ten sposób.")
+            events.emit("sharpen", "{name} nie jest bronią białą, nie możesz jej naostrzyć w ten sposób.",
+                        name=self.name)
 
 class Armor(Item):
     """
     Klasa reprezentująca pancerz. Dziedziczy po Item.
     """
+    __slots__ = ("condition",)
+    kind = "armor"
+    _state = (("condition", "new"),)
+
+    defense = _shared("defense")
+    armor_type = _shared("armor_type")
+
     def __init__(self, name, description, defense, armor_type="torso", value=15):
         """
         Inicjalizuje pancerz.
@@ -95,14 +232,12 @@ class Armor(Item):
         :param armor_type: Typ pancerza (np. 'head', 'torso', 'legs').
         :param value: Wartość pancerza.
         """
-        super().__init__(name, description, value)
         if not isinstance(defense, int) or defense <= 0:
             raise ValueError("Obrona pancerza musi być dodatnią liczbą całkowitą.")
         if armor_type not in ["head", "torso", "legs", "shield", "full"]:
             raise ValueError("Nieznany typ pancerza.")
+        super().__init__(name, description, value, defense=defense, armor_type=armor_type)
 
-        self.defense = defense
-        self.armor_type = armor_type
         self.condition = "new" 
 
     def __str__(self):
@@ -117,7 +252,7 @@ class Armor(Item):
         """
         Prosta metoda symulująca polerowanie pancerza.
         """
-        print(f"Polerujesz {self.name}. Lśni jak nowy!")
+        events.emit("polish", "Polerujesz {name}. Lśni jak nowy!", name=self.name)
         if self.condition == "damaged":
             self.condition = "used"
         elif self.condition == "used":
@@ -128,6 +263,13 @@ class Potion(Item):
     """
     Klasa reprezentująca miksturę. Dziedziczy po Item.
     """
+    __slots__ = ("sips_left",)
+    kind = "potion"
+    _state = (("sips_left", 1),)
+
+    effect_type = _shared("effect_type")
+    effect_value = _shared("effect_value")
+
     def __init__(self, name, description, effect_type, effect_value, value=5):
         """
         Inicjalizuje miksturę.
@@ -137,14 +279,12 @@ class Potion(Item):
         :param effect_value: Wartość efektu.
         :param value: Wartość mikstury.
         """
-        super().__init__(name, description, value)
         if effect_type not in ["heal", "mana_restore", "strength_boost", "defense_boost"]:
             raise ValueError("Nieznany typ efektu mikstury.")
         if not isinstance(effect_value, int) or effect_value <= 0:
             raise ValueError("Wartość efektu mikstury musi być dodatnią liczbą całkowitą.")
+        super().__init__(name, description, value, effect_type=effect_type, effect_value=effect_value)
 
-        self.effect_type = effect_type
-        self.effect_value = effect_value
         self.sips_left = 1 
 
     def __str__(self):
@@ -160,10 +300,10 @@ class Potion(Item):
         :param target: Obiekt postaci, na którym mikstura ma zadziałać.
         """
         if self.sips_left <= 0:
-            print(f"{self.name} jest już pusta.")
+            events.emit("potion_empty", "{name} jest już pusta.", name=self.name)
             return False
 
-        print(f"Używasz {self.name} na {target.name}.")
+        events.emit("potion_used", "Używasz {name} na {target}.", name=self.name, target=target.name)
         self.sips_left -= 1
 
         if self.effect_type == "heal":
@@ -172,26 +312,28 @@ class Potion(Item):
             target.restore_mana(self.effect_value)
         elif self.effect_type == "strength_boost":
             if hasattr(target, 'base_attack_power'): 
-                target.attack_power += self.effect_value
-                print(f"{target.name} czuje przypływ siły! (+{self.effect_value} do ataku na jakiś czas)")
+                target.status_effects.add(target, effects.create(self.effect_type, self.effect_value), BOOST_TURNS)
+                events.emit("stat_boost", "{target} czuje przypływ siły! (+{effect_value} do ataku na {turns} tur)",
+                            target=target.name, effect_value=self.effect_value, turns=BOOST_TURNS)
             else:
-                print(f"{self.name} nie może zwiększyć siły {target.name} - brak odpowiedniego atrybutu.")
+                events.emit("potion_failed", "{name} nie może zwiększyć siły {target} - brak odpowiedniego atrybutu.",
+                            name=self.name, target=target.name)
         elif self.effect_type == "defense_boost":
             if hasattr(target, 'base_defense_power'): 
-                target.defense_power += self.effect_value
-                print(f"{target.name} czuje się bardziej odporny! (+{self.effect_value} do obrony na jakiś czas)")
+                target.status_effects.add(target, effects.create(self.effect_type, self.effect_value), BOOST_TURNS)
+                events.emit("stat_boost", "{target} czuje się bardziej odporny! (+{effect_value} do obrony na {turns} tur)",
+                            target=target.name, effect_value=self.effect_value, turns=BOOST_TURNS)
             else:
-                print(f"{self.name} nie może zwiększyć obrony {target.name} - brak odpowiedniego atrybutu.")
+                events.emit("potion_failed", "{name} nie może zwiększyć obrony {target} - brak odpowiedniego atrybutu.",
+                            name=self.name, target=target.name)
         else:
-            print(f"Nieznany efekt mikstury: {self.effect_type}")
+            events.emit("potion_failed", "Nieznany efekt mikstury: {effect_type}",
+                        effect_type=self.effect_type)
             return False 
 
         if self.sips_left == 0:
-            print(f"Butelka po {self.name} jest teraz pusta.")
+            events.emit("potion_empty", "Butelka po {name} jest teraz pusta.", name=self.name)
         return True 
 
 
-
-
-
-
+ITEM_CLASSES = {cls.kind: cls for cls in (Item, Weapon, Armor, Potion)}
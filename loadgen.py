@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import random
+import time
+
+from encounter import BOT_ANSWERS as AUTO_ANSWERS
+
+COMMAND_PROMPT = "Co robisz?  "
+# Zakończenia, po których tekst bez nowej linii uznajemy za pytanie serwera.
+PROMPT_ENDINGS = (": ", "> ", "...")
+COMMANDS = ["l", "e", "status", "idz północ", "idz południe", "idz wschód", "idz zachód", "pomoc"]
+
+
+class LoadStats:
+    """Wyniki testu obciążeniowego: opóźnienia komend i liczniki sesji."""
+    def __init__(self):
+        self.latencies = []
+        self.sessions = 0
+        self.finished_sessions = 0
+
+    def percentile(self, fraction):
+        """Zwraca percentyl opóźnienia w sekundach (np. fraction=0.99)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self, duration):
+        """Zwraca podsumowanie testu jako tekst."""
+        count = len(self.latencies)
+        return (f"sesje: {self.sessions} (zakończone grą: {self.finished_sessions}), komendy: {count}, "
+                f"{count / duration:.0f} komend/s, p50 {self.percentile(0.5) * 1000:.2f} ms, "
+                f"p99 {self.percentile(0.99) * 1000:.2f} ms, max {max(self.latencies, default=0) * 1000:.2f} ms")
+
+
+async def _read_prompt(reader, buffer):
+    """
+    Czyta odpowiedź serwera aż do promptu. Na pytania z walki odpowiada automatycznie przez zwrócony tekst.
+    Nieznane pytanie (ostatnia linia kończąca się jednym z PROMPT_ENDINGS) też kończy czytanie,
+    więc nowy prompt w grze nie zawiesi bota.
+    :return: (prompt, bufor) albo (None, bufor), jeśli serwer zamknął połączenie.
+    """
+    while True:
+        text = buffer.decode("utf-8", errors="ignore")
+        if text.endswith(COMMAND_PROMPT):
+            return COMMAND_PROMPT, b""
+        for prompt in AUTO_ANSWERS:
+            if text.endswith(prompt):
+                return prompt, b""
+        if text.endswith(PROMPT_ENDINGS):
+            return text[text.rfind("\n") + 1:], b""
+        chunk = await reader.read(65536)
+        if not chunk:
+            return None, buffer
+        buffer += chunk
+
+
+async def _bot(index, connect, stats, deadline, rng):
+    """Jeden wirtualny gracz: łączy się, podaje imię i wysyła losowe komendy do upływu czasu."""
+    while time.perf_counter() < deadline:
+        reader, writer = await connect()
+        stats.sessions += 1
+        buffer = b""
+        prompt, buffer = await _read_prompt(reader, buffer)
+        writer.write(f"Bot{index}\n".encode())
+        try:
+            prompt, buffer = await _read_prompt(reader, buffer)
+            while prompt is not None and time.perf_counter() < deadline:
+                start = time.perf_counter()
+                writer.write((rng.choice(COMMANDS) + "\n").encode())
+                prompt, buffer = await _read_prompt(reader, buffer)
+                while prompt in AUTO_ANSWERS:
+                    writer.write((AUTO_ANSWERS[prompt] + "\n").encode())
+                    prompt, buffer = await _read_prompt(reader, buffer)
+                stats.latencies.append(time.perf_counter() - start)
+            if prompt is None:
+                stats.finished_sessions += 1
+        finally:
+            writer.close()
+
+
+async def run_load(sessions, duration, host="127.0.0.1", port=4000, unix_path=None, seed=0):
+    """
+    Uruchamia równoległe sesje wirtualnych graczy przeciw działającemu serwerowi.
+    :param sessions: Liczba równoczesnych połączeń.
+    :param duration: Czas testu w sekundach.
+    :return: Obiekt LoadStats.
+    """
+    if unix_path:
+        def connect():
+            return asyncio.open_unix_connection(unix_path)
+    else:
+        def connect():
+            return asyncio.open_connection(host, port)
+    stats = LoadStats()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_bot(i, connect, stats, deadline, random.Random(f"{seed}:{i}"))
+                           for i in range(sessions)))
+    return stats
+
+
+def run():
+    """Uruchamia generator obciążenia z parametrami z linii poleceń."""
+    parser = argparse.ArgumentParser(description="Generator obciążenia dla serwera gry.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--unix", dest="unix_path")
+    args = parser.parse_args()
+    stats = asyncio.run(run_load(args.sessions, args.duration, args.host, args.port, args.unix_path))
+    print(stats.report(args.duration))
+
+
+if __name__ == "__main__":
+    run()
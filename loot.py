@@ -0,0 +1,175 @@
+import random
+from array import array
+
+# Domyślne wagi przedmiotów według rzadkości (gdy tabela łupów nie podaje wagi wprost).
+RARITY_WEIGHTS = {
+    "common": 60,
+    "uncommon": 25,
+    "rare": 8,
+    "epic": 2,
+    "legendary": 1,
+}
+
+_alias_tables = {}
+
+
+class AliasTable:
+    """
+    Losowanie z rozkładu dyskretnego metodą aliasów (Vose): budowa O(n), każde losowanie O(1).
+    Przedział [0, n) jest dzielony na n kubełków; kubełek i zwraca i z prawdopodobieństwem
+    probability[i], a w pozostałych przypadkach swój alias.
+    """
+    def __init__(self, weights):
+        """
+        :param weights: Nieujemne wagi wyników (co najmniej jedna dodatnia).
+        :raises ValueError: Przy ujemnej wadze albo braku dodatnich wag.
+        """
+        weights = list(weights)
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Wagi łupów nie mogą być ujemne.")
+        total = sum(weights)
+        if not weights or total <= 0:
+            raise ValueError("Tabela łupów musi mieć co najmniej jedną dodatnią wagę.")
+        count = len(weights)
+        self.size = count
+        self.probability = array("d", [1.0] * count)
+        self.alias = array("I", range(count))
+        scaled = [weight * count / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Resztki obu list to kubełki pełne (różnice wynikają tylko z zaokrągleń).
+
+    def draw(self, rng=random):
+        """Losuje numer wyniku jednym wywołaniem rng.random()."""
+        position = rng.random() * self.size
+        index = int(position)
+        if position - index < self.probability[index]:
+            return index
+        return self.alias[index]
+
+    def counts(self, draws, rng=random):
+        """
+        Losuje draws razy i zlicza wyniki.
+        :return: Tablica array z liczbą wylosowań każdego wyniku.
+        """
+        counts = array("Q", bytes(8 * self.size))
+        probability, alias, size, uniform = self.probability, self.alias, self.size, rng.random
+        for _ in range(draws):
+            position = uniform() * size
+            index = int(position)
+            counts[index if position - index < probability[index] else alias[index]] += 1
+        return counts
+
+
+def alias_table(weights):
+    """Zwraca AliasTable dla krotki wag - budowaną raz i współdzieloną przez wszystkich przeciwników z tymi wagami."""
+    table = _alias_tables.get(weights)
+    if table is None:
+        table = _alias_tables[weights] = AliasTable(weights)
+    return table
+
+
+def rarity_weight(item):
+    """Waga przedmiotu wynikająca z jego rzadkości."""
+    weight = RARITY_WEIGHTS.get(item.rarity)
+    if weight is None:
+        raise ValueError(f"Nieznana rzadkość przedmiotu '{item.rarity}'.")
+    return weight
+
+
+class LootTable:
+    """
+    Tabela łupów przeciwnika: przedmioty-szablony z wagami i waga pustego losowania.
+    Każde z rolls losowań wybiera jeden przedmiot (albo nic), a upuszczony przedmiot to zawsze
+    nowy egzemplarz szablonu (Item.spawn), więc łupy różnych przeciwników nie są współdzielone.
+    """
+    def __init__(self, items, weights=None, rolls=1, empty_weight=0):
+        """
+        :param items: Przedmioty-szablony.
+        :param weights: Wagi przedmiotów (None na liście lub zamiast listy - waga z RARITY_WEIGHTS).
+        :param rolls: Liczba losowań na jednego pokonanego przeciwnika.
+        :param empty_weight: Waga wyniku "nic nie wypada".
+        :raises ValueError: Przy niezgodnej liczbie wag, złej liczbie losowań albo wadze.
+        """
+        self.items = list(items)
+        if weights is None:
+            weights = [None] * len(self.items)
+        if len(weights) != len(self.items):
+            raise ValueError("Liczba wag musi odpowiadać liczbie przedmiotów w tabeli łupów.")
+        if not isinstance(rolls, int) or rolls < 0:
+            raise ValueError("Liczba losowań łupów musi być nieujemną liczbą całkowitą.")
+        self.weights = tuple(rarity_weight(item) if weight is None else weight
+                             for item, weight in zip(self.items, weights))
+        self.rolls = rolls
+        self.empty_weight = empty_weight
+        self.table = alias_table(self.weights + (empty_weight,))
+
+    @classmethod
+    def of(cls, enemy):
+        """
+        Tabela łupów przeciwnika albo None, jeśli przeciwnik nie ma wag (upuszcza cały loot_table).
+        """
+        if enemy.loot_weights is None:
+            return None
+        return cls(enemy.loot_table, enemy.loot_weights, enemy.loot_rolls, enemy.loot_empty_weight)
+
+    def roll(self, rng=random):
+        """
+        Łupy jednego pokonanego przeciwnika.
+        :return: Lista nowych egzemplarzy przedmiotów.
+        """
+        draw, empty = self.table.draw, len(self.items)
+        dropped = []
+        for _ in range(self.rolls):
+            index = draw(rng)
+            if index != empty:
+                dropped.append(self.items[index].spawn())
+        return dropped
+
+    def roll_many(self, kills, rng=random):
+        """
+        Łupy wielu pokonanych przeciwników naraz.
+        :return: Lista list nowych egzemplarzy, po jednej na przeciwnika.
+        """
+        return [self.roll(rng) for _ in range(kills)]
+
+    def counts(self, kills, rng=random):
+        """
+        Liczba sztuk każdego przedmiotu z kills pokonanych przeciwników, bez tworzenia egzemplarzy
+        (np. do symulacji gospodarki).
+        :return: Słownik {nazwa przedmiotu: liczba sztuk}.
+        """
+        counts = self.table.counts(kills * self.rolls, rng)
+        totals = {}
+        for item, count in zip(self.items, counts):
+            if count:
+                totals[item.name] = totals.get(item.name, 0) + count
+        return totals
+
+
+def loot_counts(enemies, rng=random):
+    """
+    Łupy z wielu zabójstw różnych przeciwników jako zliczenia (np. wynik tysięcy symulowanych walk).
+    Przeciwnicy bez wag upuszczają cały loot_table.
+    :param enemies: Pary (przeciwnik, liczba zabójstw).
+    :return: Słownik {nazwa przedmiotu: liczba sztuk}.
+    """
+    totals = {}
+    for enemy, kills in enemies:
+        table = LootTable.of(enemy)
+        if table is None:
+            counts = {}
+            for item in enemy.loot_table:
+                counts[item.name] = counts.get(item.name, 0) + kills
+        else:
+            counts = table.counts(kills, rng)
+        for name, count in counts.items():
+            totals[name] = totals.get(name, 0) + count
+    return totals
@@ -4,32 +4,46 @@ import characters
 import items 
 import world 
 import combat   
+import combatlog
+import encounter
+import commands
+import events
+import profiling
+import routing
+import savegame
+import trade
 import random 
 
 def display_welcome_message():
     """Wyświetla powitanie na początku gry."""
-    print("=" * 40)
-    print(" Witaj w Prostej Grze RPG Tekstowej!")
-    print("=" * 40)
-    print("Twoim celem jest eksploracja, walka i przetrwanie.") 
-    print("Używaj komend, aby poruszać się po świecie i wchodzić w interakcje.")
-    print("Powodzenia, bohaterze!")
+    events.emit("welcome", "========================================")
+    events.emit("welcome", " Witaj w Prostej Grze RPG Tekstowej!")
+    events.emit("welcome", "========================================")
+    events.emit("welcome", "Twoim celem jest eksploracja, walka i przetrwanie.") 
+    events.emit("welcome", "Używaj komend, aby poruszać się po świecie i wchodzić w interakcje.")
+    events.emit("welcome", "Powodzenia, bohaterze!")
    
-    print("Legenda komend:")
-    print("  'idz [kierunek]' - np. 'idz polnoc'")
-    print("  'rozejrzyj sie' - opisuje aktualną lokację")
-    print("  'ekwipunek' lub 'e' - pokazuje twój ekwipunek")
-    print("  'podnies [nazwa przedmiotu]' - podnosi przedmiot z lokacji")
-    print("  'zaloz [nazwa przedmiotu]' - ekwipuje przedmiot")
-    print("  'zdejmij [bron/pancerz]' - zdejmuje broń lub pancerz")
-    print("  'uzyj [nazwa mikstury]' - używa mikstury z ekwipunku")
-    print("  'status' - pokazuje status gracza")
-    print("  'atakuj [nazwa wroga]' - rozpoczyna walkę (jeśli wróg jest w lokacji)")
-    print("  'porozmawiaj [nazwa npc]' - rozmawia z NPC")
-    print("  'pomoc' - wyświetla tę listę komend")
-    print("  'wyjdz' lub 'q' - kończy grę")
-    print("-" * 40)
-    print() 
+    events.emit("welcome", "Legenda komend:")
+    events.emit("welcome", "  'idz [kierunek]' - np. 'idz polnoc'")
+    events.emit("welcome", "  'podrozuj [nazwa lokacji]' - idzie najkrótszą drogą do wskazanej lokacji")
+    events.emit("welcome", "  'rozejrzyj sie' - opisuje aktualną lokację")
+    events.emit("welcome", "  'ekwipunek' lub 'e' - pokazuje twój ekwipunek")
+    events.emit("welcome", "  'podnies [nazwa przedmiotu]' - podnosi przedmiot z lokacji")
+    events.emit("welcome", "  'zaloz [nazwa przedmiotu]' - ekwipuje przedmiot")
+    events.emit("welcome", "  'zdejmij [bron/pancerz/helm/nogi/tarcza]' - zdejmuje przedmiot z wybranego slotu")
+    events.emit("welcome", "  'uzyj [nazwa mikstury]' - używa mikstury z ekwipunku")
+    events.emit("welcome", "  'status' - pokazuje status gracza")
+    events.emit("welcome", "  'atakuj [nazwa wroga]' - rozpoczyna walkę (jeśli wróg jest w lokacji)")
+    events.emit("welcome", "  'atakuj wszystkich' - walka ze wszystkimi wrogami w lokacji naraz")
+    events.emit("welcome", "  'porozmawiaj [nazwa npc]' - rozmawia z NPC")
+    events.emit("welcome", "  'kup [nazwa przedmiotu]' - kupuje od handlarza (samo 'kup' pokazuje towary i ceny)")
+    events.emit("welcome", "  'sprzedaj [nazwa przedmiotu]' - sprzedaje przedmiot handlarzowi")
+    events.emit("welcome", "  'zapisz [nazwa]' / 'wczytaj [nazwa]' - zapisuje lub wczytuje stan gry")
+    events.emit("welcome", "  'profil [wlacz/wylacz/reset/zapisz nazwa]' - pomiary czasu komend i walki")
+    events.emit("welcome", "  'pomoc' - wyświetla tę listę komend")
+    events.emit("welcome", "  'wyjdz' lub 'q' - kończy grę")
+    events.emit("welcome", "----------------------------------------")
+    events.emit("welcome", "") 
 
 def get_player_name():
     """Pobiera imię gracza."""
@@ -38,11 +52,18 @@ def get_player_name():
         if name:
             return name
         else:
-            print("Imię nie może być puste.")
+            events.emit("invalid_name", "Imię nie może być puste.")
 
 def initialize_game():
     """Inicjalizuje stan gry, tworzy gracza i świat."""
-    player_name = get_player_name()
+    return new_game(get_player_name())
+
+def new_game(player_name):
+    """
+    Tworzy gracza o podanym imieniu z ekwipunkiem startowym oraz świat gry.
+    :param player_name: Imię bohatera.
+    :return: Krotka (gracz, mapa świata, nazwa lokalizacji startowej).
+    """
     player = characters.Player(name=player_name, health=100, attack_power=10, defense_power=3)
     
     start_weapon = items.Weapon("Stary Sztylet", "Niewiele lepszy niż gołe pięści.", 7, "melee", 3)
@@ -55,180 +76,395 @@ def initialize_game():
     game_world_map = world.create_world() 
     current_location_name = "Spokojna Polana" 
     
-    print(f"{player.name}, twoja przygoda się rozpoczyna!")
+    events.emit("game_start", "{player}, twoja przygoda się rozpoczyna!", player=player.name)
     return player, game_world_map, current_location_name
 
-def handle_player_input(player, game_map, current_location_name):
+# Archiwum walk (combatlog) jest opcjonalne: None - wyłączone; 'python main.py --combat-log [plik]' je włącza.
+COMBAT_LOG_PATH = None
+# False na serwerze: komendy local_only (pliki zapisu, pomiary całego procesu) są wtedy niedostępne.
+LOCAL_COMMANDS = True
+
+COMMANDS = commands.CommandRegistry()
+
+
+def fight(player, enemy):
     """
-    Przetwarza komendy wprowadzane przez gracza.
-    Zwraca nową nazwę lokalizacji (jeśli gracz się poruszył) lub aktualną, oraz status gry (True=kontynuuj, False=zakończ).
+    Walka (generator promptów). Jeśli ustawiono COMBAT_LOG_PATH, jej dziennik jest dopisywany
+    do tego archiwum, by walkę dało się później odtworzyć.
+    :return: "victory", "defeat", "escaped" lub "fled".
+    """
+    if COMBAT_LOG_PATH is None:
+        return (yield from combat.combat_steps(player, enemy))
+    log = combatlog.CombatLog()
+    result = yield from combat.combat_steps(player, enemy, log=log)
+    combatlog.append_log(COMBAT_LOG_PATH, log)
+    return result
+
+
+def group_fight(player, location):
+    """
+    Walka gracza ze wszystkimi żywymi przeciwnikami lokalizacji naraz (generator promptów).
+    Pokonani przeciwnicy są usuwani z lokalizacji. Jak fight, dopisuje dziennik do COMBAT_LOG_PATH.
+    :return: "victory", "defeat" lub "escaped".
     """
+    log = combatlog.CombatLog() if COMBAT_LOG_PATH is not None else None
+    result, defeated = yield from encounter.encounter_steps([player], location.claim_enemies(), log=log)
+    if log is not None:
+        combatlog.append_log(COMBAT_LOG_PATH, log)
+    for enemy in defeated:
+        location.remove_enemy(enemy)
+    return result
+
+
+def enter_location(player, location):
+    """
+    Wejście gracza do lokalizacji (generator promptów): opis, a jeśli są w niej żywi przeciwnicy -
+    10% szansy na zasadzkę jednego z nich albo całej grupy.
+    :return: Wynik walki z zasadzki albo None, jeśli do niej nie doszło.
+    """
+    location.describe()
+    living_enemies = [enemy for enemy in location.enemies if enemy.is_alive()]
+    if not living_enemies or random.random() >= 0.1:
+        return None
+    if len(living_enemies) == 1:
+        random_enemy = location.claim_enemy(living_enemies[0])
+        events.emit("ambush", "Zaskakuje cię {random_enemy}!", random_enemy=random_enemy.name)
+        combat_result = yield from fight(player, random_enemy)
+        if combat_result == "victory":
+            location.remove_enemy(random_enemy)
+        return combat_result
+    events.emit("ambush", "Zaskakują cię {enemies}!", enemies=", ".join(enemy.name for enemy in living_enemies))
+    return (yield from group_fight(player, location))
+
+
+@COMMANDS.command("idz", "i", missing_argument="Dokąd chcesz iść? (np. 'idz północ')")
+def handle_go(player, game_map, current_location_name, argument):
+    """Przejście do sąsiedniej lokalizacji w podanym kierunku."""
     current_loc_obj = game_map[current_location_name]
-    
-    action = input(f"[{current_location_name}] Co robisz?  ").lower().strip()
-    parts = action.split()
-    command = parts[0] if parts else ""
-    argument = " ".join(parts[1:]) if len(parts) > 1 else ""
-
-    if command == "idz" or command == "i":
-        if not argument:
-            print("Dokąd chcesz iść? (np. 'idz północ')")
-            return current_location_name, True
-        
-        direction = argument
-        if direction in current_loc_obj.exits:
-            destination_name = current_loc_obj.exits[direction]
-            if destination_name in game_map:
-                print(f"Idziesz na {direction} do {destination_name}...")
-                return destination_name, True 
-            else:
-                print(f"Błąd: Lokalizacja '{destination_name}' nie istnieje na mapie.")
-                return current_location_name, True
+    direction = argument
+    if direction in current_loc_obj.exits:
+        destination_name = current_loc_obj.exits[direction]
+        if destination_name in game_map:
+            events.emit("move", "Idziesz na {direction} do {destination_name}...",
+                        direction=direction, destination_name=destination_name)
+            return destination_name, True 
         else:
-            print(f"Nie możesz iść w kierunku '{direction}' z tej lokalizacji.")
+            events.emit("map_error", "Błąd: Lokalizacja '{destination_name}' nie istnieje na mapie.",
+                        destination_name=destination_name)
             return current_location_name, True
-
-    elif command in ["rozejrzyj sie", "opis", "look", "l"]:
-        current_loc_obj.describe()
+    else:
+        events.emit("no_exit", "Nie możesz iść w kierunku '{direction}' z tej lokalizacji.",
+                    direction=direction)
         return current_location_name, True
 
-    elif command in ["ekwipunek", "inventory", "e", "eq"]:
-        player.show_inventory()
+@COMMANDS.command("podrozuj", "travel", missing_argument="Dokąd chcesz podróżować? (np. 'podrozuj ruiny wieży')")
+def handle_travel(player, game_map, current_location_name, argument):
+    """
+    Przejście całej najkrótszej trasy do wskazanej lokalizacji w jednej komendzie. Każda mijana
+    lokalizacja przechodzi przez enter_location jak po 'idz' (opis, zasadzki); porażka kończy podróż.
+    """
+    try:
+        steps = routing.router_for(game_map.template).route(current_location_name, argument)
+    except KeyError:
+        events.emit("unknown_location", "Nie ma miejsca o nazwie '{argument}'.", argument=argument)
         return current_location_name, True
-        
-    elif command in ["podnies", "wez", "take", "p"]:
-        if not argument:
-            print("Co chcesz podnieść? (np. 'podnies miecz')")
-            return current_location_name, True
-        
-        item_to_take = current_loc_obj.remove_item(argument) 
-        if item_to_take:
-            player.add_item_to_inventory(item_to_take)
-        
+    except ValueError:
+        events.emit("no_route", "Nie ma drogi do '{argument}'.", argument=argument)
         return current_location_name, True
-
-    elif command in ["zaloz", "equip"]:
-        if not argument:
-            print("Co chcesz założyć? (np. 'zaloz miecz')")
-            return current_location_name, True
-        player.equip_item(argument)
+    if not steps:
+        events.emit("no_route", "Już tu jesteś.")
         return current_location_name, True
-        
-    elif command in ["zdejmij", "unequip"]:
-        if not argument:
-            print("Co chcesz zdjąć? ('bron' lub 'pancerz')")
-            return current_location_name, True
-        if argument.lower() in ['broń', 'bron', 'weapon']:
-            player.unequip_item_slot('weapon')
-        elif argument.lower() in ['pancerz', 'zbroja', 'armor']:
-            player.unequip_item_slot('armor')
-        else:
-            print("Nieznany typ slotu. Użyj 'bron' lub 'pancerz'.")
-        return current_location_name, True
-        
-    elif command in ["uzyj", "use"]:
-        if not argument:
-            print("Czego chcesz użyć? (np. 'uzyj mikstura leczenia')")
+    last = len(steps) - 1
+    for index, (direction, destination_name) in enumerate(steps):
+        events.emit("move", "Idziesz na {direction} do {destination_name}...",
+                    direction=direction, destination_name=destination_name)
+        # Ostatnią lokalizację trasy obsługuje play_session, tak samo jak po 'idz'.
+        if index < last and (yield from enter_location(player, game_map[destination_name])) == "defeat":
+            return destination_name, False
+    return steps[-1][1], True
+
+@COMMANDS.command("rozejrzyj sie", "opis", "look", "l")
+def handle_look(player, game_map, current_location_name, argument):
+    """Opis aktualnej lokalizacji."""
+    game_map[current_location_name].describe()
+    return current_location_name, True
+
+@COMMANDS.command("ekwipunek", "inventory", "e", "eq")
+def handle_inventory(player, game_map, current_location_name, argument):
+    """Zawartość ekwipunku gracza."""
+    player.show_inventory()
+    return current_location_name, True
+
+@COMMANDS.command("podnies", "wez", "take", "p", missing_argument="Co chcesz podnieść? (np. 'podnies miecz')")
+def handle_take(player, game_map, current_location_name, argument):
+    """Podniesienie przedmiotu z lokalizacji."""
+    item_to_take = game_map[current_location_name].remove_item(argument) 
+    if item_to_take:
+        player.add_item_to_inventory(item_to_take)
+    return current_location_name, True
+
+@COMMANDS.command("zaloz", "equip", missing_argument="Co chcesz założyć? (np. 'zaloz miecz')")
+def handle_equip(player, game_map, current_location_name, argument):
+    """Założenie przedmiotu z ekwipunku."""
+    player.equip_item(argument)
+    return current_location_name, True
+
+SLOT_ALIASES = {
+    'broń': 'weapon', 'bron': 'weapon', 'weapon': 'weapon',
+    'pancerz': 'torso', 'zbroja': 'torso', 'armor': 'torso', 'torso': 'torso',
+    'hełm': 'head', 'helm': 'head', 'head': 'head',
+    'nogi': 'legs', 'spodnie': 'legs', 'legs': 'legs',
+    'tarcza': 'shield', 'shield': 'shield',
+}
+
+@COMMANDS.command("zdejmij", "unequip", missing_argument="Co chcesz zdjąć? ('bron', 'pancerz', 'helm', 'nogi' lub 'tarcza')")
+def handle_unequip(player, game_map, current_location_name, argument):
+    """Zdjęcie przedmiotu z wybranego slotu."""
+    slot = SLOT_ALIASES.get(argument)
+    if slot is not None:
+        player.unequip_item_slot(slot)
+    else:
+        events.emit("invalid_slot", "Nieznany typ slotu. Użyj 'bron', 'pancerz', 'helm', 'nogi' lub 'tarcza'.")
+    return current_location_name, True
+
+@COMMANDS.command("uzyj", "use", missing_argument="Czego chcesz użyć? (np. 'uzyj mikstura leczenia')")
+def handle_use(player, game_map, current_location_name, argument):
+    """Użycie mikstury z ekwipunku."""
+    player.use_potion_from_inventory(argument) 
+    return current_location_name, True
+
+@COMMANDS.command("status", "staty", "s")
+def handle_status(player, game_map, current_location_name, argument):
+    """Status gracza."""
+    player.display_status()
+    return current_location_name, True
+
+GROUP_TARGETS = ("wszystkich", "wszyscy", "all")
+
+@COMMANDS.command("atakuj", "walcz", "fight", "a", missing_argument="Kogo chcesz zaatakować? (np. 'atakuj goblin')")
+def handle_attack(player, game_map, current_location_name, argument):
+    """Walka z przeciwnikiem z lokalizacji - generator, bo walka pyta gracza o decyzje."""
+    current_loc_obj = game_map[current_location_name]
+    if argument in GROUP_TARGETS:
+        if not any(enemy_obj.is_alive() for enemy_obj in current_loc_obj.enemies):
+            events.emit("target_missing", "Nie ma tu żadnych wrogów.")
             return current_location_name, True
-        player.use_potion_from_inventory(argument) 
+        combat_result = yield from group_fight(player, current_loc_obj)
+        if combat_result == "defeat":
+            events.emit("game_over", "Twoja przygoda dobiegła końca...")
+            return current_location_name, False
+        if combat_result == "escaped":
+            events.emit("escaped", "Wracasz do poprzedniej czynności, serce wciąż ci wali.")
+        current_loc_obj.describe()
         return current_location_name, True
+    target_enemy = None
+    for enemy_obj in current_loc_obj.enemies:
+        if enemy_obj.name.lower() == argument and enemy_obj.is_alive():
+            target_enemy = current_loc_obj.claim_enemy(enemy_obj)
+            break
+    
+    if target_enemy:
+        combat_result = yield from fight(player, target_enemy)
+        if combat_result == "victory":
+            current_loc_obj.remove_enemy(target_enemy)
+        elif combat_result == "defeat":
+            events.emit("game_over", "Twoja przygoda dobiegła końca...")
+            return current_location_name, False 
+        elif combat_result == "escaped":
+            events.emit("escaped", "Wracasz do poprzedniej czynności, serce wciąż ci wali.")
+        elif combat_result == "fled":
+            events.emit("escaped", "{enemy} chowa się gdzieś w okolicy.", enemy=target_enemy.name)
+        current_loc_obj.describe()
+    else:
+        events.emit("target_missing", "Nie ma tu wroga o nazwie '{argument}' lub jest już pokonany.",
+                    argument=argument)
+    return current_location_name, True
+
+@COMMANDS.command("porozmawiaj", "talk", "gadaj",
+                  missing_argument="Z kim chcesz porozmawiać? (np. 'porozmawiaj stary pustelnik')")
+def handle_talk(player, game_map, current_location_name, argument):
+    """Rozmowa z NPC z lokalizacji."""
+    current_loc_obj = game_map[current_location_name]
+    target_npc = None
+    for npc_obj in current_loc_obj.npcs:
+        if npc_obj.name.lower() == argument:
+            target_npc = current_loc_obj.claim_npc(npc_obj)
+            break
+    
+    if target_npc:
+        target_npc.talk()
+    else:
+        events.emit("target_missing", "Nie ma tu postaci o nazwie '{argument}'.", argument=argument)
+    return current_location_name, True
+
+@COMMANDS.command("kup", "buy")
+def handle_buy(player, game_map, current_location_name, argument):
+    """Zakup przedmiotu od handlarza z lokalizacji (bez argumentu - lista towarów z cenami)."""
+    current_loc_obj = game_map[current_location_name]
+    if argument:
+        trade.buy(player, current_loc_obj, argument)
+    elif trade.traders(current_loc_obj):
+        for npc_obj in trade.traders(current_loc_obj):
+            trade.show_wares(npc_obj)
+    else:
+        events.emit("trade_missing", "Nie ma tu żadnego handlarza.")
+    return current_location_name, True
+
+@COMMANDS.command("sprzedaj", "sell", missing_argument="Co chcesz sprzedać? (np. 'sprzedaj wilcze futro')")
+def handle_sell(player, game_map, current_location_name, argument):
+    """Sprzedaż przedmiotu z ekwipunku handlarzowi z lokalizacji."""
+    trade.sell(player, game_map[current_location_name], argument)
+    return current_location_name, True
 
-    elif command in ["status", "staty", "s"]:
-        player.display_status()
+@COMMANDS.command("zapisz", "save", local_only=True)
+def handle_save(player, game_map, current_location_name, argument):
+    """Zapis stanu gry w katalogu gracza (kolejne zapisy tej samej sesji dopisują tylko zmiany)."""
+    try:
+        path = savegame.save_path(player.name, argument)
+        size = savegame.save_game(player, game_map, current_location_name, path)
+    except (OSError, ValueError) as e:
+        events.emit("save_failed", "Nie udało się zapisać gry: {error}", error=e)
+    else:
+        events.emit("game_saved", "Zapisano grę do '{path}' ({size} B).", path=path, size=size)
+    return current_location_name, True
+
+@COMMANDS.command("wczytaj", "load", local_only=True)
+def handle_load(player, game_map, current_location_name, argument):
+    """Wczytanie stanu gry z katalogu gracza do bieżącego gracza i świata."""
+    try:
+        path = savegame.save_path(player.name, argument)
+        _, _, location_name = savegame.load_game(path, player, game_map)
+    except (OSError, ValueError) as e:
+        events.emit("load_failed", "Nie udało się wczytać gry: {error}", error=e)
         return current_location_name, True
-        
-    elif command in ["atakuj", "walcz", "fight", "a"]:
-        if not argument:
-            print("Kogo chcesz zaatakować? (np. 'atakuj goblin')")
-            return current_location_name, True
-        
-        target_enemy = None
-        for enemy_obj in current_loc_obj.enemies:
-            if enemy_obj.name.lower() == argument.lower() and enemy_obj.is_alive():
-                target_enemy = enemy_obj
-                break
-        
-        if target_enemy:
-            combat_result = combat.start_combat(player, target_enemy)
-            if combat_result == "victory":
-                current_loc_obj.remove_enemy(target_enemy)
-            elif combat_result == "defeat":
-                print("Twoja przygoda dobiegła końca...")
-                return current_location_name, False 
-            elif combat_result == "escaped":
-                print("Wracasz do poprzedniej czynności, serce wciąż ci wali.")
-            current_loc_obj.describe()
+    events.emit("game_loaded", "Wczytano grę z '{path}'.", path=path)
+    return location_name, True
+
+@COMMANDS.command("profil", "profile", local_only=True)
+def handle_profile(player, game_map, current_location_name, argument):
+    """
+    Pomiary czasu: raport, włączenie/wyłączenie, wyczyszczenie lub zapis raportu (.json albo tekst)
+    w katalogu profiling.REPORT_DIR. Pomiary dotyczą całego procesu, więc komenda jest tylko lokalna.
+    """
+    action, _, name = argument.partition(" ")
+    profiler = profiling.PROFILER
+    if action in ("wlacz", "on"):
+        profiler.enable(COMMANDS)
+        events.emit("profile", "Pomiary czasu włączone.")
+    elif action in ("wylacz", "off"):
+        profiler.disable()
+        events.emit("profile", "Pomiary czasu wyłączone.")
+    elif action == "reset":
+        profiler.reset()
+        events.emit("profile", "Wyczyszczono pomiary czasu.")
+    elif action in ("zapisz", "save"):
+        try:
+            path = profiling.report_path(name)
+            profiler.write_report(path)
+        except (OSError, ValueError) as e:
+            events.emit("profile_failed", "Nie udało się zapisać raportu: {error}", error=e)
         else:
-            print(f"Nie ma tu wroga o nazwie '{argument}' lub jest już pokonany.")
-        return current_location_name, True
+            events.emit("profile", "Zapisano raport pomiarów do '{path}'.", path=path)
+    elif action:
+        events.emit("profile_failed", "Nieznana opcja '{action}'. Użyj: profil [wlacz/wylacz/reset/zapisz nazwa].",
+                    action=action)
+    elif not profiler.to_dict():
+        events.emit("profile", "Brak pomiarów - włącz je komendą 'profil wlacz'.")
+    else:
+        events.emit("profile_report", "{report}", report=events.Lazy(profiler.report))
+    return current_location_name, True
 
-    elif command in ["porozmawiaj", "talk", "gadaj"]:
-        if not argument:
-            print("Z kim chcesz porozmawiać? (np. 'porozmawiaj stary pustelnik')")
-            return current_location_name, True
+@COMMANDS.command("pomoc", "help", "h", "?")
+def handle_help(player, game_map, current_location_name, argument):
+    """Lista komend."""
+    display_welcome_message() 
+    return current_location_name, True
 
-        target_npc = None
-        for npc_obj in current_loc_obj.npcs:
-            if npc_obj.name.lower() == argument.lower():
-                target_npc = npc_obj
-                break
-        
-        if target_npc:
-            target_npc.talk()
+@COMMANDS.command("wyjdz", "quit", "q", "exit")
+def handle_quit(player, game_map, current_location_name, argument):
+    """Zakończenie gry."""
+    events.emit("quit", "Dziękujemy za grę! Do zobaczenia.")
+    return current_location_name, False 
+
+def handle_player_input(player, game_map, current_location_name):
+    """
+    Przetwarza komendy wprowadzane przez gracza. Generator - o komendę (i decyzje w walce) pyta przez yield promptu.
+    Komenda jest wyszukiwana w rejestrze COMMANDS (alias albo jednoznaczny skrót).
+    Zwraca nową nazwę lokalizacji (jeśli gracz się poruszył) lub aktualną, oraz status gry (True=kontynuuj, False=zakończ).
+    """
+    action = (yield f"[{current_location_name}] Co robisz?  ").lower().strip()
+    word, argument = commands.parse(action)
+    command = COMMANDS.resolve(word)
+
+    if command is None:
+        candidates = COMMANDS.matches(word)
+        if len(candidates) > 1:
+            events.emit("ambiguous_command", "Niejednoznaczna komenda '{word}'. Pasuje: {candidates}.",
+                        word=word, candidates=", ".join(c.name for c in candidates))
         else:
-            print(f"Nie ma tu postaci o nazwie '{argument}'.")
+            events.emit("unknown_command", "Nieznana komenda. Wpisz 'pomoc' aby zobaczyć listę dostępnych komend.")
         return current_location_name, True
-        
-    elif command in ["pomoc", "help", "h", "?"]:
-        display_welcome_message() 
+
+    if command.local_only and not LOCAL_COMMANDS:
+        events.emit("command_unavailable", "Komenda '{command}' jest niedostępna w grze przez sieć.",
+                    command=command.name)
         return current_location_name, True
 
-    elif command in ["wyjdz", "quit", "q", "exit"]:
-        print("Dziękujemy za grę! Do zobaczenia.")
-        return current_location_name, False 
-    
-    else:
-        print("Nieznana komenda. Wpisz 'pomoc' aby zobaczyć listę dostępnych komend.")
+    if command.missing_argument and not argument:
+        events.emit("missing_argument", command.missing_argument)
         return current_location_name, True
 
+    if command.is_generator:
+        return (yield from command.handler(player, game_map, current_location_name, argument))
+    return command.handler(player, game_map, current_location_name, argument)
+
 def game_loop():
     """Główna pętla gry."""
     player, game_map, current_location_name = initialize_game()
+    combat.drive(play_session(player, game_map, current_location_name))
+
+def play_session(player, game_map, current_location_name):
+    """
+    Rozgrywka jednego gracza jako generator promptów - prowadzona przez combat.drive (terminal) albo przez serwer.
+    :param player: Obiekt gracza.
+    :param game_map: Mapa świata {nazwa: Location}.
+    :param current_location_name: Nazwa lokalizacji startowej.
+    """
     display_welcome_message()
     
     if current_location_name in game_map:
         game_map[current_location_name].describe()
     else:
-        print(f"Błąd krytyczny: Startowa lokalizacja '{current_location_name}' nie istnieje!")
+        events.emit("map_error", "Błąd krytyczny: Startowa lokalizacja '{current_location_name}' nie istnieje!",
+                    current_location_name=current_location_name)
         return 
     running = True
     while running:
         if not player.is_alive(): 
-            print("Zginąłeś... Koniec gry.")
+            events.emit("game_over", "Zginąłeś... Koniec gry.")
             running = False
             break
 
-        new_location_name, continue_playing = handle_player_input(player, game_map, current_location_name)
+        new_location_name, continue_playing = yield from handle_player_input(player, game_map, current_location_name)
         running = continue_playing
         
-        if new_location_name != current_location_name:
+        if new_location_name != current_location_name and player.is_alive():
             current_location_name = new_location_name
             if current_location_name in game_map:
-                game_map[current_location_name].describe()
-                if game_map[current_location_name].enemies and random.random() < 0.1:
-                    random_enemy = random.choice(game_map[current_location_name].enemies)
-                    print(f"Zaskakuje cię {random_enemy.name}!")
-                    combat_result = combat.start_combat(player, random_enemy)
-                    if combat_result == "victory":
-                        game_map[current_location_name].remove_enemy(random_enemy)
-                    elif combat_result == "defeat":
-                        running = False
+                if (yield from enter_location(player, game_map[current_location_name])) == "defeat":
+                    running = False
             else:
-                print(f"Błąd krytyczny: Próba przejścia do nieistniejącej lokalizacji '{current_location_name}'!")
+                events.emit("map_error", "Błąd krytyczny: Próba przejścia do nieistniejącej lokalizacji '{current_location_name}'!",
+                            current_location_name=current_location_name)
                 running = False 
 
 if __name__ == "__main__":
+    import argparse
 
+    parser = argparse.ArgumentParser(description="Prosta gra RPG tekstowa.")
+    parser.add_argument("--combat-log", nargs="?", const=combatlog.DEFAULT_PATH, metavar="PLIK",
+                        help=f"dopisuje każdą walkę do archiwum (domyślnie {combatlog.DEFAULT_PATH})")
+    COMBAT_LOG_PATH = parser.parse_args().combat_log
     try:
         game_loop()
     except KeyboardInterrupt:
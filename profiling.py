@@ -0,0 +1,266 @@
+import functools
+import inspect
+import json
+import os
+import re
+import time
+
+import characters
+import combat
+import world
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_VALUE_BITS = 40
+BUCKETS = SUB_BUCKETS * (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1)
+MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+PERCENTILES = (50, 90, 99)
+# Raporty zapisywane z gry trafiają do REPORT_DIR (zob. report_path).
+REPORT_DIR = "raporty"
+DEFAULT_REPORT_NAME = "profil.txt"
+_REPORT_NAME = re.compile(r"[\w-]+(\.txt|\.json)?")
+
+PHASES = (
+    (combat, "player_turn"),
+    (combat, "enemy_turn"),
+    (characters.Character, "tick_status_effects"),
+)
+METHODS = (
+    (characters.Character, "attack"),
+    (characters.Character, "take_damage"),
+    (characters.Character, "heal"),
+    (characters.Player, "equip_item"),
+    (characters.Player, "use_potion_from_inventory"),
+    (characters.Enemy, "use_special_ability"),
+    (combat, "display_combat_status"),
+    (world.Location, "describe"),
+)
+
+
+def _bucket_bounds(index):
+    """Zwraca najmniejszą i największą wartość, która trafia do kubełka."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    low = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """
+    Histogram czasów w stylu HDR: stała tablica liczników w kubełkach logarytmiczno-liniowych.
+    Wartości poniżej 2 * SUB_BUCKETS mają własne kubełki, a każdy kolejny przedział [2^k, 2^(k+1))
+    jest dzielony na SUB_BUCKETS równych części, więc błąd względny nie przekracza 1 / SUB_BUCKETS.
+    Zapis to obliczenie numeru kubełka i inkrementacja licznika, bez alokacji; liczba pomiarów
+    i minimum wynikają z kubełków, dokładne są tylko suma (do średniej) i maksimum.
+    """
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        """
+        Dolicza jeden pomiar.
+        :param value: Czas w nanosekundach (wartości powyżej MAX_VALUE trafiają do ostatniego kubełka).
+        """
+        if value > MAX_VALUE:
+            value = MAX_VALUE
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        self.counts[(shift << SUB_BUCKET_BITS) + (value >> shift) if shift > 0 else value] += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def count(self):
+        """Liczba pomiarów."""
+        return sum(self.counts)
+
+    @property
+    def min(self):
+        """Dolna granica kubełka z najmniejszym pomiarem (0 dla pustego histogramu)."""
+        for index, count in enumerate(self.counts):
+            if count:
+                return _bucket_bounds(index)[0]
+        return 0
+
+    def merge(self, other):
+        """Dołącza pomiary z innego histogramu."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def mean(self):
+        """Średni czas w nanosekundach."""
+        count = self.count
+        return self.total / count if count else 0.0
+
+    def percentile(self, percent):
+        """
+        Zwraca wartość, poniżej której leży podany procent pomiarów (górna granica kubełka,
+        ale nie więcej niż zmierzone maksimum).
+        :param percent: Procent z zakresu 0-100.
+        """
+        count = self.count
+        if not count:
+            return 0
+        rank = max(1, -(-count * percent // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def to_dict(self):
+        """Podsumowanie histogramu jako słownik (czasy w nanosekundach) z niepustymi kubełkami."""
+        summary = {"count": self.count, "mean": self.mean(), "min": self.min, "max": self.max}
+        for percent in PERCENTILES:
+            summary[f"p{percent}"] = self.percentile(percent)
+        summary["buckets"] = {_bucket_bounds(index)[0]: count for index, count in enumerate(self.counts) if count}
+        return summary
+
+
+class Profiler:
+    """
+    Zestaw histogramów podpiętych pod funkcje gry. Włączenie podmienia wskazane funkcje
+    na wersje mierzące czas, a wyłączenie przywraca oryginały - wyłączony profiler nic nie kosztuje.
+    """
+    def __init__(self):
+        self.histograms = {}
+        self._patches = []
+
+    @property
+    def enabled(self):
+        return bool(self._patches)
+
+    def histogram(self, name):
+        """Zwraca histogram o podanej nazwie, tworząc go przy pierwszym użyciu."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def _timed(self, name, func):
+        histogram = self.histogram(name)
+        clock = time.perf_counter_ns
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def timed_steps(*args, **kwargs):
+                # Generator mierzy tylko czas własnych kroków, bez czekania na odpowiedź gracza.
+                steps = func(*args, **kwargs)
+                start = clock()
+                elapsed = 0
+                try:
+                    prompt = next(steps)
+                    while True:
+                        elapsed += clock() - start
+                        answer = yield prompt
+                        start = clock()
+                        prompt = steps.send(answer)
+                except StopIteration as stop:
+                    histogram.record(elapsed + clock() - start)
+                    return stop.value
+            return timed_steps
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+        return timed
+
+    def instrument(self, owner, attribute, name=None):
+        """
+        Podmienia funkcję owner.attribute (funkcję modułu albo metodę klasy) na wersję mierzącą czas.
+        :param name: Nazwa histogramu; domyślnie "Klasa.metoda" albo "moduł.funkcja".
+        """
+        original = vars(owner)[attribute]
+        if name is None:
+            name = f"{getattr(owner, '__name__', owner)}.{attribute}"
+        setattr(owner, attribute, self._timed(name, original))
+        self._patches.append((owner, attribute, original))
+
+    def instrument_commands(self, registry):
+        """Mierzy czas każdej komendy z rejestru commands.CommandRegistry (histogramy "komenda:nazwa")."""
+        for command in registry.commands.values():
+            original = command.handler
+            command.handler = self._timed(f"komenda:{command.name}", original)
+            self._patches.append((command, "handler", original))
+
+    def enable(self, registry=None):
+        """
+        Włącza pomiary: fazy walki (PHASES), wybrane metody (METHODS) i komendy z rejestru.
+        Ponowne włączenie najpierw zdejmuje poprzednie podmiany.
+        """
+        self.disable()
+        for owner, attribute in PHASES:
+            self.instrument(owner, attribute, f"walka:{attribute}")
+        for owner, attribute in METHODS:
+            self.instrument(owner, attribute)
+        if registry is not None:
+            self.instrument_commands(registry)
+
+    def disable(self):
+        """Przywraca oryginalne funkcje (zebrane histogramy zostają)."""
+        while self._patches:
+            owner, attribute, original = self._patches.pop()
+            setattr(owner, attribute, original)
+
+    def reset(self):
+        """Czyści zebrane pomiary."""
+        for histogram in self.histograms.values():
+            histogram.__init__()
+
+    def report(self):
+        """Raport tekstowy: jedna linia na histogram, czasy w mikrosekundach."""
+        header = f"{'pomiar':<40} {'liczba':>8} {'średnio':>9}" + "".join(
+            f" {'p' + str(percent):>9}" for percent in PERCENTILES) + f" {'max':>9}"
+        lines = [header, "-" * len(header)]
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.count:
+                continue
+            lines.append(f"{name:<40} {histogram.count:>8} {histogram.mean() / 1000:>9.1f}" + "".join(
+                f" {histogram.percentile(percent) / 1000:>9.1f}" for percent in PERCENTILES)
+                + f" {histogram.max / 1000:>9.1f}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """Wszystkie niepuste histogramy jako słownik {nazwa: podsumowanie} (czasy w nanosekundach)."""
+        return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())
+                if histogram.count}
+
+    def write_report(self, path):
+        """
+        Zapisuje raport do pliku: JSON dla rozszerzenia .json, w przeciwnym razie tekst.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            if path.endswith(".json"):
+                json.dump(self.to_dict(), file, ensure_ascii=False, indent=1)
+            else:
+                file.write(self.report() + "\n")
+
+
+def report_path(name=None):
+    """
+    Ścieżka pliku raportu w katalogu REPORT_DIR.
+    :param name: Nazwa pliku podana przez gracza (litery, cyfry, '_', '-' i opcjonalnie .txt albo .json);
+                 None lub pusta - DEFAULT_REPORT_NAME.
+    :raises ValueError: Przy nazwie z innymi znakami (np. ścieżce do innego katalogu).
+    """
+    name = name or DEFAULT_REPORT_NAME
+    if not _REPORT_NAME.fullmatch(name):
+        raise ValueError(f"Niedozwolona nazwa raportu '{name}' - użyj liter, cyfr, '_' lub '-' (i .txt albo .json).")
+    return os.path.join(REPORT_DIR, name)
+
+
+PROFILER = Profiler()
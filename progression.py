@@ -0,0 +1,77 @@
+from bisect import bisect_right
+
+FIRST_LEVEL_XP = 100
+STATS = ("health", "attack", "defense", "mana")
+
+
+def next_threshold(threshold):
+    """XP potrzebne na kolejny poziom, gdy na obecny potrzeba było threshold."""
+    return int(threshold * 1.5)
+
+
+def level_gains(level):
+    """
+    Przyrost statystyk przy awansie na dany poziom.
+    :return: Krotka (zdrowie, atak, obrona, mana).
+    """
+    return 10 + level * 2, 2 + level // 2, 1 + level // 3, 5 + level
+
+
+class ProgressionTable:
+    """
+    Krzywa doświadczenia policzona z góry: dla każdego poziomu próg XP na następny poziom, łączne XP
+    potrzebne od poziomu 1 oraz łączne przyrosty statystyk. Poziom po dużej nagrodzie to wyszukiwanie
+    binarne w łącznym XP (O(log poziomów)), a przyrost statystyk między dowolnymi poziomami - różnica
+    dwóch sum. Tabela wydłuża się sama, gdy nagroda sięga poza policzone poziomy.
+    """
+    def __init__(self, levels=100, first_level_xp=FIRST_LEVEL_XP):
+        """
+        :param levels: Liczba poziomów liczonych od razu.
+        :param first_level_xp: XP potrzebne na awans z poziomu 1.
+        """
+        # Listy indeksowane numerem poziomu; pozycja 0 nie jest używana.
+        self.thresholds = [0, first_level_xp]
+        self.total_xp = [0, 0]
+        self.gains = {stat: [0, 0] for stat in STATS}
+        self.extend(levels)
+
+    @property
+    def max_level(self):
+        return len(self.total_xp) - 1
+
+    def extend(self, level):
+        """Liczy tabelę co najmniej do podanego poziomu."""
+        while self.max_level < level:
+            new_level = self.max_level + 1
+            previous = self.thresholds[-1]
+            self.total_xp.append(self.total_xp[-1] + previous)
+            self.thresholds.append(next_threshold(previous))
+            for stat, gain in zip(STATS, level_gains(new_level)):
+                self.gains[stat].append(self.gains[stat][-1] + gain)
+
+    def threshold(self, level):
+        """XP potrzebne na awans z podanego poziomu."""
+        self.extend(level)
+        return self.thresholds[level]
+
+    def experience_for(self, level):
+        """Łączne XP potrzebne, by z poziomu 1 (z zerowym XP) dojść do podanego poziomu."""
+        self.extend(level)
+        return self.total_xp[level]
+
+    def level_for(self, total_experience):
+        """Najwyższy poziom, który daje łączne XP zebrane od poziomu 1."""
+        while self.total_xp[-1] <= total_experience:
+            self.extend(self.max_level + 1)
+        return bisect_right(self.total_xp, total_experience, 1) - 1
+
+    def gains_between(self, from_level, to_level):
+        """
+        Łączny przyrost statystyk przy awansie z from_level na to_level.
+        :return: Krotka (zdrowie, atak, obrona, mana).
+        """
+        self.extend(to_level)
+        return tuple(self.gains[stat][to_level] - self.gains[stat][from_level] for stat in STATS)
+
+
+TABLE = ProgressionTable()
@@ -0,0 +1,369 @@
+import heapq
+import weakref
+from array import array
+from collections import OrderedDict, deque
+
+CACHE_SIZE = 4096
+LANDMARKS = 4
+LANDMARK_MIN_SIZE = 1000
+TREE_CACHE_SIZE = 16
+TREE_DEMAND = 3
+
+_routers = weakref.WeakKeyDictionary()
+
+
+class RouteGraph:
+    """
+    Graf wyjść między lokalizacjami zapisany w tablicach (format CSR): lokalizacje mają numery,
+    a sąsiedzi lokalizacji i leżą w targets[offsets[i]:offsets[i + 1]]. Nazwy i kierunki
+    są potrzebne dopiero przy składaniu gotowej trasy.
+    """
+    def __init__(self, names, exits_of, position=None):
+        """
+        :param names: Nazwy wszystkich lokalizacji (dowolny iterowalny obiekt).
+        :param exits_of: Funkcja nazwa -> słownik wyjść {kierunek: nazwa lokalizacji}.
+        :param position: Opcjonalna funkcja nazwa -> (x, y), gdy jeden ruch zmienia jedną współrzędną o 1;
+                         odległość miejska jest wtedy heurystyką dla A*.
+        """
+        self.names = list(names)
+        self._ids = {name.casefold(): index for index, name in enumerate(self.names)}
+        self._directions = {}
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        self.edge_directions = []
+        self._overrides = {}
+        self._reverse = None
+        self.landmarks = []
+        # Liczba punktów orientacyjnych do przeliczenia przy następnym A* (po zmianie wyjść).
+        self._stale_landmarks = 0
+        for name in self.names:
+            for direction, destination in exits_of(name).items():
+                target = self._ids.get(destination.casefold())
+                if target is not None:
+                    self.targets.append(target)
+                    self.edge_directions.append(self._directions.setdefault(direction, direction))
+            self.offsets.append(len(self.targets))
+        self.positions = None
+        if position is not None:
+            self.positions = array("l")
+            for name in self.names:
+                self.positions.extend(position(name))
+
+    def __len__(self):
+        return len(self.names)
+
+    def id_of(self, name):
+        """Zwraca numer lokalizacji (wielkość liter nie ma znaczenia) albo None."""
+        return self._ids.get(name.casefold())
+
+    def neighbours(self, node):
+        """Zwraca listę par (kierunek, numer sąsiada) dla lokalizacji o numerze node."""
+        override = self._overrides.get(node)
+        if override is not None:
+            return override
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return list(zip(self.edge_directions[start:end], self.targets[start:end]))
+
+    def _targets(self, node):
+        if self._overrides:
+            override = self._overrides.get(node)
+            if override is not None:
+                return [neighbour for _, neighbour in override]
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def set_exits(self, name, exits):
+        """
+        Podmienia wyjścia jednej lokalizacji (bez przebudowy tablic). Po dodaniu skrótu (np. portalu)
+        ani współrzędne, ani dotychczasowe punkty orientacyjne nie muszą być dolnym ograniczeniem odległości,
+        więc współrzędne są porzucane, a punkty orientacyjne przeliczane leniwie przy następnym A*
+        (kilka zmian z rzędu kosztuje jedno przeliczenie). Duży graf, który miał tylko współrzędne,
+        dostaje w zamian LANDMARKS punktów.
+        :param exits: Nowy słownik {kierunek: nazwa lokalizacji}.
+        """
+        node = self._ids[name.casefold()]
+        self._overrides[node] = [(direction, self._ids[destination.casefold()])
+                                 for direction, destination in exits.items()
+                                 if destination.casefold() in self._ids]
+        self._reverse = None
+        count = len(self.landmarks) or self._stale_landmarks
+        if not count and self.positions is not None and len(self.names) >= LANDMARK_MIN_SIZE:
+            count = LANDMARKS
+        self._stale_landmarks = count
+        self.landmarks = []
+        self.positions = None
+
+    def distances_from(self, source):
+        """Zwraca tablicę odległości (liczba ruchów, -1 = nieosiągalna) od lokalizacji source do wszystkich."""
+        distances = array("l", [-1]) * len(self.names)
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            next_distance = distances[node] + 1
+            for neighbour in self._targets(node):
+                if distances[neighbour] < 0:
+                    distances[neighbour] = next_distance
+                    queue.append(neighbour)
+        return distances
+
+    def next_hops(self, goal):
+        """
+        Przeszukuje graf wstecz od celu i zwraca tablicę następnych kroków: next_hops[v] to sąsiad v
+        leżący o jeden ruch bliżej celu (-1, jeśli cel jest nieosiągalny). Trasa do tego celu z dowolnej
+        lokalizacji składa się potem w czasie proporcjonalnym do jej długości.
+        """
+        if self._reverse is None:
+            self._reverse = [[] for _ in self.names]
+            for node in range(len(self.names)):
+                for neighbour in self._targets(node):
+                    self._reverse[neighbour].append(node)
+        hops = array("l", [-1]) * len(self.names)
+        hops[goal] = goal
+        queue = deque([goal])
+        while queue:
+            node = queue.popleft()
+            for previous in self._reverse[node]:
+                if hops[previous] < 0:
+                    hops[previous] = node
+                    queue.append(previous)
+        return hops
+
+    def follow(self, hops, start, goal):
+        """
+        Składa trasę z tablicy next_hops.
+        :return: Lista kroków (kierunek, nazwa lokalizacji) albo None, jeśli cel jest nieosiągalny.
+        """
+        if hops[start] < 0:
+            return None
+        steps = []
+        node = start
+        while node != goal:
+            following = hops[node]
+            steps.append((self._direction(node, following), self.names[following]))
+            node = following
+        return steps
+
+    def add_landmarks(self, count, first=0):
+        """
+        Wybiera punkty orientacyjne (kolejno najdalsze od już wybranych) i zapamiętuje odległości od nich.
+        A* korzysta z nich jako z dolnego ograniczenia: d(v, cel) >= d(L, cel) - d(L, v).
+        :param count: Liczba punktów orientacyjnych.
+        :param first: Numer pierwszego punktu.
+        """
+        nearest = None
+        node = first
+        for _ in range(count):
+            distances = self.distances_from(node)
+            self.landmarks.append(distances)
+            if nearest is None:
+                nearest = array("l", distances)
+            else:
+                for index, distance in enumerate(distances):
+                    if 0 <= distance < nearest[index]:
+                        nearest[index] = distance
+            node = max(range(len(nearest)), key=nearest.__getitem__)
+
+    def has_heuristic(self):
+        """Czy A* ma heurystykę: współrzędne albo punkty orientacyjne (także czekające na przeliczenie)."""
+        return self.positions is not None or bool(self.landmarks) or self._stale_landmarks > 0
+
+    def _direction(self, node, neighbour):
+        """Zwraca kierunek wyjścia prowadzącego z node do neighbour."""
+        if node not in self._overrides:
+            targets = self.targets
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                if targets[edge] == neighbour:
+                    return self.edge_directions[edge]
+        for direction, target in self.neighbours(node):
+            if target == neighbour:
+                return direction
+        return None
+
+    def _steps(self, parents, goal):
+        steps = []
+        node = goal
+        while parents[node] is not None:
+            previous = parents[node]
+            steps.append((self._direction(previous, node), self.names[node]))
+            node = previous
+        steps.reverse()
+        return steps
+
+    def bfs(self, start, goal):
+        """
+        Najkrótsza trasa przeszukiwaniem wszerz.
+        :return: Lista kroków (kierunek, nazwa lokalizacji) albo None, jeśli celu nie da się osiągnąć.
+        """
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                return self._steps(parents, goal)
+            for neighbour in self._targets(node):
+                if neighbour not in parents:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        return None
+
+    def _estimator(self, goal):
+        """Zwraca funkcję dolnego ograniczenia odległości do celu (pozycje i punkty orientacyjne)."""
+        bounds = [(distances, distances[goal]) for distances in self.landmarks if distances[goal] >= 0]
+        positions = self.positions
+        if positions is None:
+            goal_x = goal_y = 0
+        else:
+            goal_x, goal_y = positions[2 * goal], positions[2 * goal + 1]
+
+        def estimate(node):
+            best = abs(positions[2 * node] - goal_x) + abs(positions[2 * node + 1] - goal_y) if positions else 0
+            for distances, goal_distance in bounds:
+                distance = distances[node]
+                if distance >= 0 and goal_distance - distance > best:
+                    best = goal_distance - distance
+            return best
+
+        return estimate
+
+    def astar(self, start, goal):
+        """
+        Najkrótsza trasa algorytmem A* (heurystyka z pozycji i punktów orientacyjnych).
+        :return: Lista kroków (kierunek, nazwa lokalizacji) albo None.
+        """
+        if self._stale_landmarks:
+            count, self._stale_landmarks = self._stale_landmarks, 0
+            self.add_landmarks(count)
+        estimate = self._estimator(goal)
+        parents = {start: None}
+        costs = {start: 0}
+        heap = [(estimate(start), 0, start)]
+        while heap:
+            _, negative_cost, node = heapq.heappop(heap)
+            cost = -negative_cost
+            if node == goal:
+                return self._steps(parents, goal)
+            if cost > costs[node]:
+                continue
+            new_cost = cost + 1
+            for neighbour in self._targets(node):
+                if new_cost < costs.get(neighbour, new_cost + 1):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = node
+                    # Przy równych oszacowaniach najpierw węzły dalsze od startu - mniej rozwinięć na siatce.
+                    heapq.heappush(heap, (new_cost + estimate(neighbour), -new_cost, neighbour))
+        return None
+
+
+class Router:
+    """
+    Usługa tras dla szablonu świata: graf wyjść budowany raz i pamięć podręczna LRU ostatnich tras.
+    Cele, o które pytano co najmniej TREE_DEMAND razy, dostają drzewo następnych kroków, więc trasa
+    do nich z każdej lokalizacji jest składana bez przeszukiwania.
+    Zmiana wyjść przez set_exit aktualizuje lokalizację szablonu i graf oraz czyści pamięć tras.
+    """
+    def __init__(self, template, cache_size=CACHE_SIZE, landmarks=None):
+        """
+        :param template: Szablon świata (world.WorldTemplate).
+        :param cache_size: Liczba zapamiętywanych tras.
+        :param landmarks: Liczba punktów orientacyjnych dla A*; domyślnie LANDMARKS w światach
+                          od LANDMARK_MIN_SIZE lokalizacji, a w mniejszych żadnego (wystarcza BFS).
+        """
+        self.template = template
+        locations = template.locations
+        exits_of = getattr(locations, "exits_of", None) or (lambda name: template.location(name).exits)
+        self.graph = RouteGraph(locations, exits_of, getattr(locations, "position", None))
+        if landmarks is None:
+            landmarks = LANDMARKS if len(self.graph) >= LANDMARK_MIN_SIZE else 0
+        self.graph.add_landmarks(landmarks)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._trees = OrderedDict()
+        self._demand = {}
+        self.hits = 0
+        self.misses = 0
+
+    def route(self, source, destination):
+        """
+        Zwraca najkrótszą trasę między lokalizacjami.
+        :param source: Nazwa lokalizacji początkowej.
+        :param destination: Nazwa celu (wielkość liter nie ma znaczenia).
+        :return: Lista kroków (kierunek, nazwa lokalizacji); pusta, gdy cel to lokalizacja początkowa.
+        :raises KeyError: Jeśli którejś lokalizacji nie ma w świecie.
+        :raises ValueError: Jeśli celu nie da się osiągnąć.
+        """
+        start = self.graph.id_of(source)
+        goal = self.graph.id_of(destination)
+        if start is None:
+            raise KeyError(source)
+        if goal is None:
+            raise KeyError(destination)
+        key = (start, goal)
+        steps = self._cache.get(key)
+        if steps is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return steps
+        self.misses += 1
+        hops = self._tree(goal)
+        if hops is not None:
+            steps = self.graph.follow(hops, start, goal)
+        elif self.graph.has_heuristic():
+            steps = self.graph.astar(start, goal)
+        else:
+            steps = self.graph.bfs(start, goal)
+        if steps is None:
+            raise ValueError(f"Nie ma drogi z '{source}' do '{destination}'.")
+        self._cache[key] = steps
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return steps
+
+    def set_exit(self, location_name, direction, destination=None):
+        """
+        Dodaje, zmienia albo (destination=None) usuwa wyjście lokalizacji szablonu i unieważnia trasy.
+        Lokalizacja dostaje nowy słownik wyjść (przypisanie, nie zmiana w miejscu), więc działa to też
+        dla lokalizacji, których wyjścia są czytane na żądanie (sharedworld.SharedLocation).
+        """
+        location = self.template.location(location_name)
+        exits = dict(location.exits)
+        if destination is None:
+            exits.pop(direction, None)
+        else:
+            exits[direction] = destination
+        location.exits = exits
+        self.graph.set_exits(location_name, exits)
+        self.invalidate()
+
+    def _tree(self, goal):
+        """Zwraca drzewo następnych kroków do celu, budując je, gdy cel jest często wybierany."""
+        hops = self._trees.get(goal)
+        if hops is not None:
+            self._trees.move_to_end(goal)
+            return hops
+        demand = self._demand.get(goal, 0) + 1
+        if demand < TREE_DEMAND:
+            if len(self._demand) >= self.cache_size:
+                self._demand.clear()
+            self._demand[goal] = demand
+            return None
+        self._demand.pop(goal, None)
+        hops = self._trees[goal] = self.graph.next_hops(goal)
+        if len(self._trees) > TREE_CACHE_SIZE:
+            self._trees.popitem(last=False)
+        return hops
+
+    def invalidate(self):
+        """Czyści pamięć podręczną tras i drzewa następnych kroków."""
+        self._cache.clear()
+        self._trees.clear()
+        self._demand.clear()
+
+
+def router_for(template):
+    """
+    Zwraca usługę tras dla szablonu świata, tworząc ją przy pierwszym wywołaniu.
+    """
+    router = _routers.get(template)
+    if router is None:
+        router = _routers[template] = Router(template)
+    return router
@@ -0,0 +1,234 @@
+import marshal
+import mmap
+import os
+import re
+import struct
+
+import ai
+import characters
+import effects
+import items
+import world
+from inventory import Inventory
+
+MAGIC = b"RPGSAVE2"
+FULL = b"F"
+DELTA = b"D"
+_RECORD_HEADER = struct.Struct("<cI")
+DEFAULT_PATH = "zapis.sav"
+# Zapisy z gry trafiają do SAVE_DIR/<imię gracza>/<nazwa>.sav (zob. save_path).
+SAVE_DIR = "zapisy"
+DEFAULT_SLOT = "zapis"
+_SLOT_NAME = re.compile(r"[\w-]+")
+_UNSAFE_CHARS = re.compile(r"[^\w-]")
+MAX_DELTAS = 64
+# Zachowania przeciwników z zapisów (i dzienników walk) sprzed tabel ai - wtedy wynikały z nazwy.
+_LEGACY_BEHAVIOURS = {"Leśny Pająk": ai.POISON_SPITTER}
+
+_save_files = {}
+
+
+def _item_record(item):
+    """Przedmiot jako krotka prostych wartości: pola definicji i stan egzemplarza."""
+    return tuple(item.definition), tuple(getattr(item, field) for field, _ in item._state)
+
+
+def _load_item(record):
+    definition, state = record
+    cls = items.ITEM_CLASSES[definition[0]]
+    return cls.from_definition(items.define(*definition), **dict(zip((f for f, _ in cls._state), state)))
+
+
+def player_record(player):
+    """Stan gracza jako proste wartości: (atrybuty, ekwipunek, przedmioty w slotach EQUIPMENT_SLOTS)."""
+    state = {key: value for key, value in vars(player).items()
+             if key not in ("inventory", "equipment") + characters.STATS}
+    state["status_effects"] = player.status_effects.records()
+    equipped = [_item_record(player.equipment[slot]) if player.equipment[slot] is not None else None
+                for slot in characters.EQUIPMENT_SLOTS]
+    return state, [_item_record(item) for item in player.inventory], equipped
+
+
+def restore_player(record, player=None):
+    """Odtwarza gracza z rekordu player_record (nadpisuje podany obiekt albo tworzy nowy)."""
+    state, inventory, equipped = record
+    if player is None:
+        player = characters.Player.__new__(characters.Player)
+    player.__dict__.clear()
+    player.__dict__.update(state)
+    player.status_effects = effects.StatusEffects.from_records(state["status_effects"])
+    player.inventory = Inventory([_load_item(item) for item in inventory])
+    player.equipment = {slot: _load_item(item) if item is not None else None
+                        for slot, item in zip(characters.EQUIPMENT_SLOTS, equipped)}
+    return player
+
+
+def enemy_record(enemy):
+    """Stan przeciwnika jako proste wartości: (atrybuty, łupy)."""
+    state = {key: value for key, value in vars(enemy).items() if key not in ("loot_table",) + characters.STATS}
+    state["status_effects"] = enemy.status_effects.records()
+    return state, [_item_record(item) for item in enemy.loot_table]
+
+
+def load_enemy(record):
+    """Tworzy przeciwnika z rekordu enemy_record."""
+    state, loot = record
+    enemy = characters.Enemy.__new__(characters.Enemy)
+    enemy.__dict__.update(state)
+    if "behaviour" not in state and state["name"] in _LEGACY_BEHAVIOURS:
+        enemy.behaviour = _LEGACY_BEHAVIOURS[state["name"]]
+    enemy.status_effects = effects.StatusEffects.from_records(state["status_effects"])
+    enemy.loot_table = [_load_item(item) for item in loot]
+    return enemy
+
+
+def _location_record(location):
+    visited, enemies, items_in_location, npcs = location.overlay()
+    return (location.name, visited,
+            [enemy_record(enemy) for enemy in enemies] if enemies is not None else None,
+            [_item_record(item) for item in items_in_location] if items_in_location is not None else None,
+            [(npc.interaction_count, npc.supply) for npc in npcs] if npcs is not None else None)
+
+
+def _state_record(player, game_map, location_name, locations):
+    return player_record(player), location_name, [_location_record(location) for location in locations]
+
+
+def _write_record(file, kind, payload):
+    data = marshal.dumps(payload)
+    file.write(_RECORD_HEADER.pack(kind, len(data)))
+    file.write(data)
+    return _RECORD_HEADER.size + len(data)
+
+
+class SaveFile:
+    """
+    Plik zapisu gry: pełna migawka, po której dopisywane są tylko zmiany (delty).
+    Każdy rekord to [rodzaj: 1 bajt][długość: 4 bajty][dane marshal]. Zapisywane są wyłącznie
+    proste wartości (liczby, napisy, krotki, słowniki), więc wczytanie nie tworzy dowolnych obiektów.
+    Po MAX_DELTAS deltach, przy zapisie innego świata albo pierwszym zapisie tego pliku w danym
+    świecie powstaje nowa pełna migawka; zmiany świata są śledzone osobno dla każdego pliku.
+    """
+    def __init__(self, path=DEFAULT_PATH, max_deltas=MAX_DELTAS):
+        """
+        :param path: Ścieżka pliku zapisu.
+        :param max_deltas: Liczba delt, po której zapis zaczyna się od nowej pełnej migawki.
+        """
+        self.path = path
+        self.max_deltas = max_deltas
+        self.deltas = 0
+        self._world = None
+
+    def save(self, player, game_map, location_name, full=False):
+        """
+        Zapisuje stan gry. Jeśli plik zawiera migawkę tego samego świata, dopisuje tylko deltę.
+        :param player: Obiekt gracza.
+        :param game_map: Instancja świata (world.WorldInstance).
+        :param location_name: Nazwa aktualnej lokalizacji gracza.
+        :param full: Wymusza pełną migawkę.
+        :return: Liczba zapisanych bajtów.
+        """
+        changed = game_map.take_changes(self.path)
+        if (full or changed is None or self._world is not game_map or self.deltas >= self.max_deltas
+                or not os.path.exists(self.path)):
+            return self._save_full(player, game_map, location_name)
+        with open(self.path, "ab") as file:
+            written = _write_record(file, DELTA, _state_record(player, game_map, location_name, changed))
+        self.deltas += 1
+        return written
+
+    def _save_full(self, player, game_map, location_name):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(MAGIC)
+            written = len(MAGIC) + _write_record(
+                file, FULL, _state_record(player, game_map, location_name, game_map.modified_locations()))
+        os.replace(temporary, self.path)
+        self._world = game_map
+        self.deltas = 0
+        return written
+
+    def load(self, player=None, game_map=None):
+        """
+        Wczytuje stan gry: pełną migawkę i po kolei wszystkie delty (plik czytany przez mmap).
+        :param player: Istniejący gracz do nadpisania; None tworzy nowy obiekt.
+        :param game_map: Istniejąca instancja świata do nadpisania; None tworzy nową.
+        :return: Krotka (gracz, mapa świata, nazwa lokalizacji).
+        """
+        player_record, location_name, locations = None, None, {}
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Plik '{self.path}' nie jest zapisem gry.")
+            position = len(MAGIC)
+            deltas = 0
+            with memoryview(data) as view:
+                while position < len(data):
+                    kind, length = _RECORD_HEADER.unpack_from(data, position)
+                    position += _RECORD_HEADER.size
+                    if position + length > len(data):
+                        break
+                    player_record, location_name, records = marshal.loads(view[position:position + length])
+                    position += length
+                    if kind == FULL:
+                        locations = {}
+                        deltas = 0
+                    else:
+                        deltas += 1
+                    for record in records:
+                        locations[record[0]] = record
+
+        if player_record is None:
+            raise ValueError(f"Plik '{self.path}' nie zawiera stanu gry.")
+        player = restore_player(player_record, player)
+        if game_map is None:
+            game_map = world.create_world()
+        else:
+            game_map.reset()
+        for name, visited, enemies, items_in_location, npcs in locations.values():
+            game_map[name].restore(visited,
+                                   [load_enemy(enemy) for enemy in enemies] if enemies is not None else None,
+                                   [_load_item(item) for item in items_in_location]
+                                   if items_in_location is not None else None,
+                                   npcs)
+        # Od tej chwili plik odpowiada stanowi świata - kolejny zapis dopisze tylko nowe zmiany.
+        game_map.take_changes(self.path)
+        self._world = game_map
+        self.deltas = deltas
+        return player, game_map, location_name
+
+
+def save_path(player_name, slot=None):
+    """
+    Ścieżka pliku zapisu w katalogu gracza: SAVE_DIR/<imię>/<nazwa>.sav. Znaki imienia spoza liter,
+    cyfr, '_' i '-' są zamieniane na '_', więc gracz nie wyjdzie poza swój katalog.
+    :param player_name: Imię gracza.
+    :param slot: Nazwa zapisu podana przez gracza; None lub pusta - DEFAULT_SLOT.
+    :raises ValueError: Jeśli nazwa zapisu zawiera inne znaki niż litery, cyfry, '_' i '-'.
+    """
+    slot = slot or DEFAULT_SLOT
+    if not _SLOT_NAME.fullmatch(slot):
+        raise ValueError(f"Niedozwolona nazwa zapisu '{slot}' - użyj liter, cyfr, '_' lub '-'.")
+    return os.path.join(SAVE_DIR, _UNSAFE_CHARS.sub("_", player_name) or "_", slot + ".sav")
+
+
+def save_file(path=DEFAULT_PATH):
+    """
+    Zwraca obiekt SaveFile dla ścieżki - ten sam przez cały czas działania procesu,
+    dzięki czemu kolejne zapisy tej samej sesji dopisują delty.
+    """
+    if path not in _save_files:
+        _save_files[path] = SaveFile(path)
+    return _save_files[path]
+
+
+def save_game(player, game_map, location_name, path=DEFAULT_PATH):
+    """Zapisuje grę do pliku (pełna migawka lub delta). Zwraca liczbę zapisanych bajtów."""
+    return save_file(path).save(player, game_map, location_name)
+
+
+def load_game(path=DEFAULT_PATH, player=None, game_map=None):
+    """Wczytuje grę z pliku. Zwraca krotkę (gracz, mapa świata, nazwa lokalizacji)."""
+    return save_file(path).load(player, game_map)
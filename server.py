@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import sys
+
+import events
+import main
+
+NAME_PROMPT = "Podaj imię swojego bohatera: "
+
+
+class GameServer:
+    """
+    Serwer gry oparty o asyncio: wszystkie sesje w jednej pętli zdarzeń,
+    jeden obiekt Player i własny świat (world.create_world) na połączenie.
+    Rozgrywka to generator promptów (main.play_session), więc czekanie na komendę
+    jednego gracza nigdy nie blokuje pozostałych.
+    """
+    def __init__(self):
+        # Sesje serwera dzielą proces i jego katalog - bez zapisów na dysk i przełączania pomiarów.
+        # Archiwum walk też zostaje wyłączone: synchroniczny zapis pliku blokowałby pętlę zdarzeń.
+        main.LOCAL_COMMANDS = False
+        main.COMBAT_LOG_PATH = None
+        self.active_sessions = 0
+        self.total_sessions = 0
+
+    async def handle_client(self, reader, writer):
+        """
+        Obsługuje jedno połączenie od powitania do końca gry lub rozłączenia.
+        Każde połączenie działa we własnym zadaniu asyncio, więc ma własnego odbiorcę komunikatów.
+        """
+        sink = events.BufferedSink(writer.write)
+        events.set_sink(sink)
+        self.active_sessions += 1
+        self.total_sessions += 1
+        session = None
+        try:
+            name = await self._ask(reader, writer, sink, NAME_PROMPT)
+            while name is not None and not name.strip():
+                events.emit("invalid_name", "Imię nie może być puste.")
+                name = await self._ask(reader, writer, sink, NAME_PROMPT)
+            if name is None:
+                return
+
+            player, game_map, location_name = main.new_game(name.strip())
+            session = main.play_session(player, game_map, location_name)
+            try:
+                prompt = next(session)
+                while True:
+                    answer = await self._ask(reader, writer, sink, prompt)
+                    if answer is None:
+                        break
+                    prompt = session.send(answer)
+            except StopIteration:
+                pass
+            sink.flush()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"Błąd w sesji: {e!r}", file=sys.stderr)
+        finally:
+            if session is not None:
+                session.close()
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _ask(self, reader, writer, sink, prompt):
+        """
+        Wysyła zebrane komunikaty i prompt, po czym czeka na linię od gracza.
+        :return: Odpowiedź bez znaku końca linii albo None, jeśli klient się rozłączył.
+        """
+        sink.flush()
+        writer.write(prompt.encode("utf-8"))
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            return None
+        return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    async def serve(self, host="127.0.0.1", port=4000, unix_path=None):
+        """
+        Uruchamia serwer na porcie TCP albo gnieździe uniksowym i obsługuje klientów do przerwania.
+        :param host: Adres nasłuchu TCP.
+        :param port: Port TCP.
+        :param unix_path: Ścieżka gniazda uniksowego (zamiast TCP).
+        """
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path, backlog=4096)
+            address = unix_path
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+            address = f"{host}:{port}"
+        print(f"Serwer gry nasłuchuje na {address}")
+        async with server:
+            await server.serve_forever()
+
+
+def run():
+    """Uruchamia serwer z parametrami z linii poleceń."""
+    parser = argparse.ArgumentParser(description="Serwer gry dla wielu graczy.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--unix", dest="unix_path", help="ścieżka gniazda uniksowego zamiast TCP")
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        print("Serwer zatrzymany.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,240 @@
+import multiprocessing
+import random
+import time
+from collections import deque
+
+import characters
+import combat
+import events
+import main
+import savegame
+from encounter import BOT_ANSWERS
+
+
+class RegionMap:
+    """
+    Podział świata na regiony (shardy). Świat proceduralny (worldgen) jest dzielony na pionowe pasy
+    siatki, więc numer regionu wynika ze współrzędnych i nie wymaga żadnej tablicy. Inne światy dzielimy
+    na spójne kawałki w kolejności przeszukiwania wszerz od lokalizacji startowej.
+    """
+    def __init__(self, template, shard_count):
+        """
+        :param template: Szablon świata (world.WorldTemplate).
+        :param shard_count: Liczba regionów.
+        """
+        if not isinstance(shard_count, int) or shard_count <= 0:
+            raise ValueError("Liczba shardów musi być dodatnią liczbą całkowitą.")
+        self.shard_count = shard_count
+        self.locations = template.locations
+        self._assigned = None
+        if not hasattr(self.locations, "position"):
+            self._assigned = self._by_graph(template)
+
+    def _by_graph(self, template):
+        start = template.start if template.start is not None else next(iter(self.locations))
+        order = []
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            exits = self.locations.exits_of(name) if hasattr(self.locations, "exits_of") else self.locations[name].exits
+            for destination in exits.values():
+                if destination not in seen and destination in self.locations:
+                    seen.add(destination)
+                    queue.append(destination)
+        order.extend(name for name in self.locations if name not in seen)
+        size = -(-len(order) // self.shard_count)
+        return {name: position // size for position, name in enumerate(order)}
+
+    def shard_of(self, name):
+        """Numer regionu, do którego należy lokalizacja."""
+        if self._assigned is not None:
+            return self._assigned[name]
+        column, _ = self.locations.position(name)
+        return column * self.shard_count // self.locations.width
+
+
+def _bot_command(location, rng):
+    """Komenda wirtualnego gracza: walka lub podniesienie przedmiotu, jeśli jest okazja, a poza tym marsz."""
+    enemies = [enemy for enemy in location.enemies if enemy.is_alive()]
+    if enemies and rng.random() < 0.5:
+        return "atakuj " + rng.choice(enemies).name.lower()
+    if location.items_in_location and rng.random() < 0.5:
+        return "podnies " + rng.choice(location.items_in_location).name.lower()
+    if location.exits and rng.random() < 0.9:
+        return "idz " + rng.choice(list(location.exits))
+    return "l"
+
+
+class Shard:
+    """
+    Stan jednego regionu w procesie roboczym: instancja świata (używana tylko dla lokalizacji regionu)
+    i gracze, którzy w nim przebywają. Gracz, który wyjdzie poza region, opuszcza shard jako
+    komunikat przekazania (numer, rekord savegame.player_record, lokalizacja docelowa).
+    """
+    def __init__(self, index, shard_count, world_factory, seed=0):
+        """
+        :param index: Numer regionu.
+        :param shard_count: Liczba regionów.
+        :param world_factory: Funkcja bez argumentów zwracająca world.WorldTemplate (ta sama we wszystkich procesach).
+        :param seed: Ziarno bazowe losowości botów i walk.
+        """
+        self.index = index
+        self.template = world_factory()
+        self.regions = RegionMap(self.template, shard_count)
+        self.game_map = self.template.instantiate()
+        self.players = {}
+        self.rng = random.Random(f"{seed}:{index}")
+        random.seed(f"{seed}:{index}:walki")
+
+    def arrive(self, player_id, record, location_name):
+        """Przyjmuje gracza przekazanego z innego regionu (albo nowego)."""
+        self.players[player_id] = (savegame.restore_player(record), location_name)
+
+    def command(self, player_id, line, read_input=None):
+        """
+        Wykonuje jedną komendę gracza tak jak main.handle_player_input.
+        :param read_input: Odpowiedzi na pytania komendy (prompt -> odpowiedź); domyślnie odpowiedzi bota.
+        :return: Przekazanie (numer, rekord, lokalizacja), jeśli gracz opuścił region, albo None.
+        """
+        player, location_name = self.players[player_id]
+        answers = iter((line,))
+
+        def answer(prompt):
+            text = next(answers, None)
+            if text is not None:
+                return text
+            return read_input(prompt) if read_input is not None else BOT_ANSWERS.get(prompt, "")
+
+        location_name, _ = combat.drive(main.handle_player_input(player, self.game_map, location_name), answer)
+        if not player.is_alive():
+            player.current_health = player.max_health
+        if self.regions.shard_of(location_name) != self.index:
+            del self.players[player_id]
+            return player_id, savegame.player_record(player), location_name
+        self.players[player_id] = (player, location_name)
+        return None
+
+    def run(self, rounds):
+        """
+        Każdy gracz w regionie wykonuje do rounds komend bota (bez komunikatów).
+        :return: Krotka (liczba komend, lista przekazań).
+        """
+        handoffs = []
+        count = 0
+        with events.muted():
+            for _ in range(rounds):
+                for player_id in list(self.players):
+                    location = self.game_map[self.players[player_id][1]]
+                    handoff = self.command(player_id, _bot_command(location, self.rng))
+                    count += 1
+                    if handoff is not None:
+                        handoffs.append(handoff)
+        return count, handoffs
+
+
+def _serve_shard(index, shard_count, world_factory, seed, connection):
+    """
+    Pętla procesu roboczego: komunikaty ("arrive", przekazania), ("run", rundy), ("stop",) z potoku.
+    Odpowiedź na "run": ("done", liczba komend, przekazania, czas procesora zużyty na takt w sekundach).
+    """
+    main.COMBAT_LOG_PATH = None
+    main.LOCAL_COMMANDS = False
+    shard = Shard(index, shard_count, world_factory, seed)
+    while True:
+        message = connection.recv()
+        kind = message[0]
+        if kind == "arrive":
+            for player_id, record, location_name in message[1]:
+                shard.arrive(player_id, record, location_name)
+        elif kind == "run":
+            start = time.process_time()
+            count, handoffs = shard.run(message[1])
+            connection.send(("done", count, handoffs, time.process_time() - start))
+        elif kind == "stop":
+            connection.close()
+            return
+
+
+class ShardedWorld:
+    """
+    Świat podzielony na regiony, z których każdy należy do osobnego procesu roboczego.
+    Procesy pracują równolegle w taktach: każdy rozgrywa komendy swoich graczy, a przekazania
+    graczy między regionami są dostarczane przez potoki na początku następnego taktu.
+    """
+    def __init__(self, world_factory, shard_count, seed=0):
+        """
+        :param world_factory: Funkcja bez argumentów zwracająca world.WorldTemplate; musi dać się zserializować
+                              (np. functools.partial(worldgen.generate, 10000)).
+        :param shard_count: Liczba regionów i procesów roboczych.
+        :param seed: Ziarno bazowe.
+        """
+        self.template = world_factory()
+        self.regions = RegionMap(self.template, shard_count)
+        self.connections = []
+        self.processes = []
+        self._pending = [[] for _ in range(shard_count)]
+        self._next_id = 0
+        self.busy_time = 0.0  # suma czasów procesora najwolniejszego regionu w kolejnych taktach
+        for index in range(shard_count):
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(index, shard_count, world_factory, seed, child),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def add_player(self, name, location_name=None):
+        """
+        Dodaje gracza z podstawowymi statystykami w podanej lokalizacji (domyślnie startowej).
+        :return: Numer gracza.
+        """
+        location_name = location_name if location_name is not None else self.template.start
+        if location_name not in self.template.locations:
+            raise ValueError(f"Lokalizacja '{location_name}' nie istnieje.")
+        player = characters.Player(name, health=100, attack_power=10, defense_power=3)
+        player_id = self._next_id
+        self._next_id += 1
+        self._pending[self.regions.shard_of(location_name)].append(
+            (player_id, savegame.player_record(player), location_name))
+        return player_id
+
+    def tick(self, rounds=1):
+        """
+        Jeden takt: dostarcza zaległe przekazania i każe każdemu regionowi rozegrać rounds komend na gracza.
+        :return: Krotka (liczba komend, liczba przekazań między regionami).
+        """
+        for connection, pending in zip(self.connections, self._pending):
+            if pending:
+                connection.send(("arrive", pending))
+            connection.send(("run", rounds))
+        self._pending = [[] for _ in self.connections]
+        count = moved = 0
+        slowest = 0.0
+        for connection in self.connections:
+            _, shard_count, handoffs, elapsed = connection.recv()
+            count += shard_count
+            moved += len(handoffs)
+            slowest = max(slowest, elapsed)
+            for handoff in handoffs:
+                self._pending[self.regions.shard_of(handoff[2])].append(handoff)
+        self.busy_time += slowest
+        return count, moved
+
+    def close(self):
+        """Zatrzymuje procesy robocze."""
+        for connection in self.connections:
+            connection.send(("stop",))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,257 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import world
+from content import _name_hash
+
+MAGIC = b"RPGSHARE"
+_HEADER = struct.Struct("<III")
+_SLOT = struct.Struct("<II")
+_RECORD = struct.Struct("<IIHHHH")
+_LENGTH = struct.Struct("<H")
+
+
+def _text(data):
+    encoded = data.encode("utf-8")
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _record_data(record):
+    name = record["name"].encode("utf-8")
+    description = record["description"].encode("utf-8")
+    exits = record.get("exits") or {}
+    lists = [record.get(field, ()) for field in ("enemies", "items", "npcs")]
+    parts = [_RECORD.pack(len(name), len(description), len(exits), *(len(ids) for ids in lists)), name, description]
+    for direction, destination in exits.items():
+        parts.append(_text(direction))
+        parts.append(_text(destination))
+    for ids in lists:
+        parts.extend(_text(item_id) for item_id in ids)
+    return b"".join(parts)
+
+
+def write_block(records, path, start=None):
+    """
+    Zapisuje niezmienne dane lokalizacji (nazwa, opis, wyjścia, identyfikatory przeciwników,
+    przedmiotów i NPC) do pliku, który procesy robocze mapują przez mmap. Napisy leżą w UTF-8
+    bez serializacji obiektów, a tablica haszująca pozwala znaleźć rekord po nazwie.
+    :param records: Rekordy lokalizacji w formacie paczki zawartości (np. worldgen.GeneratedLocations.records()).
+    :param path: Ścieżka pliku bloku.
+    :param start: Nazwa lokalizacji startowej; domyślnie pierwsza z rekordów.
+    """
+    blobs = []
+    names = []
+    for record in records:
+        names.append(record["name"])
+        blobs.append(_record_data(record))
+    if start is None and names:
+        start = names[0]
+    slots = 2 * len(blobs) + 1
+    start_data = _text(start or "")
+    offset = len(MAGIC) + _HEADER.size + len(start_data) + slots * _SLOT.size
+    table = [None] * slots
+    for name, blob in zip(names, blobs):
+        name_hash = _name_hash(name)
+        slot = name_hash % slots
+        while table[slot] is not None:
+            slot = (slot + 1) % slots
+        table[slot] = (name_hash, offset)
+        offset += len(blob)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        file.write(_HEADER.pack(len(blobs), slots, len(start_data)))
+        file.write(start_data)
+        for entry in table:
+            file.write(_SLOT.pack(*entry) if entry is not None else _SLOT.pack(0, 0))
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temporary, path)
+
+
+class SharedBlock:
+    """
+    Blok danych lokalizacji zmapowany tylko do odczytu. Strony pliku są wspólne dla wszystkich
+    procesów, które go otworzą, a pola rekordów są czytane wprost z mapowania przy każdym odwołaniu.
+    """
+    def __init__(self, path):
+        """
+        :param path: Ścieżka pliku utworzonego przez write_block.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            self._data.close()
+            raise ValueError(f"Plik '{path}' nie jest blokiem danych świata.")
+        self.view = memoryview(self._data)
+        self.count, self._slots, start_length = _HEADER.unpack_from(self._data, len(MAGIC))
+        position = len(MAGIC) + _HEADER.size
+        self.start = self._string(position)[0] or None
+        self._table_start = position + start_length
+
+    def _string(self, position):
+        """Zwraca (napis, pozycja za napisem) dla napisu z prefiksem długości."""
+        (length,) = _LENGTH.unpack_from(self._data, position)
+        position += _LENGTH.size
+        return str(self.view[position:position + length], "utf-8"), position + length
+
+    def find(self, name):
+        """Pozycja rekordu lokalizacji o podanej nazwie albo None."""
+        name_hash = _name_hash(name)
+        encoded = name.encode("utf-8")
+        slot = name_hash % self._slots
+        while True:
+            entry_hash, offset = _SLOT.unpack_from(self._data, self._table_start + slot * _SLOT.size)
+            if offset == 0:
+                return None
+            if entry_hash == name_hash and self.raw_name(offset) == encoded:
+                return offset
+            slot = (slot + 1) % self._slots
+
+    def offsets(self):
+        """Pozycje wszystkich rekordów w kolejności zapisu."""
+        offsets = []
+        for slot in range(self._slots):
+            _, offset = _SLOT.unpack_from(self._data, self._table_start + slot * _SLOT.size)
+            if offset:
+                offsets.append(offset)
+        return sorted(offsets)
+
+    def raw_name(self, offset):
+        """Nazwa rekordu jako widok na bajty UTF-8 w mapowaniu (bez kopiowania)."""
+        name_length = _RECORD.unpack_from(self._data, offset)[0]
+        start = offset + _RECORD.size
+        return self.view[start:start + name_length]
+
+    def raw_description(self, offset):
+        """Opis rekordu jako widok na bajty UTF-8 w mapowaniu (bez kopiowania)."""
+        name_length, description_length = _RECORD.unpack_from(self._data, offset)[:2]
+        start = offset + _RECORD.size + name_length
+        return self.view[start:start + description_length]
+
+    def exits(self, offset):
+        """Dekoduje słownik wyjść rekordu."""
+        name_length, description_length, exit_count = _RECORD.unpack_from(self._data, offset)[:3]
+        return self._exits(offset + _RECORD.size + name_length + description_length, exit_count)[0]
+
+    def _exits(self, position, count):
+        data = self._data
+        view = self.view
+        exits = {}
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size
+            direction = str(view[position:position + length], "utf-8")
+            position += length
+            (length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size
+            exits[direction] = str(view[position:position + length], "utf-8")
+            position += length
+        return exits, position
+
+    def fields(self, offset):
+        """
+        Dekoduje wyjścia i identyfikatory z rekordu.
+        :return: Krotka (wyjścia, przeciwnicy, przedmioty, NPC).
+        """
+        name_length, description_length, exit_count, *counts = _RECORD.unpack_from(self._data, offset)
+        exits, position = self._exits(offset + _RECORD.size + name_length + description_length, exit_count)
+        lists = []
+        for count in counts:
+            ids = []
+            for _ in range(count):
+                item_id, position = self._string(position)
+                ids.append(item_id)
+            lists.append(ids)
+        return (exits, *lists)
+
+    def close(self):
+        """Zamyka mapowanie (po zwolnieniu wszystkich widoków)."""
+        self.view.release()
+        self._data.close()
+
+
+class SharedLocation(world.Location):
+    """
+    Lokalizacja szablonu czytana z bloku SharedBlock. Nazwa, opis i wyjścia nie są przechowywane
+    w obiekcie - każde odwołanie czyta je z mapowania - więc proces trzyma tylko pozycję rekordu
+    i listy szablonów przeciwników, przedmiotów i NPC. Działa z Location.describe i LocationInstance.
+    Przypisane wyjścia (np. przez routing.Router.set_exit) zastępują te z bloku w tym obiekcie.
+    """
+    def __init__(self, block, offset, content):
+        self.block = block
+        self.offset = offset
+        _, enemies, items_in_location, npcs = block.fields(offset)
+        self.enemies = [content.enemy(enemy_id) for enemy_id in enemies]
+        self.items_in_location = [content.item(item_id) for item_id in items_in_location]
+        self.npcs = [content.npc(npc_id) for npc_id in npcs]
+        self.visited = False
+        self._exits = None
+
+    @property
+    def name(self):
+        return str(self.block.raw_name(self.offset), "utf-8")
+
+    @property
+    def description(self):
+        return str(self.block.raw_description(self.offset), "utf-8")
+
+    @property
+    def exits(self):
+        if self._exits is not None:
+            return self._exits
+        return self.block.exits(self.offset)
+
+    @exits.setter
+    def exits(self, exits):
+        self._exits = exits
+
+
+class SharedLocations(Mapping):
+    """
+    Lokalizacje z bloku SharedBlock widziane jako słownik {nazwa: Location}, jak world.ContentLocations.
+    Szablony przeciwników, przedmiotów i NPC pochodzą z paczki zawartości.
+    """
+    def __init__(self, block, content=None):
+        """
+        :param block: Otwarty blok danych świata.
+        :param content: Źródło szablonów (world.ContentLocations); domyślnie world.content().
+        """
+        self.block = block
+        self.content = content if content is not None else world.content()
+
+    def __getitem__(self, name):
+        offset = self.block.find(name)
+        if offset is None:
+            raise KeyError(name)
+        return SharedLocation(self.block, offset, self.content)
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self.block.find(name) is not None
+
+    def __iter__(self):
+        return (str(self.block.raw_name(offset), "utf-8") for offset in self.block.offsets())
+
+    def __len__(self):
+        return self.block.count
+
+    def exits_of(self, name):
+        """Zwraca wyjścia lokalizacji bez tworzenia obiektu Location."""
+        offset = self.block.find(name)
+        if offset is None:
+            raise KeyError(name)
+        return self.block.exits(offset)
+
+
+def shared_template(path):
+    """
+    Otwiera blok danych świata i zwraca oparty na nim szablon świata (np. jako world_factory
+    dla shards.ShardedWorld - functools.partial(sharedworld.shared_template, ścieżka)).
+    :return: world.WorldTemplate.
+    """
+    block = SharedBlock(path)
+    return world.WorldTemplate(SharedLocations(block), block.start)
@@ -0,0 +1,310 @@
+import random
+from collections import Counter
+
+import ai
+import characters
+import world
+
+ATTACK = "attack"
+DEFEND = "defend"
+POTION = "potion"
+FLEE = "flee"
+MAGIC = "magic"
+
+VICTORY = "victory"
+DEFEAT = "defeat"
+ESCAPED = "escaped"
+FLED = "fled"
+DRAW = "draw"
+
+MAX_TURNS = 1000
+
+
+class FightState:
+    """
+    Stan pojedynczej walki trzymany w samych liczbach, bez obiektów postaci i bez I/O.
+    Odwzorowuje zasady z combat.start_combat, player_turn i enemy_turn.
+    """
+    __slots__ = (
+        "player_health", "player_max_health", "player_attack", "player_defense",
+        "player_base_attack", "player_level", "player_mana", "player_blocking",
+        "poison_turns", "poison_potency", "potions",
+        "enemy_name", "enemy_health", "enemy_max_health", "enemy_attack", "enemy_defense",
+        "enemy_blocking", "cooldown", "max_cooldown", "behaviour", "turns",
+    )
+
+    def __init__(self, player, enemy):
+        """
+        Kopiuje do stanu walki aktualne statystyki gracza i przeciwnika.
+        :param player: Obiekt gracza (characters.Player).
+        :param enemy: Obiekt przeciwnika (characters.Enemy).
+        """
+        self.player_health = player.current_health
+        self.player_max_health = player.max_health
+        self.player_attack = player.attack_power
+        self.player_defense = player.defense_power
+        self.player_base_attack = player.base_attack_power
+        self.player_level = player.level
+        self.player_mana = player.mana
+        self.player_blocking = False
+        poison = player.status_effects.get("poison")
+        self.poison_turns = poison.duration if poison else 0
+        self.poison_potency = poison.potency if poison else 0
+        self.potions = []
+        for item in player.inventory:
+            if getattr(item, 'effect_type', None) == "heal":
+                self.potions.extend([item.effect_value] * item.sips_left)
+
+        self.enemy_name = enemy.name
+        self.enemy_health = enemy.current_health
+        self.enemy_max_health = enemy.max_health
+        self.enemy_attack = enemy.attack_power
+        self.enemy_defense = enemy.defense_power
+        self.enemy_blocking = False
+        self.cooldown = enemy.special_ability_cooldown
+        self.max_cooldown = enemy.max_cooldown
+        self.behaviour = ai.behaviour_index(enemy)
+        self.turns = 0
+
+    def copy(self):
+        """
+        Zwraca niezależną kopię stanu (szablon dla kolejnych walk).
+        """
+        clone = FightState.__new__(FightState)
+        for slot in FightState.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        clone.potions = list(self.potions)
+        return clone
+
+
+def always_attack(state):
+    """Polityka gracza: zawsze atakuje."""
+    return ATTACK
+
+
+def heal_when_low(threshold=0.3):
+    """
+    Tworzy politykę, która leczy się miksturą poniżej progu zdrowia,
+    a w pozostałych przypadkach rzuca Magiczny Pocisk (jeśli starczy many) lub atakuje.
+    :param threshold: Ułamek maksymalnego zdrowia, poniżej którego gracz pije miksturę.
+    """
+    def policy(state):
+        if state.potions and state.player_health < state.player_max_health * threshold:
+            return POTION
+        if state.player_mana >= 10:
+            return MAGIC
+        return ATTACK
+    return policy
+
+
+def _hit(health, defense, blocking, damage):
+    """Odpowiednik Character.take_damage - zwraca zdrowie po trafieniu."""
+    if blocking:
+        defense *= 2
+    reduced = damage - defense
+    if reduced > 0:
+        health -= reduced
+        if health < 0:
+            health = 0
+    return health
+
+
+def _player_turn(state, rng, policy):
+    """
+    Tura gracza. Zwraca False, jeśli gracz uciekł z walki.
+    Niedozwolona akcja (mikstura bez mikstur, pocisk bez many) zamienia się w atak.
+    """
+    action = policy(state) if policy is not None else ATTACK
+    if action == DEFEND:
+        state.player_blocking = True
+    elif action == POTION and state.potions:
+        state.player_health = min(state.player_max_health, state.player_health + state.potions.pop())
+    elif action == FLEE:
+        escape_chance = 0.25 if state.player_health < state.player_max_health / 4 else 0.5
+        if rng.random() < escape_chance:
+            return False
+    elif action == MAGIC and state.player_mana >= 10:
+        state.player_mana -= 10
+        damage = state.player_base_attack + state.player_level * 2
+        state.enemy_health = _hit(state.enemy_health, state.enemy_defense, state.enemy_blocking, damage)
+        state.enemy_blocking = False
+    else:
+        state.enemy_health = _hit(state.enemy_health, state.enemy_defense, state.enemy_blocking, state.player_attack)
+        state.enemy_blocking = False
+
+    if state.poison_turns > 0:
+        state.player_health = _hit(state.player_health, state.player_defense, state.player_blocking, state.poison_potency)
+        state.player_blocking = False
+        state.poison_turns -= 1
+    return True
+
+
+def _enemy_turn(state, rng):
+    """
+    Tura przeciwnika - ta sama tabela zachowań i ta sama kolejność losowań co combat.enemy_turn.
+    Zwraca False, jeśli przeciwnik uciekł z walki.
+    """
+    table = ai.TABLE
+    behaviour = state.behaviour
+    action = table.decide(behaviour, state.cooldown, state.enemy_health, state.enemy_max_health, rng)
+    damage = state.enemy_attack
+    if action == ai.FLEE:
+        return False
+    if action == ai.POISON:
+        if rng.random() < table.value(behaviour, "poison_chance"):
+            state.poison_turns = table.value(behaviour, "poison_turns")
+            state.poison_potency = state.enemy_attack // table.value(behaviour, "poison_divisor")
+        damage = None
+        state.cooldown = state.max_cooldown
+    elif action == ai.STRIKE:
+        damage = state.enemy_attack * table.value(behaviour, "strike_percent") // 100
+        state.cooldown = state.max_cooldown
+    elif action == ai.DEFEND:
+        state.enemy_blocking = True
+        damage = None
+
+    if damage is not None:
+        state.player_health = _hit(state.player_health, state.player_defense, state.player_blocking, damage)
+        state.player_blocking = False
+
+    if state.cooldown > 0:
+        state.cooldown -= 1
+    return True
+
+
+def simulate_fight(state, rng, policy=None, max_turns=MAX_TURNS):
+    """
+    Rozgrywa jedną walkę na podanym stanie (stan jest modyfikowany).
+    :param state: Obiekt FightState.
+    :param rng: Generator liczb losowych (random.Random).
+    :param policy: Funkcja stan -> akcja gracza; None oznacza zawsze atak.
+    :param max_turns: Limit tur, po którym walka kończy się remisem.
+    :return: "victory", "defeat", "escaped", "fled" lub "draw".
+    """
+    player_moves = rng.random() >= 0.5
+    while state.player_health > 0 and state.enemy_health > 0:
+        if state.turns >= max_turns:
+            return DRAW
+        if player_moves:
+            if not _player_turn(state, rng, policy):
+                return ESCAPED
+        elif not _enemy_turn(state, rng):
+            return FLED
+        state.turns += 1
+        player_moves = not player_moves
+    return VICTORY if state.player_health > 0 else DEFEAT
+
+
+class CombatStats:
+    """
+    Zbiorcze wyniki wielu walk z jednym przeciwnikiem.
+    """
+    def __init__(self, enemy_name=""):
+        self.enemy_name = enemy_name
+        self.fights = 0
+        self.outcomes = Counter()
+        self.turn_histogram = Counter()
+        self.player_hp_histogram = Counter()
+        self.enemy_hp_histogram = Counter()
+
+    def add(self, outcome, state):
+        """
+        Dolicza wynik jednej walki.
+        :param outcome: Wynik zwrócony przez simulate_fight.
+        :param state: Stan po zakończeniu walki.
+        """
+        self.fights += 1
+        self.outcomes[outcome] += 1
+        self.turn_histogram[state.turns] += 1
+        if outcome == VICTORY:
+            self.player_hp_histogram[state.player_health] += 1
+        elif outcome == DEFEAT:
+            self.enemy_hp_histogram[state.enemy_health] += 1
+
+    def merge(self, other):
+        """
+        Dołącza wyniki z innego obiektu CombatStats.
+        """
+        self.fights += other.fights
+        self.outcomes.update(other.outcomes)
+        self.turn_histogram.update(other.turn_histogram)
+        self.player_hp_histogram.update(other.player_hp_histogram)
+        self.enemy_hp_histogram.update(other.enemy_hp_histogram)
+        return self
+
+    def win_rate(self):
+        """Odsetek wygranych walk."""
+        return self.outcomes[VICTORY] / self.fights if self.fights else 0.0
+
+    def mean_turns(self):
+        """Średnia liczba tur walki."""
+        if not self.fights:
+            return 0.0
+        return sum(turns * count for turns, count in self.turn_histogram.items()) / self.fights
+
+    def mean_player_hp(self):
+        """Średnie zdrowie gracza po wygranej walce."""
+        wins = sum(self.player_hp_histogram.values())
+        if not wins:
+            return 0.0
+        return sum(hp * count for hp, count in self.player_hp_histogram.items()) / wins
+
+    def __str__(self):
+        return (f"{self.enemy_name}: walk {self.fights}, wygrane {self.win_rate():.1%}, "
+                f"średnio tur {self.mean_turns():.2f}, średnio HP gracza po wygranej {self.mean_player_hp():.1f}")
+
+
+def run_fights(player, enemy, fights, seed=None, policy=None, max_turns=MAX_TURNS):
+    """
+    Rozgrywa wiele niezależnych walk gracza z przeciwnikiem, bez modyfikowania obiektów.
+    :param player: Obiekt gracza.
+    :param enemy: Obiekt przeciwnika.
+    :param fights: Liczba walk.
+    :param seed: Ziarno generatora liczb losowych.
+    :param policy: Polityka gracza (None = zawsze atak).
+    :param max_turns: Limit tur jednej walki.
+    :return: Obiekt CombatStats.
+    """
+    rng = random.Random(seed)
+    template = FightState(player, enemy)
+    stats = CombatStats(enemy.name)
+    for _ in range(fights):
+        state = template.copy()
+        stats.add(simulate_fight(state, rng, policy, max_turns), state)
+    return stats
+
+
+def enemy_templates():
+    """
+    Zwraca listę przeciwników występujących w świecie z world.py (bez powtórzeń nazw).
+    """
+    templates = {}
+    for location in world.create_world().values():
+        for enemy in location.enemies:
+            templates.setdefault(enemy.name, enemy)
+    return list(templates.values())
+
+
+def simulate_roster(player=None, fights=10000, seed=0, policy=None):
+    """
+    Symuluje walki gracza z każdym szablonem przeciwnika ze świata gry.
+    :param player: Obiekt gracza; domyślnie nowa postać ze statystykami startowymi.
+    :param fights: Liczba walk na przeciwnika.
+    :param seed: Ziarno bazowe; każdy przeciwnik dostaje własny strumień.
+    :param policy: Polityka gracza (None = zawsze atak).
+    :return: Słownik {nazwa przeciwnika: CombatStats}.
+    """
+    if player is None:
+        player = characters.Player("Symulant", health=100, attack_power=10, defense_power=3)
+    results = {}
+    for enemy in enemy_templates():
+        results[enemy.name] = run_fights(player, enemy, fights, seed=f"{seed}:{enemy.name}", policy=policy)
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    fight_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for enemy_stats in simulate_roster(fights=fight_count).values():
+        print(enemy_stats)
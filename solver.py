@@ -0,0 +1,247 @@
+import math
+
+import ai
+import simulation
+
+
+class MatchupResult:
+    """
+    Dokładny wynik pojedynczego pojedynku wyliczony przez MatchupSolver.
+    """
+    def __init__(self, win_probability, draw_probability, expected_turns):
+        self.win_probability = win_probability
+        self.draw_probability = draw_probability
+        self.defeat_probability = max(0.0, 1.0 - win_probability - draw_probability)
+        self.expected_turns = expected_turns
+
+    def __str__(self):
+        return (f"wygrana {self.win_probability:.4%}, porażka {self.defeat_probability:.4%}, "
+                f"walka bez końca {self.draw_probability:.4%}, oczekiwana liczba tur {self.expected_turns:.3f}")
+
+
+class MatchupSolver:
+    """
+    Dokładny solver pojedynku gracza (który zawsze atakuje) z przeciwnikiem.
+    Programowanie dynamiczne z pamięcią po stanach (HP gracza, HP wroga, czas odnowienia,
+    tury i siła trucizny, blok wroga, kto się rusza). Stany o tych samych HP tworzą warstwę,
+    w której mogą występować cykle (blok, odnowienie) - każdą taką warstwę rozwiązujemy
+    jako mały układ równań liniowych.
+    """
+    def __init__(self, player, enemy):
+        """
+        :param player: Obiekt gracza (characters.Player).
+        :param enemy: Obiekt przeciwnika (characters.Enemy).
+        :raises ValueError: Jeśli przeciwnik może uciec z walki (tego wyniku solver nie modeluje).
+        """
+        state = simulation.FightState(player, enemy)
+        self.start = state
+        self.player_attack = state.player_attack
+        self.player_defense = state.player_defense
+        self.enemy_attack = state.enemy_attack
+        self.enemy_defense = state.enemy_defense
+        self.enemy_max_health = state.enemy_max_health
+        self.max_cooldown = state.max_cooldown
+        self.behaviour = {field: ai.TABLE.value(state.behaviour, field) for field in ai.FIELDS}
+        if self.behaviour["flee_chance"]:
+            raise ValueError("Solver nie obsługuje przeciwników, którzy uciekają z walki.")
+        self._values = {}
+
+    def _hit_player(self, health, damage):
+        reduced = damage - self.player_defense
+        return max(0, health - reduced) if reduced > 0 else health
+
+    def _successors(self, state):
+        """
+        Zwraca listę (prawdopodobieństwo, następny stan) dla jednej tury.
+        """
+        player_hp, enemy_hp, cooldown, poison_turns, potency, enemy_blocking, player_moves = state
+        if player_moves:
+            defense = self.enemy_defense * 2 if enemy_blocking else self.enemy_defense
+            reduced = self.player_attack - defense
+            if reduced > 0:
+                enemy_hp = max(0, enemy_hp - reduced)
+            if poison_turns > 0:
+                player_hp = self._hit_player(player_hp, potency)
+                poison_turns -= 1
+                if not poison_turns:
+                    potency = 0
+            return [(1.0, (player_hp, enemy_hp, cooldown, poison_turns, potency, False, False))]
+
+        after_special = max(0, self.max_cooldown - 1)
+        attacked = (self._hit_player(player_hp, self.enemy_attack), enemy_hp, max(0, cooldown - 1),
+                    poison_turns, potency, enemy_blocking, True)
+        behaviour = self.behaviour
+        if cooldown == 0:
+            chance = behaviour["special_chance"]
+            if behaviour["special"] == ai.POISON:
+                hit = behaviour["poison_chance"]
+                poisoned = (player_hp, enemy_hp, after_special, behaviour["poison_turns"],
+                            self.enemy_attack // behaviour["poison_divisor"], enemy_blocking, True)
+                dodged = (player_hp, enemy_hp, after_special, poison_turns, potency, enemy_blocking, True)
+                special = [(chance * hit, poisoned), (chance * (1 - hit), dodged)]
+            else:
+                struck = (self._hit_player(player_hp, self.enemy_attack * behaviour["strike_percent"] // 100),
+                          enemy_hp, after_special, poison_turns, potency, enemy_blocking, True)
+                special = [(chance, struck)]
+            return [edge for edge in special + [(1 - chance, attacked)] if edge[0] > 0]
+        chance = behaviour["defend_chance"]
+        if chance and behaviour["defend_divisor"] * enemy_hp < self.enemy_max_health:
+            defended = (player_hp, enemy_hp, cooldown - 1, poison_turns, potency, True, True)
+            return [edge for edge in ((chance, defended), (1 - chance, attacked)) if edge[0] > 0]
+        return [(1.0, attacked)]
+
+    def _value(self, state):
+        """Zwraca (wygrana, remis, tury, czy_może_remisować) dla stanu już rozwiązanego lub końcowego."""
+        if state[0] <= 0:
+            return 0.0, 0.0, 0.0, False
+        if state[1] <= 0:
+            return 1.0, 0.0, 0.0, False
+        return self._values.get(state)
+
+    def _closure(self, root):
+        """Zbiera nierozwiązane stany z tej samej warstwy HP osiągalne z root."""
+        layer = root[:2]
+        edges = {root: self._successors(root)}
+        queue = [root]
+        while queue:
+            for _, target in edges[queue.pop()]:
+                if target[:2] == layer and target not in edges and self._value(target) is None:
+                    edges[target] = self._successors(target)
+                    queue.append(target)
+        return edges
+
+    def _evaluate(self, root):
+        """Rozwiązuje stan root i wszystkie stany, od których zależy - bez rekurencji."""
+        stack = [root]
+        while stack:
+            state = stack[-1]
+            if self._value(state) is not None:
+                stack.pop()
+                continue
+            edges = self._closure(state)
+            pending = {target for successors in edges.values() for _, target in successors
+                       if target not in edges and self._value(target) is None}
+            if pending:
+                stack.extend(pending)
+                continue
+            self._solve_layer(edges)
+            stack.pop()
+
+    def _solve_layer(self, edges):
+        """Rozwiązuje układ równań dla cyklicznej warstwy stanów o tych samych HP."""
+        states = list(edges)
+        exits = {state for state in states
+                 if any(target not in edges for _, target in edges[state])}
+
+        predecessors = {state: [] for state in states}
+        for state in states:
+            for _, target in edges[state]:
+                if target in edges:
+                    predecessors[target].append(state)
+        can_exit = set(exits)
+        queue = list(exits)
+        while queue:
+            for source in predecessors[queue.pop()]:
+                if source not in can_exit:
+                    can_exit.add(source)
+                    queue.append(source)
+        for state in states:
+            if state not in can_exit:
+                self._values[state] = (0.0, 1.0, math.inf, True)
+
+        reaches_draw = {state for state in states if state not in can_exit}
+        for state in states:
+            if any(target not in edges and self._value(target)[3] for _, target in edges[state]):
+                reaches_draw.add(state)
+        queue = list(reaches_draw)
+        while queue:
+            for source in predecessors[queue.pop()]:
+                if source not in reaches_draw:
+                    reaches_draw.add(source)
+                    queue.append(source)
+
+        solvable = [state for state in states if state in can_exit]
+        win_draw = self._solve_linear(solvable, edges, lambda value: (value[0], value[1]), 0.0)
+        finite = [state for state in solvable if state not in reaches_draw]
+        turns = dict(zip(finite, (row[0] for row in
+                                  self._solve_linear(finite, edges, lambda value: (value[2],), 1.0))))
+        for state, (win, draw) in zip(solvable, win_draw):
+            self._values[state] = (win, draw, turns.get(state, math.inf), state in reaches_draw)
+
+    def _solve_linear(self, states, edges, project, step_cost):
+        """
+        Rozwiązuje x = Q x + b eliminacją Gaussa, gdzie Q to przejścia wewnątrz zbioru states.
+        :param project: Funkcja wybierająca z wartości stanu zewnętrznego składowe prawej strony.
+        :param step_cost: Stała dodawana w każdym równaniu (1 dla liczby tur).
+        """
+        index = {state: i for i, state in enumerate(states)}
+        size = len(states)
+        if not size:
+            return []
+        width = len(project((0.0, 0.0, 0.0, False)))
+        matrix = [[0.0] * size + [step_cost] * width for _ in range(size)]
+        for i, state in enumerate(states):
+            row = matrix[i]
+            row[i] += 1.0
+            for probability, target in edges[state]:
+                if target in index:
+                    row[index[target]] -= probability
+                else:
+                    for k, component in enumerate(project(self._value(target))):
+                        row[size + k] += probability * component
+
+        for col in range(size):
+            pivot = max(range(col, size), key=lambda r: abs(matrix[r][col]))
+            matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+            pivot_row = matrix[col]
+            factor = pivot_row[col]
+            for k in range(col, size + width):
+                pivot_row[k] /= factor
+            for r in range(size):
+                if r != col and matrix[r][col]:
+                    scale = matrix[r][col]
+                    row = matrix[r]
+                    for k in range(col, size + width):
+                        row[k] -= scale * pivot_row[k]
+        return [tuple(row[size:]) for row in matrix]
+
+    def solve(self):
+        """
+        Wylicza dokładny wynik pojedynku od stanu początkowego (rzut monetą o pierwszy ruch).
+        :return: Obiekt MatchupResult.
+        """
+        start = self.start
+        potency = start.poison_potency if start.poison_turns else 0
+        base = (start.player_health, start.enemy_health, start.cooldown, start.poison_turns, potency, False)
+        win = draw = turns = 0.0
+        for player_moves in (True, False):
+            state = base + (player_moves,)
+            self._evaluate(state)
+            state_win, state_draw, state_turns, _ = self._value(state)
+            win += 0.5 * state_win
+            draw += 0.5 * state_draw
+            turns += 0.5 * state_turns
+        return MatchupResult(win, draw, turns)
+
+
+def solve_matchup(player, enemy):
+    """
+    Zwraca dokładne prawdopodobieństwo wygranej i oczekiwaną liczbę tur walki.
+    :param player: Obiekt gracza.
+    :param enemy: Obiekt przeciwnika.
+    :return: Obiekt MatchupResult.
+    """
+    return MatchupSolver(player, enemy).solve()
+
+
+def check_against_simulator(player, enemy, fights=100000, seed=0):
+    """
+    Porównuje wynik dokładny z symulacją Monte Carlo.
+    :return: Krotka (MatchupResult, simulation.CombatStats, odchylenie w sigmach dla wygranych).
+    """
+    exact = solve_matchup(player, enemy)
+    simulated = simulation.run_fights(player, enemy, fights, seed=seed)
+    p = exact.win_probability
+    sigma = math.sqrt(p * (1 - p) / fights) if 0 < p < 1 else 0.0
+    deviation = abs(simulated.win_rate() - p) / sigma if sigma else 0.0
+    return exact, simulated, deviation
@@ -0,0 +1,101 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+import characters
+import events
+import simulation
+import world
+
+EQUIPMENT_PRESETS = {
+    "brak": (None, None),
+    "zardzewialy": ("rusty_sword", "tattered_clothes"),
+    "krotki_miecz": ("short_sword", "leather_armor"),
+    "luk": ("long_bow", "leather_armor"),
+}
+
+_enemy_cache = {}
+
+
+def build_player(level=1, equipment="brak"):
+    """
+    Tworzy gracza na zadanym poziomie (Player.at_level) z wybranym zestawem ekwipunku.
+    :param level: Docelowy poziom gracza.
+    :param equipment: Klucz z EQUIPMENT_PRESETS.
+    :return: Obiekt characters.Player.
+    """
+    if equipment not in EQUIPMENT_PRESETS:
+        raise ValueError(f"Nieznany zestaw ekwipunku: '{equipment}'.")
+    with events.muted():
+        player = characters.Player.at_level("Symulant", level, health=100, attack_power=10, defense_power=3)
+        for item_attr in EQUIPMENT_PRESETS[equipment]:
+            if item_attr is not None:
+                item = copy.deepcopy(getattr(world, item_attr))
+                player.add_item_to_inventory(item)
+                player.equip_item(item.name)
+    return player
+
+
+def _enemy(name):
+    """Zwraca szablon przeciwnika o podanej nazwie (buforowany osobno w każdym procesie)."""
+    if not _enemy_cache:
+        for enemy in simulation.enemy_templates():
+            _enemy_cache[enemy.name] = enemy
+    return _enemy_cache[name]
+
+
+def _run_chunk(task):
+    """
+    Rozgrywa jeden fragment komórki siatki. Ziarno zależy tylko od komórki i numeru fragmentu,
+    więc wynik nie zależy od liczby procesów ani kolejności wykonania.
+    """
+    cell, chunk_index, fights, base_seed, policy = task
+    enemy_name, level, equipment = cell
+    seed = f"{base_seed}:{enemy_name}:{level}:{equipment}:{chunk_index}"
+    return cell, simulation.run_fights(build_player(level, equipment), _enemy(enemy_name), fights,
+                                       seed=seed, policy=policy)
+
+
+def _tasks(cells, fights, chunk_size, base_seed, policy):
+    for cell in cells:
+        for chunk_index, start in enumerate(range(0, fights, chunk_size)):
+            yield cell, chunk_index, min(chunk_size, fights - start), base_seed, policy
+
+
+def run_sweep(enemies=None, levels=range(1, 21), equipment=("brak",), fights=1000,
+              workers=None, chunk_size=1000, seed=0, policy=None):
+    """
+    Przeprowadza symulacje Monte Carlo dla całej siatki (przeciwnik, poziom, ekwipunek).
+    :param enemies: Nazwy przeciwników; domyślnie wszyscy z world.py.
+    :param levels: Poziomy gracza.
+    :param equipment: Klucze zestawów z EQUIPMENT_PRESETS.
+    :param fights: Liczba walk na komórkę siatki.
+    :param workers: Liczba procesów; 0 oznacza liczenie w bieżącym procesie.
+    :param chunk_size: Liczba walk w jednym zadaniu. Wpływa na strumienie losowe, liczba procesów - nie.
+    :param seed: Ziarno bazowe.
+    :param policy: Polityka gracza - funkcja zdefiniowana na poziomie modułu (musi dać się zserializować).
+    :return: Słownik {(przeciwnik, poziom, ekwipunek): simulation.CombatStats}.
+    """
+    if enemies is None:
+        enemies = [enemy.name for enemy in simulation.enemy_templates()]
+    cells = [(enemy_name, level, preset) for enemy_name in enemies for level in levels for preset in equipment]
+    results = {cell: simulation.CombatStats(cell[0]) for cell in cells}
+    tasks = _tasks(cells, fights, chunk_size, seed, policy)
+
+    if workers == 0:
+        partials = map(_run_chunk, tasks)
+        for cell, stats in partials:
+            results[cell].merge(stats)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for cell, stats in executor.map(_run_chunk, tasks, chunksize=4):
+            results[cell].merge(stats)
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    for (enemy_name, level, preset), cell_stats in run_sweep(workers=worker_count).items():
+        print(f"poziom {level:2d} [{preset}] {cell_stats}")
@@ -0,0 +1,115 @@
+import math
+
+import events
+from inventory import name_key
+
+# Handlarz odkupuje przedmioty za ułamek swojej ceny sprzedaży.
+SELL_RATIO = 0.5
+# Każda sztuka, którą handlarz ma w nadmiarze (odkupiona od graczy), obniża cenę o ok. 10%,
+# a każda sprzedana ponad podaż - podnosi; cena nie wychodzi poza MIN_FACTOR-MAX_FACTOR wartości przedmiotu.
+ELASTICITY = 0.1
+MIN_FACTOR = 0.25
+MAX_FACTOR = 4.0
+
+
+def price_factor(supply):
+    """
+    Mnożnik ceny przy danej podaży przedmiotu u handlarza (sztuki odkupione minus sprzedane).
+    :return: (1 + ELASTICITY) ** -supply ograniczone do MIN_FACTOR-MAX_FACTOR.
+    """
+    return min(MAX_FACTOR, max(MIN_FACTOR, (1 + ELASTICITY) ** -supply))
+
+
+def buy_price(npc, item):
+    """Cena, za którą handlarz sprzedaje przedmiot (co najmniej 1 złoto)."""
+    return max(1, math.ceil(item.value * price_factor(npc.supply.get(item.name, 0))))
+
+
+def sell_price(npc, item):
+    """Cena, za którą handlarz odkupuje przedmiot od gracza."""
+    return int(item.value * price_factor(npc.supply.get(item.name, 0)) * SELL_RATIO)
+
+
+def _change_supply(npc, item, amount):
+    npc.supply[item.name] = npc.supply.get(item.name, 0) + amount
+
+
+def traders(location):
+    """NPC z lokalizacji, którzy handlują (mają towary na sprzedaż)."""
+    return [npc for npc in location.npcs if npc.trade_items]
+
+
+def find_ware(location, item_name):
+    """
+    Szuka handlarza, który sprzedaje przedmiot o podanej nazwie.
+    :return: Krotka (NPC, szablon przedmiotu) albo (None, None).
+    """
+    key = name_key(item_name)
+    for npc in traders(location):
+        for item in npc.trade_items:
+            if name_key(item.name) == key:
+                return npc, item
+    return None, None
+
+
+def show_wares(npc):
+    """Wypisuje towary handlarza z aktualnymi cenami."""
+    events.emit("trade_wares", "{name} ma na sprzedaż:", name=npc.name)
+    for number, item in enumerate(npc.trade_items, 1):
+        events.emit("trade_wares", "  {number}. {item} (Cena: {price} Złota)",
+                    number=number, item=item.name, price=buy_price(npc, item))
+
+
+def buy(player, location, item_name):
+    """
+    Kupuje przedmiot od handlarza z lokalizacji. Handlarz sprzedaje nowy egzemplarz swojego towaru,
+    a każdy zakup podnosi jego cenę.
+    :param player: Obiekt gracza.
+    :param location: Lokalizacja gracza (towary bierzemy od NPC przejętego przez claim_npc).
+    :param item_name: Nazwa przedmiotu.
+    :return: Kupiony przedmiot albo None.
+    """
+    npc, ware = find_ware(location, item_name)
+    if npc is None:
+        events.emit("trade_missing", "Nikt tu nie sprzedaje przedmiotu '{item_name}'.", item_name=item_name)
+        return None
+    npc = location.claim_npc(npc)
+    price = buy_price(npc, ware)
+    if player.gold < price:
+        events.emit("trade_failed", "Nie stać Cię na {item} (Cena: {price} Złota, masz {gold}).",
+                    item=ware.name, price=price, gold=player.gold)
+        return None
+    player.gold -= price
+    _change_supply(npc, ware, -1)
+    item = ware.spawn()
+    events.emit("trade_bought", "Kupujesz {item} od {name} za {price} złota.", item=item.name, name=npc.name,
+                price=price)
+    player.add_item_to_inventory(item)
+    return item
+
+
+def sell(player, location, item_name):
+    """
+    Sprzedaje przedmiot z ekwipunku pierwszemu handlarzowi w lokalizacji. Każda odkupiona sztuka
+    obniża cenę tego przedmiotu u handlarza.
+    :return: Uzyskane złoto albo None, jeśli transakcja się nie odbyła.
+    """
+    available = traders(location)
+    if not available:
+        events.emit("trade_missing", "Nie ma tu nikogo, kto kupiłby Twoje przedmioty.")
+        return None
+    item = player.inventory.find(item_name)
+    if item is None:
+        events.emit("item_missing", "Nie masz przedmiotu o nazwie '{item_name}'.", item_name=item_name)
+        return None
+    npc = location.claim_npc(available[0])
+    price = sell_price(npc, item)
+    if price <= 0:
+        events.emit("trade_failed", "{name} nie da Ci nic za {item}.", name=npc.name, item=item.name)
+        return None
+    player.remove_item_from_inventory(item.name)
+    player.gold += price
+    _change_supply(npc, item, 1)
+    events.emit("trade_sold", "Sprzedajesz {item} za {price} złota. Masz teraz {gold} złota.",
+                item=item.name, price=price, gold=player.gold)
+    return price
@@ -0,0 +1,177 @@
+import numpy as np
+
+import ai
+import simulation
+
+_COLUMNS = (
+    "player_health", "player_max_health", "player_attack", "player_defense",
+    "poison_turns", "poison_potency",
+    "enemy_health", "enemy_max_health", "enemy_attack", "enemy_defense",
+    "cooldown", "max_cooldown",
+)
+
+
+class VectorFights:
+    """
+    Silnik walk w układzie "struktura tablic": każda kolumna stanu to tablica NumPy o długości N,
+    a jeden krok przesuwa wszystkie N walk o jedną turę.
+    Gracz zawsze atakuje (odpowiednik simulation.always_attack).
+    """
+    def __init__(self, states, seed=None, copies=1):
+        """
+        Buduje kolumny stanu z listy szablonów walk.
+        :param states: Lista obiektów simulation.FightState.
+        :param seed: Ziarno generatora NumPy.
+        :param copies: Ile walk utworzyć z każdego szablonu.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.size = len(states) * copies
+        for column in _COLUMNS:
+            values = np.array([getattr(state, column) for state in states], dtype=np.int64)
+            setattr(self, column, np.repeat(values, copies))
+        self.behaviour = np.repeat(np.array([state.behaviour for state in states], dtype=np.int64), copies)
+        self.table = {field: np.array(column) for field, column in ai.TABLE.columns.items()}
+        self.fled = np.zeros(self.size, dtype=bool)
+        self.player_blocking = np.zeros(self.size, dtype=bool)
+        self.enemy_blocking = np.zeros(self.size, dtype=bool)
+        self.turns = np.zeros(self.size, dtype=np.int64)
+        self.player_moves = self.rng.random(self.size) >= 0.5
+
+    @classmethod
+    def repeat(cls, player, enemy, fights, seed=None):
+        """
+        Tworzy N jednakowych walk gracza z przeciwnikiem.
+        :param player: Obiekt gracza.
+        :param enemy: Obiekt przeciwnika.
+        :param fights: Liczba walk.
+        :param seed: Ziarno generatora NumPy.
+        """
+        return cls([simulation.FightState(player, enemy)], seed=seed, copies=fights)
+
+    def step(self, active):
+        """
+        Rozgrywa jedną turę w każdej z aktywnych walk o podanych indeksach.
+        :param active: Tablica indeksów walk, które jeszcze trwają.
+        """
+        moves = self.player_moves[active]
+        player_side = active[moves]
+        enemy_side = active[~moves]
+        self._player_step(player_side)
+        self._enemy_step(enemy_side)
+        self.turns[active] += 1
+        self.player_moves[active] = ~moves
+
+    def _player_step(self, idx):
+        """Atak gracza oraz tyknięcie trucizny na koniec jego tury."""
+        defense = self.enemy_defense[idx] << self.enemy_blocking[idx]
+        damage = np.maximum(0, self.player_attack[idx] - defense)
+        self.enemy_health[idx] = np.maximum(0, self.enemy_health[idx] - damage)
+        self.enemy_blocking[idx] = False
+
+        poisoned = idx[self.poison_turns[idx] > 0]
+        defense = self.player_defense[poisoned] << self.player_blocking[poisoned]
+        damage = np.maximum(0, self.poison_potency[poisoned] - defense)
+        self.player_health[poisoned] = np.maximum(0, self.player_health[poisoned] - damage)
+        self.player_blocking[poisoned] = False
+        self.poison_turns[poisoned] -= 1
+
+    def _enemy_step(self, idx):
+        """
+        Decyzje przeciwników (atak, cios specjalny, jad, obrona, ucieczka) według kolumn tabeli zachowań
+        wybranych dla całej grupy walk naraz, i tyknięcie czasu odnowienia.
+        """
+        count = len(idx)
+        table = self.table
+        rows = self.behaviour[idx]
+        health = self.enemy_health[idx]
+        max_health = self.enemy_max_health[idx]
+        cooldown = self.cooldown[idx]
+        fled = np.zeros(count, dtype=bool)
+        if table["flee_chance"].any():
+            fled = ((health * table["flee_divisor"][rows] < max_health)
+                    & (self.rng.random(count) < table["flee_chance"][rows]))
+            self.fled[idx[fled]] = True
+        ready = (cooldown == 0) & ~fled
+        special = ready & (self.rng.random(count) < table["special_chance"][rows])
+        spit = special & (table["special"][rows] == ai.POISON)
+        hit = spit & (self.rng.random(count) < table["poison_chance"][rows])
+        poisoned = idx[hit]
+        poisoned_rows = rows[hit]
+        self.poison_turns[poisoned] = table["poison_turns"][poisoned_rows]
+        self.poison_potency[poisoned] = self.enemy_attack[poisoned] // table["poison_divisor"][poisoned_rows]
+
+        low = health * table["defend_divisor"][rows] < max_health
+        defend = (cooldown > 0) & ~fled & low & (self.rng.random(count) < table["defend_chance"][rows])
+        self.enemy_blocking[idx[defend]] = True
+
+        attack = self.enemy_attack[idx]
+        raw_damage = np.where(special, attack * table["strike_percent"][rows] // 100, attack)
+        hits = ~(spit | defend | fled)
+        hit_idx = idx[hits]
+        defense = self.player_defense[hit_idx] << self.player_blocking[hit_idx]
+        damage = np.maximum(0, raw_damage[hits] - defense)
+        self.player_health[hit_idx] = np.maximum(0, self.player_health[hit_idx] - damage)
+        self.player_blocking[hit_idx] = False
+
+        cooldown = np.where(special, self.max_cooldown[idx], cooldown)
+        self.cooldown[idx] = np.maximum(0, cooldown - 1)
+
+    def run(self, max_turns=simulation.MAX_TURNS):
+        """
+        Prowadzi wszystkie walki do końca (albo do limitu tur).
+        :param max_turns: Limit tur jednej walki.
+        :return: Tablica wyników: 1 = wygrana gracza, -1 = porażka, 2 = ucieczka przeciwnika, 0 = remis.
+        """
+        active = np.arange(self.size)
+        for _ in range(max_turns):
+            if not len(active):
+                break
+            self.step(active)
+            alive = (self.player_health[active] > 0) & (self.enemy_health[active] > 0) & ~self.fled[active]
+            active = active[alive]
+        return self.outcomes()
+
+    def outcomes(self):
+        """
+        Zwraca tablicę wyników: 1 = wygrana gracza, -1 = porażka, 2 = ucieczka przeciwnika,
+        0 = walka nierozstrzygnięta.
+        """
+        result = np.zeros(self.size, dtype=np.int8)
+        result[self.fled] = 2
+        result[(self.player_health > 0) & (self.enemy_health == 0)] = 1
+        result[self.player_health == 0] = -1
+        return result
+
+    def to_stats(self, enemy_name=""):
+        """
+        Przelicza wyniki do postaci simulation.CombatStats, żeby porównać je z silnikiem obiektowym.
+        :param enemy_name: Nazwa przeciwnika w podsumowaniu.
+        """
+        stats = simulation.CombatStats(enemy_name)
+        outcomes = self.outcomes()
+        stats.fights = self.size
+        for code, name in ((1, simulation.VICTORY), (-1, simulation.DEFEAT), (2, simulation.FLED),
+                           (0, simulation.DRAW)):
+            count = int(np.count_nonzero(outcomes == code))
+            if count:
+                stats.outcomes[name] = count
+        stats.turn_histogram.update(_histogram(self.turns))
+        stats.player_hp_histogram.update(_histogram(self.player_health[outcomes == 1]))
+        stats.enemy_hp_histogram.update(_histogram(self.enemy_health[outcomes == -1]))
+        return stats
+
+
+def _histogram(values):
+    """Zamienia tablicę liczb na słownik {wartość: liczność}."""
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def run_fights(player, enemy, fights, seed=None, max_turns=simulation.MAX_TURNS):
+    """
+    Wektorowy odpowiednik simulation.run_fights dla polityki "zawsze atak".
+    :return: Obiekt simulation.CombatStats.
+    """
+    engine = VectorFights.repeat(player, enemy, fights, seed=seed)
+    engine.run(max_turns)
+    return engine.to_stats(enemy.name)
@@ -1,6 +1,16 @@
 
+import copy
+import os
+from collections.abc import Mapping
+
 import items 
 import characters 
+import events
+import loot
+import trade
+from content import load_pack
+
+
 class Location:
     """
     Klasa reprezentująca lokalizacji w świecie gry.
@@ -39,59 +49,78 @@ class Location:
         """
         Wyświetla pełny opis lokalizacji, w tym wyjścia, przeciwników, przedmioty i NPC.
         """
-        print(f"--- {self.name} ---")
-        print(self.description)
+        events.emit("describe", "--- {name} ---", name=self.name)
+        events.emit("describe", "{text}", text=self.description)
         if not self.visited:
-            print("Wygląda na to, że jesteś tu po raz pierwszy.")
+            events.emit("describe", "Wygląda na to, że jesteś tu po raz pierwszy.")
             self.visited = True 
         else:
-            print("Byłeś/aś już tutaj.")
+            events.emit("describe", "Byłeś/aś już tutaj.")
 
         if self.items_in_location:
-            print("Widzisz tu następujące przedmioty:")
+            events.emit("describe", "Widzisz tu następujące przedmioty:")
             for item_obj in self.items_in_location:
-                print(f"- {item_obj.name}")
+                events.emit("describe", "- {item_obj}", item_obj=item_obj.name)
         
         if self.enemies:
-            print("W tej lokalizacji czają się wrogowie:")
+            events.emit("describe", "W tej lokalizacji czają się wrogowie:")
             for enemy_obj in self.enemies:
-                print(f"- {enemy_obj.name} ({enemy_obj.current_health}/{enemy_obj.max_health} HP)")
+                events.emit("describe", "- {enemy_obj} ({current_health}/{max_health} HP)",
+                            enemy_obj=enemy_obj.name, current_health=enemy_obj.current_health, max_health=enemy_obj.max_health)
         
         if self.npcs:
-            print("Spotykasz tu następujące postacie:")
+            events.emit("describe", "Spotykasz tu następujące postacie:")
             for npc_obj in self.npcs:
-                print(f"- {npc_obj.name}")
+                events.emit("describe", "- {npc_obj}", npc_obj=npc_obj.name)
 
         if self.exits:
-            print("Dostępne wyjścia:")
+            events.emit("describe", "Dostępne wyjścia:")
             for direction, destination_name in self.exits.items():
-                print(f"- {direction.capitalize()}: do {destination_name}")
+                events.emit("describe", "- {direction}: do {destination_name}",
+                            direction=direction.capitalize(), destination_name=destination_name)
         else:
-            print("Nie ma stąd żadnych widocznych wyjść.")
-        print("--------------------")
+            events.emit("describe", "Nie ma stąd żadnych widocznych wyjść.")
+        events.emit("describe", "--------------------")
 
     def add_enemy(self, enemy):
         """Dodaje przeciwnika do lokalizacji."""
         if isinstance(enemy, characters.Enemy):
             self.enemies.append(enemy)
         else:
-            print("Błąd: Można dodać tylko instancję klasy Enemy.")
+            events.emit("invalid_value", "Błąd: Można dodać tylko instancję klasy Enemy.")
 
     def remove_enemy(self, enemy):
         """Usuwa przeciwnika z lokalizacji (np. po pokonaniu)."""
         if enemy in self.enemies:
             self.enemies.remove(enemy)
-            print(f"{enemy.name} został usunięty z lokalizacji {self.name}.")
+            events.emit("enemy_removed", "{enemy} został usunięty z lokalizacji {name}.",
+                        enemy=enemy.name, name=self.name)
         else:
-            print(f"{enemy.name} nie znajduje się w lokalizacji {self.name}.")
+            events.emit("enemy_missing", "{enemy} nie znajduje się w lokalizacji {name}.",
+                        enemy=enemy.name, name=self.name)
             
     def add_item(self, item):
         """Dodaje przedmiot do lokalizacji."""
         if isinstance(item, items.Item):
             self.items_in_location.append(item)
         else:
-            print("Błąd: Można dodać tylko instancję klasy Item.")
+            events.emit("invalid_value", "Błąd: Można dodać tylko instancję klasy Item.")
             
+    def claim_enemy(self, enemy):
+        """
+        Zwraca przeciwnika z tej lokalizacji, na którym można prowadzić walkę.
+        W zwykłej lokalizacji to ten sam obiekt; LocationInstance zwraca kopię należącą do sesji.
+        """
+        return enemy
+
+    def claim_enemies(self):
+        """Zwraca wszystkich żywych przeciwników lokalizacji gotowych do wspólnej walki (zob. claim_enemy)."""
+        return [self.claim_enemy(enemy) for enemy in self.enemies if enemy.is_alive()]
+
+    def claim_npc(self, npc):
+        """Zwraca NPC z tej lokalizacji, którego stan (np. licznik rozmów) można zmieniać."""
+        return npc
+
     def remove_item(self, item_name):
         """Usuwa przedmiot z lokalizacji (np. po podniesieniu przez gracza)."""
         item_to_remove = None
@@ -101,13 +130,150 @@ class Location:
                 break
         if item_to_remove:
             self.items_in_location.remove(item_to_remove)
-            print(f"Przedmiot {item_to_remove.name} został usunięty z lokalizacji {self.name}.")
+            events.emit("item_removed", "Przedmiot {item_to_remove} został usunięty z lokalizacji {name}.",
+                        item_to_remove=item_to_remove.name, name=self.name)
             return item_to_remove
         else:
-            print(f"Przedmiot '{item_name}' nie znajduje się w lokalizacji {self.name}.")
+            events.emit("item_missing", "Przedmiot '{item_name}' nie znajduje się w lokalizacji {name}.",
+                        item_name=item_name, name=self.name)
             return None
 
 
+class LocationInstance(Location):
+    """
+    Lokalizacja jednej sesji gry nałożona na współdzielony szablon (kopiowanie przy zapisie).
+    Dopóki sesja niczego nie zmieni, przeciwnicy, przedmioty i NPC są czytani z szablonu;
+    pierwsza zmiana tworzy małą, prywatną nakładkę z kopiami obiektów.
+    """
+    def __init__(self, template):
+        """
+        :param template: Obiekt Location z szablonu świata (nie jest modyfikowany).
+        """
+        self.template = template
+        self._visited = False
+        self._enemies = None
+        self._items = None
+        self._npcs = None
+        self.changed = False
+
+    @property
+    def visited(self):
+        return self._visited
+
+    @visited.setter
+    def visited(self, value):
+        self._visited = value
+        self.changed = True
+
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def description(self):
+        return self.template.description
+
+    @property
+    def exits(self):
+        return self.template.exits
+
+    @property
+    def enemies(self):
+        return self._enemies if self._enemies is not None else self.template.enemies
+
+    @property
+    def items_in_location(self):
+        return self._items if self._items is not None else self.template.items_in_location
+
+    @property
+    def npcs(self):
+        return self._npcs if self._npcs is not None else self.template.npcs
+
+    def is_modified(self):
+        """Sprawdza, czy sesja utworzyła już własną nakładkę na szablon."""
+        return self.visited or self._enemies is not None or self._items is not None or self._npcs is not None
+
+    def _own_enemies(self):
+        if self._enemies is None:
+            self._enemies = [enemy.spawn() for enemy in self.template.enemies]
+        return self._enemies
+
+    def _own_items(self):
+        if self._items is None:
+            self._items = [item.spawn() for item in self.template.items_in_location]
+        return self._items
+
+    def _own_npcs(self):
+        if self._npcs is None:
+            self._npcs = [npc.spawn() for npc in self.template.npcs]
+        return self._npcs
+
+    def claim_enemy(self, enemy):
+        self.changed = True
+        if self._enemies is None:
+            for index, template_enemy in enumerate(self.template.enemies):
+                if template_enemy is enemy:
+                    return self._own_enemies()[index]
+        return enemy
+
+    def claim_enemies(self):
+        self.changed = True
+        return [enemy for enemy in self._own_enemies() if enemy.is_alive()]
+
+    def claim_npc(self, npc):
+        self.changed = True
+        if self._npcs is None:
+            for index, template_npc in enumerate(self.template.npcs):
+                if template_npc is npc:
+                    return self._own_npcs()[index]
+        return npc
+
+    def add_enemy(self, enemy):
+        self._own_enemies()
+        super().add_enemy(enemy)
+
+    def remove_enemy(self, enemy):
+        super().remove_enemy(self.claim_enemy(enemy))
+
+    def add_item(self, item):
+        self._own_items()
+        self.changed = True
+        super().add_item(item)
+
+    def remove_item(self, item_name):
+        self._own_items()
+        self.changed = True
+        return super().remove_item(item_name)
+
+    def overlay(self):
+        """
+        Zwraca nakładkę sesji na szablon: (visited, przeciwnicy, przedmioty, NPC).
+        Listy, których sesja nie zmieniła, są zwracane jako None.
+        """
+        return self._visited, self._enemies, self._items, self._npcs
+
+    def restore(self, visited, enemies=None, items_in_location=None, npc_interactions=None):
+        """
+        Odtwarza nakładkę sesji (np. po wczytaniu zapisu gry).
+        :param enemies: Lista przeciwników lub None, jeśli mają pochodzić z szablonu.
+        :param items_in_location: Lista przedmiotów lub None.
+        :param npc_interactions: Stan NPC w kolejności z szablonu: pary (licznik rozmów, podaż handlarza)
+                                 albo same liczniki rozmów (starsze zapisy); None - NPC z szablonu.
+        """
+        self._visited = visited
+        self._enemies = enemies
+        self._items = items_in_location
+        self._npcs = None
+        if npc_interactions is not None:
+            for npc, state in zip(self._own_npcs(), npc_interactions):
+                if isinstance(state, int):
+                    npc.interaction_count = state
+                else:
+                    npc.interaction_count, supply = state
+                    npc.supply = dict(supply)
+        self.changed = False
+
+
 class NPC(characters.Character):
     """
     Klasa reprezentująca postać niezależną (NPC).
@@ -120,147 +286,290 @@ class NPC(characters.Character):
         self.quests_available = quests if quests is not None else [] 
         self.trade_items = trades if trades is not None else [] 
         self.interaction_count = 0
+        self.supply = {}  # nazwa przedmiotu -> sztuki odkupione od graczy minus sprzedane (ceny w trade.py)
+
+    def spawn(self):
+        """Zwraca kopię NPC z własnym stanem rozmów i handlu (szablon pozostaje niezmieniony)."""
+        npc = copy.copy(self)
+        npc.supply = dict(self.supply)
+        return npc
 
     def talk(self):
         """
         Rozpoczyna dialog z NPC.
         """
-        print(f"--- Rozmowa z {self.name} ---")
-        print(f"{self.name}: {self.description}")
+        events.emit("talk", "--- Rozmowa z {name} ---", name=self.name)
+        events.emit("talk", "{name}: {description}", name=self.name, description=self.description)
         if self.dialogue_options:
             
             current_dialogue = self.dialogue_options[self.interaction_count % len(self.dialogue_options)]
-            print(f"{self.name} mówi: \"{current_dialogue}\"")
+            events.emit("talk", '{name} mówi: "{current_dialogue}"',
+                        name=self.name, current_dialogue=current_dialogue)
         else:
-            print(f"{self.name} nie ma nic do powiedzenia.")
+            events.emit("talk", "{name} nie ma nic do powiedzenia.", name=self.name)
         
         if self.quests_available:
-            print(f"{self.name} może mieć dla Ciebie zadanie:")
+            events.emit("talk", "{name} może mieć dla Ciebie zadanie:", name=self.name)
             for quest in self.quests_available:
                 
-                print(f"- {quest.name}: {quest.description}")
+                events.emit("talk", "- {quest}: {description}",
+                            quest=quest.name, description=quest.description)
         
         if self.trade_items:
-            print(f"{self.name} ma na sprzedaż:")
+            events.emit("talk", "{name} ma na sprzedaż:", name=self.name)
             for i, item in enumerate(self.trade_items):
-                print(f"  {i+1}. {item.name} (Cena: {item.value} Złota)")
+                events.emit("talk", "  {number}. {item} (Cena: {value} Złota)",
+                            number=i + 1, item=item.name, value=trade.buy_price(self, item))
         
         self.interaction_count += 1
-        print("--------------------------")
+        events.emit("talk", "--------------------------")
         
 
-rusty_sword = items.Weapon("Zardzewiały Miecz", "Ledwo trzyma się kupy.", 5, "melee", 5)
-rusty_sword.durability = 30
-short_sword = items.Weapon("Krótki Miecz", "Prosty, ale niezawodny krótki miecz.", 10, "melee", 15)
-long_bow = items.Weapon("Długi Łuk", "Łuk wymagający siły i wprawy.", 12, "ranged", 25)
-long_bow.rarity = "uncommon"
-magic_staff = items.Weapon("Magiczna Laska", "Laska emanująca słabą energią magiczną.", 8, "magic", 30)
-magic_staff.is_magical = True
-magic_staff.rarity = "uncommon"
-goblin_axe = items.Weapon("Toporek Goblina", "Mały, prymitywny toporek.", 6, "melee", 7)
-
-tattered_clothes = items.Armor("Podarte Ubranie", "Niewiele lepsze niż nic.", 1, "torso", 1)
-tattered_clothes.condition = "damaged"
-leather_armor = items.Armor("Skórzana Zbroja", "Lekka zbroja zapewniająca podstawową ochronę.", 5, "torso", 20)
-iron_helmet = items.Armor("Żelazny Hełm", "Solidny hełm chroniący głowę.", 3, "head", 10)
-wooden_shield = items.Armor("Drewniana Tarcza", "Prosta tarcza do blokowania ciosów.", 4, "shield", 12)
-wooden_shield.condition = "used"
-wooden_shield.rarity = "common"
-
-
-lesser_healing_potion = items.Potion("Mniejsza Mikstura Leczenia", "Przywraca 25 punktów zdrowia.", "heal", 25, 10)
-healing_potion = items.Potion("Mikstura Leczenia", "Przywraca 50 punktów zdrowia.", "heal", 50, 25)
-healing_potion.rarity = "uncommon"
-mana_potion = items.Potion("Mikstura Many", "Odnawia 20 punktów many.", "mana_restore", 20, 15)
-mana_potion.rarity = "uncommon"
-strength_elixir = items.Potion("Eliksir Siły", "Tymczasowo zwiększa siłę o 5.", "strength_boost", 5, 30)
-strength_elixir.is_magical = True
-strength_elixir.rarity = "rare"
-strength_elixir.sips_left = 2
-
-goblin_scout = characters.Enemy("Goblin Zwiadowca", 30, 8, 2, 10, 5, [goblin_axe, lesser_healing_potion]) 
-goblin_warrior = characters.Enemy("Goblin Wojownik", 45, 10, 3, 15, 8, [short_sword, items.Potion("Słaba Mikstura Obrony", "Zwiększa obronę o 2", "defense_boost", 2, 7)])
-goblin_warrior.max_cooldown = 2 
-orc_brute = characters.Enemy("Ork Brutal", 80, 15, 5, 30, 20, [items.Weapon("Ciężka Maczuga", "Ogromna, drewniana maczuga.", 13, "melee", 18)])
-orc_brute.base_attack_power = 15 
-orc_brute.max_cooldown = 4
-forest_spider = characters.Enemy("Leśny Pająk", 25, 12, 1, 8, 3, [items.Item("Jad Pająka", "Składnik alchemiczny.", 5)])
-forest_spider.special_ability_description = "Pluje jadem, który może zatruć." 
-old_man_hermit = NPC(
-    name="Stary Pustelnik",
-    health=50,
-    description="Mężczyzna o pooranej zmarszczkami twarzy i długiej, siwej brodzie. Patrzy na Ciebie przenikliwie.",
-    dialogue=[
-        "Witaj, młody wędrowcze. Czego szukasz w tych dzikich ostępach?",
-        "Świat jest pełen niebezpieczeństw, ale i skarbów dla odważnych.",
-        "Pamiętaj, by zawsze mieć oczy szeroko otwarte.",
-        "Słyszałem o pradawnym artefakcie ukrytym gdzieś w tych ruinach..."
-    ],
-    trades=[healing_potion, mana_potion] 
-)
+class ContentLocations(Mapping):
+    """
+    Lokalizacje z paczki zawartości (content.ContentPack) widziane jako słownik {nazwa: Location}.
+    Obiekty Location, przedmioty, przeciwnicy i NPC powstają dopiero przy pierwszym odwołaniu.
+    """
+    def __init__(self, pack):
+        """
+        :param pack: Otwarta paczka zawartości.
+        """
+        self.pack = pack
+        self._items = {}
+        self._enemies = {}
+        self._npcs = {}
+
+    def __getitem__(self, name):
+        record = self.pack.location_record(name)
+        return Location(
+            name=record["name"],
+            description=record["description"],
+            exits=record.get("exits"),
+            enemies=[self.enemy(enemy_id) for enemy_id in record.get("enemies", ())],
+            items_in_location=[self.item(item_id) for item_id in record.get("items", ())],
+            npcs=[self.npc(npc_id) for npc_id in record.get("npcs", ())],
+        )
+
+    def __contains__(self, name):
+        return name in self.pack
+
+    def __iter__(self):
+        return iter(self.pack)
+
+    def __len__(self):
+        return len(self.pack)
+
+    def exits_of(self, name):
+        """Zwraca wyjścia lokalizacji prosto z rekordu paczki, bez tworzenia obiektu Location."""
+        return self.pack.location_record(name).get("exits", {})
+
+    def item(self, item_id):
+        """Zwraca szablon przedmiotu o podanym identyfikatorze z paczki."""
+        item = self._items.get(item_id)
+        if item is None:
+            record = dict(self.pack.items[item_id])
+            kind = record.pop("kind")
+            rarity = record.pop("rarity", None)
+            is_magical = record.pop("is_magical", False)
+            state = record.pop("state", {})
+            item = items.ITEM_CLASSES[kind](**record)
+            if rarity is not None:
+                item.rarity = rarity
+            if is_magical:
+                item.is_magical = True
+            for field, value in state.items():
+                setattr(item, field, value)
+            self._items[item_id] = item
+        return item
+
+    def enemy(self, enemy_id):
+        """Zwraca szablon przeciwnika o podanym identyfikatorze z paczki."""
+        enemy = self._enemies.get(enemy_id)
+        if enemy is None:
+            record = self.pack.enemies[enemy_id]
+            drops = record.get("loot", ())
+            if isinstance(drops, dict):
+                table = self.loot_table(drops)
+                loot_items = table.items
+            else:
+                table = None
+                loot_items = [self.item(item_id) for item_id in drops]
+            enemy = characters.Enemy(record["name"], record["health"], record["attack_power"],
+                                     record["defense_power"], record["experience_reward"], record["gold_reward"],
+                                     loot_items)
+            if table is not None:
+                enemy.loot_weights = list(table.weights)
+                enemy.loot_rolls = table.rolls
+                enemy.loot_empty_weight = table.empty_weight
+            for attribute, value in record.get("attributes", {}).items():
+                setattr(enemy, attribute, value)
+            self._enemies[enemy_id] = enemy
+        return enemy
+
+    def loot_table(self, record):
+        """
+        Buduje tabelę łupów z rekordu paczki: {"items": [...], "weights": {id: waga}, "rolls": n, "empty": waga}.
+        Przedmioty bez wagi dostają wagę swojej rzadkości (loot.RARITY_WEIGHTS).
+        """
+        weights = record.get("weights", {})
+        item_ids = record["items"]
+        for item_id in weights:
+            if item_id not in item_ids:
+                raise ValueError(f"Waga łupu '{item_id}' dotyczy przedmiotu spoza tabeli.")
+        return loot.LootTable([self.item(item_id) for item_id in item_ids],
+                              [weights.get(item_id) for item_id in item_ids],
+                              record.get("rolls", 1), record.get("empty", 0))
+
+    def npc(self, npc_id):
+        """Zwraca szablon NPC o podanym identyfikatorze z paczki."""
+        npc = self._npcs.get(npc_id)
+        if npc is None:
+            record = self.pack.npcs[npc_id]
+            npc = NPC(record["name"], record["health"], record["description"], record.get("dialogue"),
+                      trades=[self.item(item_id) for item_id in record.get("trades", ())])
+            self._npcs[npc_id] = npc
+        return npc
+
+
+class WorldTemplate:
+    """
+    Niezmienny szablon świata współdzielony przez wszystkie sesje.
+    Lokalizacje są pobierane ze źródła przy pierwszym odwołaniu, a ich listy przeciwników,
+    przedmiotów i NPC zamrażane do krotek.
+    """
+    def __init__(self, locations, start=None):
+        """
+        :param locations: Słownik {nazwa: Location} albo ContentLocations (lokalizacje tworzone na żądanie).
+        :param start: Nazwa lokalizacji startowej.
+        """
+        self.locations = locations
+        self.start = start
+        self._frozen = {}
+
+    def location(self, name):
+        """
+        Zwraca zamrożoną lokalizację szablonu, tworząc ją przy pierwszym odwołaniu.
+        :raises KeyError: Jeśli świat nie ma lokalizacji o tej nazwie.
+        """
+        location = self._frozen.get(name)
+        if location is None:
+            location = self.locations[name]
+            location.enemies = tuple(location.enemies)
+            location.items_in_location = tuple(location.items_in_location)
+            location.npcs = tuple(location.npcs)
+            self._frozen[name] = location
+        return location
+
+    def loaded_count(self):
+        """Zwraca liczbę lokalizacji utworzonych do tej pory."""
+        return len(self._frozen)
+
+    def instantiate(self):
+        """Tworzy nową, pustą instancję świata dla sesji."""
+        return WorldInstance(self)
+
+
+class WorldInstance(Mapping):
+    """
+    Mapa świata jednej sesji. Zachowuje się jak słownik {nazwa: Location}, ale obiekty
+    LocationInstance tworzy dopiero przy pierwszym odwołaniu do danej lokalizacji.
+    Sprawdzenie, czy lokalizacja istnieje (in), nie tworzy żadnych obiektów.
+    """
+    def __init__(self, template):
+        self.template = template
+        self._locations = {}
+        # Zmiany jeszcze nieodebrane przez poszczególnych odbiorców: {odbiorca: {nazwa: lokalizacja}}.
+        self._pending = {}
+
+    def __getitem__(self, name):
+        location = self._locations.get(name)
+        if location is None:
+            location = LocationInstance(self.template.location(name))
+            self._locations[name] = location
+        return location
+
+    def __contains__(self, name):
+        return name in self.template.locations
+
+    def __iter__(self):
+        return iter(self.template.locations)
+
+    def __len__(self):
+        return len(self.template.locations)
+
+    def modified_locations(self):
+        """Zwraca lokalizacje, które sesja zmieniła względem szablonu."""
+        return [location for location in self._locations.values() if location.is_modified()]
+
+    def take_changes(self, consumer):
+        """
+        Zwraca lokalizacje zmienione od poprzedniego wywołania przez tego samego odbiorcę.
+        Każdy odbiorca (np. plik zapisu) ma własny zbiór zmian, więc zmiany odebrane przez jeden
+        plik nie giną dla pozostałych.
+        :param consumer: Klucz odbiorcy, np. ścieżka pliku zapisu.
+        :return: Lista lokalizacji albo None, jeśli odbiorca pyta pierwszy raz (od utworzenia
+                 lub wyczyszczenia świata) - wtedy potrzebuje pełnego stanu, a nie zmian.
+        """
+        changed = [location for location in self._locations.values() if location.changed]
+        for location in changed:
+            location.changed = False
+        for pending in self._pending.values():
+            pending.update((location.name, location) for location in changed)
+        pending = self._pending.get(consumer)
+        self._pending[consumer] = {}
+        return list(pending.values()) if pending is not None else None
+
+    def reset(self):
+        """Porzuca wszystkie zmiany sesji - świat wraca do stanu szablonu."""
+        self._locations = {}
+        self._pending = {}
+
+
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "world.json")
 
 game_world_map = {}
+_content = None
+_world_template = None
+
+def content():
+    """
+    Zwraca zawartość świata z domyślnej paczki (world.json), otwierając ją przy pierwszym wywołaniu.
+    """
+    global _content
+    if _content is None:
+        _content = ContentLocations(load_pack(CONTENT_PATH))
+    return _content
+
+def world_template():
+    """
+    Zwraca współdzielony szablon świata, budując go przy pierwszym wywołaniu.
+    """
+    global _world_template
+    if _world_template is None:
+        _world_template = WorldTemplate(content(), content().pack.start)
+    return _world_template
 
 def create_world():
     """
-    Tworzy i zwraca mapę świata z predefiniowanymi lokalizacji.
+    Tworzy i zwraca mapę świata dla nowej sesji - instancję współdzielonego szablonu.
     """
     global game_world_map 
-    game_world_map = {}
-
-    starting_room = Location(
-        name="Spokojna Polana",
-        description="Stoisz na niewielkiej polanie otoczonej starymi drzewami. Śpiew ptaków napawa spokojem.",
-        exits={"północ": "Mroczny Las", "wschód": "Stara Droga"},
-        items_in_location=[rusty_sword, tattered_clothes]
-    )
-    game_world_map[starting_room.name] = starting_room
-
-    dark_forest_entrance = Location(
-        name="Mroczny Las",
-        description="Gęste korony drzew niemal całkowicie zasłaniają niebo. Z głębi lasu dobiegają niepokojące odgłosy.",
-        exits={"południe": "Spokojna Polana", "północ": "Gęstwina Leśna"},
-        enemies=[characters.Enemy("Wilk", 35, 9, 2, 12, 6, [items.Item("Wilcze Futro", "Ciepłe futro.", 3)])] 
-    )
-    game_world_map[dark_forest_entrance.name] = dark_forest_entrance
- 
-    deep_forest = Location(
-        name="Gęstwina Leśna",
-        description="Zarośla są tak gęste, że ledwo można się przecisnąć. Gdzieś w pobliżu słychać szelest.",
-        exits={"południe": "Mroczny Las", "zachód": "Jaskinia Goblinów"},
-        enemies=[goblin_scout, forest_spider],
-        items_in_location=[lesser_healing_potion]
-    )
-    game_world_map[deep_forest.name] = deep_forest
-
-    goblin_cave = Location(
-        name="Jaskinia Goblinów",
-        description="Wilgotna, śmierdząca jaskinia. Wszędzie walają się kości i resztki jedzenia.",
-        exits={"wschód": "Gęstwina Leśna"},
-        enemies=[goblin_warrior, goblin_scout, characters.Enemy("Szef Goblinów", 60, 12, 4, 50, 30, [short_sword, leather_armor])],
-        items_in_location=[items.Item("Złoty Ząb Goblina", "Błyszczący ząb, pewnie coś warty.", 10)]
-    )
-    game_world_map[goblin_cave.name] = goblin_cave
-
-    old_road = Location(
-        name="Stara Droga",
-        description="Kamienista droga, dawno nie uczęszczana. Prowadzi w nieznane.",
-        exits={"zachód": "Spokojna Polana", "wschód": "Ruiny Wieży"},
-        npcs=[old_man_hermit] 
-    )
-    game_world_map[old_road.name] = old_road
-
-    
-    tower_ruins = Location(
-        name="Ruiny Wieży",
-        description="Pozostałości starej wieży strażniczej. Mury są omszałe i częściowo zawalone.",
-        exits={"zachód": "Stara Droga"},
-        enemies=[orc_brute],
-        items_in_location=[magic_staff, strength_elixir]
-    )
-    magic_staff.is_magical = True 
-    magic_staff.description = "Starożytna laska, wciąż pulsująca mocą."
-    game_world_map[tower_ruins.name] = tower_ruins
-
+    game_world_map = world_template().instantiate()
     return game_world_map
 
+def __getattr__(name):
+    """
+    Udostępnia szablony z paczki zawartości pod dawnymi nazwami modułu (np. world.rusty_sword,
+    world.goblin_scout), tworząc je dopiero przy pierwszym odwołaniu.
+    Nazwy zaczynające się od '_' (np. __path__ sprawdzane przez import) nie ładują paczki.
+    """
+    if name.startswith("_"):
+        raise AttributeError(f"module 'world' has no attribute '{name}'")
+    pack = content().pack
+    if name in pack.items:
+        return content().item(name)
+    if name in pack.enemies:
+        return content().enemy(name)
+    if name in pack.npcs:
+        return content().npc(name)
+    raise AttributeError(f"module 'world' has no attribute '{name}'")
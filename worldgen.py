@@ -0,0 +1,175 @@
+import json
+import math
+import random
+import zlib
+from collections.abc import Mapping
+
+import world
+
+PLACES = ("Polana", "Grota", "Korytarz", "Wąwóz", "Ruina", "Bagno", "Zagajnik", "Krypta", "Przełęcz", "Obozowisko")
+ADJECTIVES = ("mroczne", "wilgotne", "ciche", "zarośnięte", "zrujnowane", "kamieniste", "mgliste", "opuszczone")
+DETAILS = (
+    "Z oddali dobiega szum wody.",
+    "Na ziemi widać świeże ślady łap.",
+    "W powietrzu unosi się zapach dymu.",
+    "Wiatr gwiżdże między skałami.",
+    "Pod stopami chrzęszczą stare kości.",
+    "Gdzieś w pobliżu kapie woda.",
+)
+ENEMY_CHANCE = 0.3
+ITEM_CHANCE = 0.2
+EXTRA_PASSAGE_PERCENT = 35
+
+
+class GeneratedLocations(Mapping):
+    """
+    Proceduralny świat o zadanej liczbie lokalizacji, widziany jako słownik {nazwa: Location}.
+    Lokalizacje leżą na prostokątnej siatce; wszystkie połączenia wschód-zachód w rzędzie i przejście
+    północ-południe w pierwszej kolumnie gwarantują spójność, a pozostałe przejścia są losowane.
+    Każda lokalizacja powstaje na żądanie z ziarna i swojego numeru, więc w pamięci nie są trzymane
+    żadne opisy, a ten sam numer zawsze daje tę samą lokalizację.
+    """
+    def __init__(self, size, seed=0, content=None):
+        """
+        :param size: Liczba lokalizacji (np. od 10^3 do 10^6).
+        :param seed: Ziarno generatora.
+        :param content: Źródło szablonów przeciwników i przedmiotów; domyślnie world.content().
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("Liczba lokalizacji musi być dodatnią liczbą całkowitą.")
+        self.size = size
+        self.seed = seed
+        self.width = math.isqrt(size - 1) + 1
+        self.content = content if content is not None else world.content()
+        self.enemy_ids = list(self.content.pack.enemies)
+        self.item_ids = list(self.content.pack.items)
+
+    def name(self, index):
+        """Zwraca nazwę lokalizacji o podanym numerze."""
+        return f"{PLACES[self._place(index)]} {index}"
+
+    def index(self, name):
+        """
+        Zwraca numer lokalizacji o podanej nazwie albo None, jeśli takiej lokalizacji nie ma.
+        """
+        place, _, number = name.rpartition(" ")
+        if not number.isdigit():
+            return None
+        index = int(number)
+        if index >= self.size or name != self.name(index):
+            return None
+        return index
+
+    def _place(self, index):
+        return zlib.crc32(f"{self.seed}:miejsce:{index}".encode()) % len(PLACES)
+
+    def _passage(self, upper, lower):
+        """Czy istnieje przejście północ-południe między lokalizacjami (decyzja wspólna dla obu stron)."""
+        if upper % self.width == 0:
+            return True
+        return zlib.crc32(f"{self.seed}:przejscie:{upper}".encode()) % 100 < EXTRA_PASSAGE_PERCENT
+
+    def exits(self, index):
+        """Zwraca słownik wyjść lokalizacji o podanym numerze."""
+        exits = {}
+        column = index % self.width
+        if index >= self.width and self._passage(index - self.width, index):
+            exits["północ"] = self.name(index - self.width)
+        if index + self.width < self.size and self._passage(index, index + self.width):
+            exits["południe"] = self.name(index + self.width)
+        if column > 0:
+            exits["zachód"] = self.name(index - 1)
+        if column < self.width - 1 and index + 1 < self.size:
+            exits["wschód"] = self.name(index + 1)
+        return exits
+
+    def exits_of(self, name):
+        """Zwraca wyjścia lokalizacji o podanej nazwie bez tworzenia obiektu Location."""
+        return self.exits(self.index(name))
+
+    def position(self, name):
+        """Zwraca współrzędne (x, y) lokalizacji na siatce - każde wyjście zmienia jedną z nich o 1."""
+        index = self.index(name)
+        return index % self.width, index // self.width
+
+    def record(self, index):
+        """
+        Zwraca rekord lokalizacji w formacie paczki zawartości (jak w world.json).
+        """
+        rng = random.Random(f"{self.seed}:{index}")
+        place = PLACES[self._place(index)]
+        record = {
+            "name": f"{place} {index}",
+            "description": f"{place} wygląda na {rng.choice(ADJECTIVES)} miejsce. {rng.choice(DETAILS)}",
+            "exits": self.exits(index),
+        }
+        if index and rng.random() < ENEMY_CHANCE:
+            record["enemies"] = [rng.choice(self.enemy_ids)]
+        if rng.random() < ITEM_CHANCE:
+            record["items"] = [rng.choice(self.item_ids)]
+        return record
+
+    def __getitem__(self, name):
+        index = self.index(name)
+        if index is None:
+            raise KeyError(name)
+        record = self.record(index)
+        return world.Location(
+            name=record["name"],
+            description=record["description"],
+            exits=record["exits"],
+            enemies=[self.content.enemy(enemy_id) for enemy_id in record.get("enemies", ())],
+            items_in_location=[self.content.item(item_id) for item_id in record.get("items", ())],
+        )
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self.index(name) is not None
+
+    def __iter__(self):
+        return (self.name(index) for index in range(self.size))
+
+    def __len__(self):
+        return self.size
+
+    def records(self):
+        """Generator rekordów wszystkich lokalizacji po kolei - bez trzymania ich w pamięci."""
+        return (self.record(index) for index in range(self.size))
+
+
+def generate(size, seed=0):
+    """
+    Tworzy szablon proceduralnego świata.
+    :param size: Liczba lokalizacji.
+    :param seed: Ziarno generatora.
+    :return: world.WorldTemplate; lokalizacja startowa to pierwsza lokalizacja siatki.
+    """
+    locations = GeneratedLocations(size, seed)
+    return world.WorldTemplate(locations, locations.name(0))
+
+
+def write_content(path, size, seed=0):
+    """
+    Zapisuje proceduralny świat jako plik JSON paczki zawartości, rekord po rekordzie.
+    :param path: Ścieżka pliku JSON (do skompilowania przez content.compile_pack).
+    """
+    locations = GeneratedLocations(size, seed)
+    pack = locations.content.pack
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{"start": %s,\n' % json.dumps(locations.name(0), ensure_ascii=False))
+        for section in ("items", "enemies", "npcs"):
+            file.write(f'"{section}": %s,\n' % json.dumps(getattr(pack, section), ensure_ascii=False))
+        file.write('"locations": [\n')
+        for index, record in enumerate(locations.records()):
+            if index:
+                file.write(",\n")
+            file.write(json.dumps(record, ensure_ascii=False))
+        file.write("\n]}\n")
+
+
+if __name__ == "__main__":
+    import sys
+
+    room_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    target = sys.argv[2] if len(sys.argv) > 2 else f"swiat_{room_count}.json"
+    write_content(target, room_count, seed=int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+    print(f"Zapisano {room_count} lokalizacji do {target}")